@@ -4,15 +4,30 @@ Flask Web Application for Liturgia System
 Modern, responsive interface for daily liturgy and Mass customization
 """
 
-from flask import Flask, render_template, request, jsonify, send_file, flash, redirect, url_for
+from flask import (Flask, Response, render_template, request, jsonify, send_file, flash, redirect, url_for,
+                   stream_with_context, make_response, session)
 from flask_migrate import Migrate
-from datetime import datetime, date, timedelta
+from dataclasses import asdict
+from datetime import datetime, date, time, timedelta, timezone
+import hashlib
+import json
 import os
 import io
 from models.daily_liturgy import LiturgiaDaily
-from models.liturgy_hours import LiturgiaHoras
+from models.liturgy_hours import HOUR_GETTERS, LiturgiaHoras
+from models.base import iter_text
 from models.custom_mass import CustomMass
 from models.db_models import db
+from models.repository import LiturgyRepository, CustomMassRepository, LiturgyHoursRepository, ReadingRepository
+from models.bible import book_code, try_parse_reference
+from models.search import SEARCH_TARGETS, search
+from models.text_index import KINDS as TEXT_INDEX_KINDS, corpus_index
+from models.pdf_cache import PDFCache
+from models.pdf_styles import register_fonts
+from models.template_cache import bytecode_cache, compile_templates
+from models.jobs import LocalJobQueue, RedisJobQueue, render_export
+from models.batch import BatchRequest
+from models.cache import liturgy_cache, content_cache, invalidate_date, connect_redis
 
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
@@ -39,6 +54,31 @@ app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
 db.init_app(app)
 migrate = Migrate(app, db)
 
+# Serve stored liturgies from the database, falling back to the computed calendar
+LiturgiaDaily.set_repository(LiturgyRepository())
+
+# Serve precomputed hours (populate_hours.py), computing the missing ones
+LiturgiaHoras.set_repository(LiturgyHoursRepository())
+
+# Saved custom Masses (custom_masses table)
+mass_repository = CustomMassRepository()
+reading_repository = ReadingRepository()
+
+# In-process cache of liturgy content (entries per process, TTL in seconds)
+liturgy_cache.configure(
+    maxsize=int(os.environ.get('LITURGY_CACHE_SIZE', 2048)),
+    ttl=float(os.environ.get('LITURGY_CACHE_TTL', 3600)) or None
+)
+
+# Shared Redis tier behind the in-process cache (optional)
+if os.environ.get('REDIS_HOST'):
+    content_cache.set_remote(connect_redis(
+        host=os.environ['REDIS_HOST'],
+        port=int(os.environ.get('REDIS_PORT', 6379)),
+        password=os.environ.get('REDIS_PASSWORD'),
+        ttl=int(os.environ.get('REDIS_CACHE_TTL', 86400)) or None
+    ))
+
 # Configure upload folder for temporary PDF files
 # In production, use a secure directory with proper permissions
 UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER', '/tmp/liturgia_pdfs')
@@ -46,6 +86,132 @@ os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 
+# Content-addressed cache of generated leaflets, shared through Redis when enabled
+pdf_cache = PDFCache(
+    os.path.join(UPLOAD_FOLDER, 'pdf_cache'),
+    max_bytes=int(os.environ.get('PDF_CACHE_MAX_MB', 256)) * 1024 * 1024,
+    shared=content_cache.remote
+)
+
+# Extra TrueType fonts for leaflets (registered once per process)
+if os.environ.get('PDF_FONTS'):
+    register_fonts(os.environ['PDF_FONTS'])
+
+# Compiled templates kept across restarts: filesystem, redis (shared tier) or none
+app.jinja_options = {**app.jinja_options, 'bytecode_cache': bytecode_cache(
+    os.environ.get('TEMPLATE_CACHE', 'filesystem'),
+    directory=os.environ.get('TEMPLATE_CACHE_DIR', os.path.join(UPLOAD_FOLDER, 'jinja_cache')),
+    redis_client=content_cache.remote.client if content_cache.remote is not None else None,
+    ttl=int(os.environ.get('REDIS_CACHE_TTL', 86400)) or None
+)}
+
+# Offline index of the built-in texts for autocomplete (built on first use unless preloaded)
+if os.environ.get('PRELOAD_TEXT_INDEX', 'False').lower() == 'true':
+    app.logger.info("Índice textual do acervo: %s", corpus_index().stats)
+
+def _render_export(mass, export_format, options):
+    """
+    Render export jobs, reusing the PDF cache for leaflets
+
+    Batches read stored liturgies, so they run in an app context; here they
+    render inline on the export thread (process pools stay in the CLI and
+    export_worker.py).
+    """
+    if isinstance(mass, BatchRequest):
+        with app.app_context():
+            return render_export(mass, export_format, options)
+    if export_format == 'pdf':
+        with pdf_cache.open(mass, **options) as stream:
+            return stream.read()
+    return render_export(mass, export_format, options)
+
+
+# Background export jobs: in-process thread pool, or Redis list consumed by export_worker.py
+if os.environ.get('EXPORT_QUEUE', 'local') == 'redis' and content_cache.remote is not None:
+    export_queue = RedisJobQueue(content_cache.remote.client, render=_render_export)
+else:
+    export_queue = LocalJobQueue(max_workers=int(os.environ.get('EXPORT_WORKERS', 2)),
+                                 render=_render_export)
+
+# Longest long-poll accepted by /api/export-jobs/<job_id>?wait=
+EXPORT_JOB_MAX_WAIT = 30
+
+# Largest span accepted by /api/liturgy?from=&to= (a full liturgical year fits)
+API_MAX_RANGE_DAYS = 400
+
+# Page size limit of /api/masses
+API_MASSES_MAX_LIMIT = 200
+
+# Results per kind limit of /api/search
+API_SEARCH_MAX_LIMIT = 50
+
+# Suggestions limit of /api/autocomplete
+API_AUTOCOMPLETE_MAX_LIMIT = 25
+
+# Liturgy pages and /api/liturgy/<date>: dates up to this many days from today
+# may still be edited and are always revalidated; the others are cached for
+# HTTP_CACHE_MAX_AGE seconds
+HTTP_CACHE_EDIT_WINDOW_DAYS = int(os.environ.get('HTTP_CACHE_EDIT_WINDOW_DAYS', 7))
+HTTP_CACHE_MAX_AGE = int(os.environ.get('HTTP_CACHE_MAX_AGE', 7 * 86400))
+
+
+def _templates_version():
+    """Hash of the template sources, so a deploy changes the page ETags"""
+    digest = hashlib.sha1()
+    for name in sorted(app.jinja_env.list_templates()):
+        source, _, _ = app.jinja_loader.get_source(app.jinja_env, name)
+        digest.update(name.encode('utf-8') + b'\0' + source.encode('utf-8'))
+    return digest.hexdigest()
+
+
+TEMPLATES_VERSION = _templates_version()
+
+
+def _liturgy_etag(content, updated_at, *extra):
+    """Hash of the liturgy data, the stored row's updated_at and what else the response depends on"""
+    parts = [json.dumps(content, sort_keys=True, default=str, ensure_ascii=False),
+             updated_at.isoformat() if updated_at else '', *extra]
+    return hashlib.sha1('\n'.join(parts).encode('utf-8')).hexdigest()
+
+
+def _cached_response(date_str, etag, updated_at, render, page=False):
+    """
+    Response of render() for a liturgy date with ETag, Last-Modified and
+    Cache-Control, or a 304 without rendering when the client copy is current
+
+    Pages also depend on today's date (the "Hoje" link), so they are not
+    kept past midnight. Pending flash messages bypass the validators.
+    """
+    last_modified = updated_at.replace(tzinfo=timezone.utc, microsecond=0) if updated_at else None
+    flashes = page and session.get('_flashes')
+    if flashes:
+        fresh = False
+    elif request.if_none_match:
+        fresh = request.if_none_match.contains(etag)
+    else:
+        fresh = (last_modified is not None and request.if_modified_since is not None
+                 and last_modified <= request.if_modified_since)
+    
+    response = Response(status=304) if fresh else make_response(render())
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    
+    today = date.today()
+    liturgy_date = datetime.strptime(date_str, '%Y-%m-%d').date()
+    if flashes:
+        response.cache_control.no_store = True
+    elif abs((liturgy_date - today).days) <= HTTP_CACHE_EDIT_WINDOW_DAYS:
+        response.cache_control.no_cache = True
+    else:
+        max_age = HTTP_CACHE_MAX_AGE
+        if page:
+            midnight = datetime.combine(today + timedelta(days=1), time())
+            max_age = min(max_age, int((midnight - datetime.now()).total_seconds()))
+        response.cache_control.public = True
+        response.cache_control.max_age = max_age
+    return response
+
 
 @app.route('/')
 def index():
@@ -54,6 +220,22 @@ def index():
     return redirect(url_for('daily_liturgy', date_str=today.strftime('%Y-%m-%d')))
 
 
+def render_daily_liturgy(liturgy, date_str, today):
+    """
+    daily_liturgy.html of a date
+
+    With today=None the "Hoje" link points to /liturgia-diaria (resolved
+    when visited), as needed by the pages of export_static.py.
+    """
+    current_date = datetime.strptime(date_str, '%Y-%m-%d').date()
+    return render_template('daily_liturgy.html',
+                           liturgy=liturgy,
+                           current_date=date_str,
+                           prev_date=(current_date - timedelta(days=1)).strftime('%Y-%m-%d'),
+                           next_date=(current_date + timedelta(days=1)).strftime('%Y-%m-%d'),
+                           today=today)
+
+
 @app.route('/liturgia-diaria')
 @app.route('/liturgia-diaria/<date_str>')
 def daily_liturgy(date_str=None):
@@ -63,23 +245,29 @@ def daily_liturgy(date_str=None):
     
     try:
         liturgy = LiturgiaDaily.get_for_date(date_str)
+        today = date.today().strftime('%Y-%m-%d')
         
-        # Calculate navigation dates
-        current_date = datetime.strptime(date_str, '%Y-%m-%d').date()
-        prev_date = (current_date - timedelta(days=1)).strftime('%Y-%m-%d')
-        next_date = (current_date + timedelta(days=1)).strftime('%Y-%m-%d')
-        
-        return render_template('daily_liturgy.html',
-                             liturgy=liturgy,
-                             current_date=date_str,
-                             prev_date=prev_date,
-                             next_date=next_date,
-                             today=date.today().strftime('%Y-%m-%d'))
+        etag = _liturgy_etag(asdict(liturgy), liturgy.updated_at, today, TEMPLATES_VERSION)
+        return _cached_response(date_str, etag, liturgy.updated_at,
+                                lambda: render_daily_liturgy(liturgy, date_str, today), page=True)
     except Exception as e:
         flash(f'Erro ao carregar liturgia: {str(e)}', 'error')
         return redirect(url_for('index'))
 
 
+# Hours of /liturgia-horas/<date_str>?hour=
+HOUR_VIEWS = {key: getattr(LiturgiaHoras, getter) for key, getter in HOUR_GETTERS}
+
+
+def render_liturgy_hours(hour_data, date_str, selected_hour, today):
+    """liturgy_hours.html of an hour of a date"""
+    return render_template('liturgy_hours.html',
+                           hour_data=hour_data,
+                           selected_hour=selected_hour,
+                           current_date=date_str,
+                           today=today)
+
+
 @app.route('/liturgia-horas')
 @app.route('/liturgia-horas/<date_str>')
 def liturgy_hours(date_str=None):
@@ -92,24 +280,15 @@ def liturgy_hours(date_str=None):
         selected_hour = request.args.get('hour', 'laudes')
         
         # Get the selected hour
-        hours_map = {
-            'office_readings': LiturgiaHoras.get_office_readings,
-            'laudes': LiturgiaHoras.get_laudes,
-            'terca': LiturgiaHoras.get_terca,
-            'sexta': LiturgiaHoras.get_sexta,
-            'nona': LiturgiaHoras.get_nona,
-            'vesperas': LiturgiaHoras.get_vesperas,
-            'completas': LiturgiaHoras.get_completas,
-        }
-        
-        hour_func = hours_map.get(selected_hour, LiturgiaHoras.get_laudes)
-        hour_data = hour_func(date_str)
+        hour_key = selected_hour if selected_hour in HOUR_VIEWS else 'laudes'
+        hour_data = HOUR_VIEWS[hour_key](date_str)
+        today = date.today().strftime('%Y-%m-%d')
         
-        return render_template('liturgy_hours.html',
-                             hour_data=hour_data,
-                             selected_hour=selected_hour,
-                             current_date=date_str,
-                             today=date.today().strftime('%Y-%m-%d'))
+        etag = _liturgy_etag(hour_data.to_dict(), hour_data.updated_at, selected_hour, today,
+                             TEMPLATES_VERSION)
+        return _cached_response(date_str, etag, hour_data.updated_at,
+                                lambda: render_liturgy_hours(hour_data, date_str, selected_hour, today),
+                                page=True)
     except Exception as e:
         flash(f'Erro ao carregar liturgia das horas: {str(e)}', 'error')
         return redirect(url_for('index'))
@@ -158,13 +337,20 @@ def custom_mass():
             if communion_antiphon:
                 mass.set_communion_antiphon(communion_antiphon)
             
-            # Store mass in session or generate preview
+            # Save the mass if a name was given, then show the preview
+            mass_id = None
+            save_name = request.form.get('save_name', '').strip()
+            if save_name:
+                mass_id = mass_repository.save(mass, save_name)
             mass_text = mass.get_full_text()
             
             flash('Missa personalizada criada com sucesso!', 'success')
+            if mass_id is not None:
+                flash(f'Missa salva como "{save_name}".', 'success')
             return render_template('custom_mass_preview.html',
                                  mass=mass,
-                                 mass_text=mass_text)
+                                 mass_text=mass_text,
+                                 mass_id=mass_id)
             
         except Exception as e:
             flash(f'Erro ao criar missa: {str(e)}', 'error')
@@ -175,54 +361,71 @@ def custom_mass():
                          today=date.today().strftime('%Y-%m-%d'))
 
 
+@app.route('/missa-personalizada/<int:mass_id>')
+def saved_custom_mass(mass_id):
+    """Preview of a saved custom Mass"""
+    mass = mass_repository.load(mass_id)
+    if mass is None:
+        flash('Missa não encontrada.', 'error')
+        return redirect(url_for('custom_mass'))
+    return render_template('custom_mass_preview.html',
+                         mass=mass,
+                         mass_text=mass.get_full_text(),
+                         mass_id=mass_id)
+
+
+def _mass_from_pdf_form(form):
+    """Build the CustomMass and PDF options posted by the customize_pdf form"""
+    # Get customization options (numbers are parsed by normalize_pdf_options)
+    pdf_options = {
+        'font_family': form.get('font_family', 'Times-Roman'),
+        'font_size': form.get('font_size'),
+        'page_size': form.get('page_size', 'A4'),
+        'margins': form.get('margins'),
+        'title_size': form.get('title_size'),
+        'include_header': form.get('include_header') == 'on',
+        'include_footer': form.get('include_footer') == 'on',
+        'liturgical_color': form.get('liturgical_color', 'verde'),
+    }
+    
+    # Get mass data
+    mass = CustomMass()
+    celebration_name = form.get('celebration_name', 'Missa Dominical')
+    celebration_date = form.get('celebration_date', date.today().strftime('%Y-%m-%d'))
+    
+    mass.set_celebration(
+        name=celebration_name,
+        date_str=celebration_date,
+        color=pdf_options['liturgical_color']
+    )
+    
+    # Add readings if provided
+    first_reading = form.get('first_reading')
+    gospel = form.get('gospel')
+    if first_reading or gospel:
+        mass.set_readings(
+            first_reading=first_reading,
+            psalm=form.get('psalm'),
+            gospel=gospel
+        )
+    
+    return mass, pdf_options
+
+
 @app.route('/personalizar-pdf', methods=['GET', 'POST'])
 def customize_pdf():
     """PDF customization interface"""
     if request.method == 'POST':
         try:
-            # Get customization options
-            pdf_options = {
-                'font_family': request.form.get('font_family', 'Times-Roman'),
-                'font_size': int(request.form.get('font_size', 12)),
-                'page_size': request.form.get('page_size', 'A4'),
-                'margins': int(request.form.get('margins', 72)),
-                'title_size': int(request.form.get('title_size', 18)),
-                'include_header': request.form.get('include_header') == 'on',
-                'include_footer': request.form.get('include_footer') == 'on',
-                'liturgical_color': request.form.get('liturgical_color', 'verde'),
-            }
-            
-            # Get mass data
-            mass = CustomMass()
-            celebration_name = request.form.get('celebration_name', 'Missa Dominical')
-            celebration_date = request.form.get('celebration_date', date.today().strftime('%Y-%m-%d'))
+            mass, pdf_options = _mass_from_pdf_form(request.form)
             
-            mass.set_celebration(
-                name=celebration_name,
-                date_str=celebration_date,
-                color=pdf_options['liturgical_color']
-            )
+            # Generate PDF in memory with custom options (reused when already generated)
+            pdf_stream = pdf_cache.open(mass, **pdf_options)
             
-            # Add readings if provided
-            first_reading = request.form.get('first_reading')
-            gospel = request.form.get('gospel')
-            if first_reading or gospel:
-                mass.set_readings(
-                    first_reading=first_reading,
-                    psalm=request.form.get('psalm'),
-                    gospel=gospel
-                )
-            
-            # Generate PDF with custom options
-            pdf_filename = f"missa_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-            pdf_path = os.path.join(app.config['UPLOAD_FOLDER'], pdf_filename)
-            
-            mass.export_to_pdf(pdf_path, **pdf_options)
-            
-            return send_file(pdf_path,
+            return send_file(pdf_stream,
                            mimetype='application/pdf',
                            as_attachment=True,
-                           download_name=f'{celebration_name}.pdf')
+                           download_name=f'{mass.celebration.name}.pdf')
             
         except Exception as e:
             flash(f'Erro ao gerar PDF: {str(e)}', 'error')
@@ -252,6 +455,8 @@ def add_liturgy():
             season = request.form.get('season')
             
             # Here you would save to database or file
+            if liturgy_date:
+                invalidate_date(liturgy_date)
             # For now, just show success message
             flash(f'Liturgia para {liturgy_date} adicionada com sucesso!', 'success')
             return redirect(url_for('admin'))
@@ -272,6 +477,9 @@ def edit_liturgy():
             liturgy_date = request.form.get('liturgy_date')
             celebration_name = request.form.get('celebration_name')
             
+            if liturgy_date:
+                invalidate_date(liturgy_date)
+            
             flash(f'Liturgia de {liturgy_date} editada com sucesso!', 'success')
             return redirect(url_for('admin'))
             
@@ -351,6 +559,9 @@ def manage_liturgy_hours():
             hour_type = request.form.get('hour_type')
             hour_date = request.form.get('hour_date')
             
+            if hour_date:
+                invalidate_date(hour_date, hour_type or None)
+            
             flash(f'Liturgia das Horas ({hour_type}) salva com sucesso!', 'success')
             return redirect(url_for('admin'))
             
@@ -396,29 +607,428 @@ def admin_settings():
     return render_template('admin_settings.html')
 
 
+def _liturgy_payload(liturgy, date_str):
+    """Serialize a DailyLiturgy for the JSON API"""
+    return {
+        'date': date_str,
+        'celebration': liturgy.celebration.name,
+        'color': str(liturgy.celebration.color) if liturgy.celebration.color else None,
+        'season': liturgy.celebration.season,
+        'readings': {
+            'first': liturgy.first_reading.reference if liturgy.first_reading else None,
+            'psalm': liturgy.psalm.number if liturgy.psalm else None,
+            'second': liturgy.second_reading.reference if liturgy.second_reading else None,
+            'gospel': liturgy.gospel.reference if liturgy.gospel else None,
+        }
+    }
+
+
+def render_liturgy_json(liturgy, date_str):
+    """Body of /api/liturgy/<date_str>"""
+    return jsonify({'success': True, **_liturgy_payload(liturgy, date_str)})
+
+
 @app.route('/api/liturgy/<date_str>')
 def api_liturgy(date_str):
-    """API endpoint for liturgy data"""
+    """API endpoint for liturgy data (conditional: ETag and Last-Modified)"""
     try:
         liturgy = LiturgiaDaily.get_for_date(date_str)
+        etag = _liturgy_etag(_liturgy_payload(liturgy, date_str), liturgy.updated_at)
+        return _cached_response(date_str, etag, liturgy.updated_at,
+                                lambda: render_liturgy_json(liturgy, date_str))
+    except Exception as e:
         return jsonify({
-            'success': True,
-            'date': date_str,
-            'celebration': liturgy.celebration.name,
-            'color': str(liturgy.celebration.color) if liturgy.celebration.color else None,
-            'season': liturgy.celebration.season,
-            'readings': {
-                'first': liturgy.first_reading.reference if liturgy.first_reading else None,
-                'psalm': liturgy.psalm.number if liturgy.psalm else None,
-                'second': liturgy.second_reading.reference if liturgy.second_reading else None,
-                'gospel': liturgy.gospel.reference if liturgy.gospel else None,
-            }
-        })
+            'success': False,
+            'error': str(e)
+        }), 400
+
+
+def _range_args():
+    """Validated (from, to) date strings of a ?from=&to= request"""
+    start_str = request.args.get('from')
+    end_str = request.args.get('to', start_str)
+    if not start_str:
+        raise ValueError("Parâmetro 'from' é obrigatório")
+    start = datetime.strptime(start_str, '%Y-%m-%d').date()
+    end = datetime.strptime(end_str, '%Y-%m-%d').date()
+    if (end - start).days >= API_MAX_RANGE_DAYS:
+        raise ValueError(f"O intervalo máximo é de {API_MAX_RANGE_DAYS} dias")
+    return start_str, end_str
+
+
+def _text_response(lines, filename):
+    """Plain text download streamed chunk by chunk while lines are rendered"""
+    return Response(stream_with_context(iter_text(lines)),
+                    mimetype='text/plain',
+                    headers={'Content-Disposition': f'attachment; filename="{filename}"'})
+
+
+@app.route('/liturgia-diaria/texto')
+def daily_liturgy_text():
+    """Daily liturgy of a range of dates as text: ?from=YYYY-MM-DD&to=YYYY-MM-DD"""
+    try:
+        start_str, end_str = _range_args()
+        liturgies = LiturgiaDaily.get_for_range(start_str, end_str)
     except Exception as e:
         return jsonify({
             'success': False,
             'error': str(e)
         }), 400
+    
+    def lines():
+        for liturgy in liturgies:
+            yield from liturgy.iter_lines()
+    
+    return _text_response(lines(), f"liturgia_diaria_{start_str}_{end_str}.txt")
+
+
+@app.route('/liturgia-horas/texto')
+def liturgy_hours_text():
+    """All canonical hours of a range of dates as text: ?from=YYYY-MM-DD&to=YYYY-MM-DD"""
+    try:
+        start_str, end_str = _range_args()
+        start = datetime.strptime(start_str, '%Y-%m-%d').date()
+        end = datetime.strptime(end_str, '%Y-%m-%d').date()
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    
+    def lines():
+        # Each day is rendered only when the previous one has been sent
+        current = start
+        while current <= end:
+            yield from LiturgiaHoras.iter_all_hours_lines(current.strftime('%Y-%m-%d'))
+            current += timedelta(days=1)
+    
+    return _text_response(lines(), f"liturgia_horas_{start_str}_{end_str}.txt")
+
+
+@app.route('/missa-personalizada/<int:mass_id>/texto')
+def saved_custom_mass_text(mass_id):
+    """Download a saved custom Mass as text"""
+    mass = mass_repository.load(mass_id)
+    if mass is None:
+        flash('Missa não encontrada.', 'error')
+        return redirect(url_for('custom_mass'))
+    return _text_response(mass.iter_lines(), f"missa_{mass_id}.txt")
+
+
+def _range_etag(start_str, end_str, liturgies):
+    """
+    ETag of a range from a cheap key per day, without serializing it: the
+    stored row's updated_at, or what a computed day is built from
+    """
+    digest = hashlib.sha1(f'{start_str}\n{end_str}'.encode('utf-8'))
+    for liturgy in liturgies:
+        if liturgy.updated_at is not None:
+            key = liturgy.updated_at.isoformat()
+        else:
+            celebration = liturgy.celebration
+            readings = (liturgy.first_reading, liturgy.psalm, liturgy.second_reading, liturgy.gospel)
+            key = '|'.join([celebration.name, str(celebration.color), celebration.season,
+                            *(part.reference if part else '' for part in readings)])
+        digest.update(b'\n' + key.encode('utf-8'))
+    return digest.hexdigest()
+
+
+@app.route('/api/liturgy')
+def api_liturgy_range():
+    """
+    API endpoint for a range of dates: /api/liturgy?from=YYYY-MM-DD&to=YYYY-MM-DD
+    
+    Returns a JSON array with one object per day (same fields as
+    /api/liturgy/<date_str>), streamed, with an ETag for conditional requests.
+    """
+    try:
+        start_str, end_str = _range_args()
+        liturgies = LiturgiaDaily.get_for_range(start_str, end_str)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    
+    etag = _range_etag(start_str, end_str, liturgies)
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+    
+    def generate():
+        # Each day is serialized only when it is sent
+        yield '['
+        for i, liturgy in enumerate(liturgies):
+            chunk = json.dumps(_liturgy_payload(liturgy, liturgy.celebration.date.strftime('%Y-%m-%d')),
+                               ensure_ascii=False)
+            yield chunk if i == 0 else ',' + chunk
+        yield ']'
+    
+    response = Response(generate(), mimetype='application/json')
+    response.set_etag(etag)
+    return response
+
+
+@app.route('/api/readings')
+def api_readings():
+    """
+    Stored readings of a book or chapter and the dates they are read on:
+    /api/readings?ref=Mt 2 (or ?ref=Mt)
+    """
+    ref = request.args.get('ref', '').strip()
+    parsed = try_parse_reference(ref)
+    book, chapter = (parsed.book, parsed.chapter) if parsed else (book_code(ref), None)
+    if book is None:
+        return jsonify({
+            'success': False,
+            'error': f'Referência bíblica inválida: {ref!r}'
+        }), 400
+    
+    readings = reading_repository.find(book, chapter)
+    dates = reading_repository.dates_reading(book, chapter)
+    return jsonify({
+        'success': True,
+        'book': book,
+        'chapter': chapter,
+        'readings': [reading.reference for reading in readings],
+        'dates': [day.strftime('%Y-%m-%d') for day in dates]
+    })
+
+
+@app.route('/api/search')
+def api_search():
+    """
+    Full-text search over readings, prayers and psalms:
+    /api/search?q=luz das nações&type=readings&limit=20
+    
+    type may be repeated; without it every kind is searched.
+    """
+    query = request.args.get('q', '').strip()
+    kinds = request.args.getlist('type') or None
+    try:
+        limit = min(int(request.args.get('limit', 20)), API_SEARCH_MAX_LIMIT)
+        unknown = [kind for kind in kinds or () if kind not in SEARCH_TARGETS]
+        if unknown:
+            raise ValueError(f"Tipo de busca inválido: {', '.join(unknown)}")
+        if limit < 1:
+            raise ValueError("O limite deve ser positivo")
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    
+    hits = search(query, kinds, limit)
+    return jsonify({'success': True, 'query': query, 'results': [hit.to_dict() for hit in hits]})
+
+
+@app.route('/api/autocomplete')
+def api_autocomplete():
+    """
+    Suggestions from the built-in texts (no database needed):
+    /api/autocomplete?q=epif&kind=celebration&limit=10
+    
+    The last word matches as a prefix and accents are ignored; kind may
+    be repeated.
+    """
+    query = request.args.get('q', '')
+    kinds = request.args.getlist('kind') or None
+    try:
+        limit = min(int(request.args.get('limit', 10)), API_AUTOCOMPLETE_MAX_LIMIT)
+        unknown = [kind for kind in kinds or () if kind not in TEXT_INDEX_KINDS]
+        if unknown:
+            raise ValueError(f"Tipo inválido: {', '.join(unknown)}")
+        if limit < 1:
+            raise ValueError("O limite deve ser positivo")
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    
+    return jsonify({'success': True, 'suggestions': corpus_index().complete(query, kinds, limit)})
+
+
+@app.route('/api/export-jobs', methods=['POST'])
+def api_create_export_job():
+    """
+    API endpoint to queue a leaflet export
+    
+    Accepts the customize_pdf form fields plus 'format' (pdf or docx) and
+    returns 202 with the job id; poll /api/export-jobs/<job_id>.
+    """
+    try:
+        mass, pdf_options = _mass_from_pdf_form(request.form)
+        job = export_queue.submit(mass, request.form.get('format', 'pdf'), pdf_options,
+                                  filename=mass.celebration.name)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    
+    return jsonify({
+        'success': True,
+        'job': job.to_dict(),
+        'status_url': url_for('api_export_job', job_id=job.id),
+        'download_url': url_for('api_export_job_download', job_id=job.id),
+    }), 202
+
+
+@app.route('/api/export-jobs/<job_id>')
+def api_export_job(job_id):
+    """API endpoint for job status; ?wait=N long-polls up to N seconds"""
+    wait = request.args.get('wait', 0, type=float)
+    wait = min(wait, EXPORT_JOB_MAX_WAIT) if wait > 0 else 0
+    job = export_queue.get(job_id, wait=wait)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Job não encontrado'}), 404
+    return jsonify({'success': True, 'job': job.to_dict()})
+
+
+@app.route('/api/export-jobs/<job_id>/download')
+def api_export_job_download(job_id):
+    """Download the file produced by a finished job"""
+    job = export_queue.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Job não encontrado'}), 404
+    data = export_queue.result(job_id) if job.status == 'done' else None
+    if data is None:
+        return jsonify({'success': False, 'job': job.to_dict()}), 409
+    return send_file(io.BytesIO(data),
+                     mimetype=job.mimetype,
+                     as_attachment=True,
+                     download_name=job.filename)
+
+
+@app.route('/api/leaflets/batch', methods=['POST'])
+def api_batch_leaflets():
+    """
+    API endpoint to queue leaflets for a date range as one export job
+    
+    Form fields: from, to, only (all, sundays, sundays_and_solemnities),
+    merge ('on' for a single PDF instead of a zip) and the customize_pdf
+    layout options. Returns 202 with the job id; poll /api/export-jobs/<job_id>.
+    """
+    try:
+        start_str = request.form['from']
+        end_str = request.form.get('to', start_str)
+        span = datetime.strptime(end_str, '%Y-%m-%d') - datetime.strptime(start_str, '%Y-%m-%d')
+        if span.days >= API_MAX_RANGE_DAYS:
+            raise ValueError(f"O intervalo máximo é de {API_MAX_RANGE_DAYS} dias")
+        _, pdf_options = _mass_from_pdf_form(request.form)
+        batch = BatchRequest(
+            start_str, end_str,
+            selection=request.form.get('only', 'sundays'),
+            output='pdf' if request.form.get('merge') == 'on' else 'zip'
+        )
+        job = export_queue.submit(batch, batch.output, pdf_options,
+                                  filename=f'folhetos_{start_str}_{end_str}')
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    
+    return jsonify({
+        'success': True,
+        'job': job.to_dict(),
+        'status_url': url_for('api_export_job', job_id=job.id),
+        'download_url': url_for('api_export_job_download', job_id=job.id),
+    }), 202
+
+
+@app.route('/api/masses')
+def api_masses():
+    """
+    API endpoint listing saved Masses, newest first: /api/masses?after=<id>&limit=N
+    
+    Keyset pagination: pass the returned 'next' cursor as 'after'.
+    """
+    try:
+        after = request.args.get('after', type=int)
+        limit = min(max(request.args.get('limit', 50, type=int), 1), API_MASSES_MAX_LIMIT)
+        masses, cursor = mass_repository.list_page(after=after, limit=limit)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    return jsonify({'success': True, 'masses': masses, 'next': cursor})
+
+
+@app.route('/api/masses/<int:mass_id>')
+def api_mass(mass_id):
+    """API endpoint with a saved Mass (compact form, see CustomMass.to_dict)"""
+    mass = mass_repository.load(mass_id)
+    if mass is None:
+        return jsonify({'success': False, 'error': 'Missa não encontrada'}), 404
+    return jsonify({'success': True, 'id': mass_id, 'mass': mass.to_dict()})
+
+
+@app.route('/api/masses', methods=['POST'])
+def api_save_mass():
+    """
+    API endpoint to save a Mass
+    
+    JSON body: {"name": ..., "mass": <CustomMass.to_dict()>, "id": optional}.
+    Without id a new Mass is created; with id that Mass is replaced.
+    """
+    try:
+        payload = request.get_json(force=True)
+        mass_id = mass_repository.save(CustomMass.from_dict(payload['mass']), payload['name'],
+                                       mass_id=payload.get('id'))
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    if mass_id is None:
+        return jsonify({'success': False, 'error': 'Missa não encontrada'}), 404
+    return jsonify({'success': True, 'id': mass_id}), 200 if payload.get('id') else 201
+
+
+@app.route('/api/masses/bulk', methods=['POST'])
+def api_bulk_save_masses():
+    """
+    API endpoint to import many Masses in one transaction
+    
+    JSON body: {"masses": [{"name": ..., "mass": {...}, "id": optional}, ...]}
+    """
+    try:
+        payload = request.get_json(force=True)
+        count = mass_repository.bulk_save(
+            (item.get('id'), item['name'], CustomMass.from_dict(item['mass']))
+            for item in payload['masses']
+        )
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    return jsonify({'success': True, 'count': count})
+
+
+@app.route('/api/masses/<int:mass_id>', methods=['DELETE'])
+def api_delete_mass(mass_id):
+    """API endpoint to delete a saved Mass"""
+    try:
+        deleted = mass_repository.delete(mass_id)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    if not deleted:
+        return jsonify({'success': False, 'error': 'Missa não encontrada'}), 404
+    return jsonify({'success': True})
+
+
+@app.route('/api/cache/stats')
+def api_cache_stats():
+    """API endpoint with the liturgy cache counters of this process"""
+    return jsonify({'success': True, 'cache': content_cache.stats(), 'pdf_cache': pdf_cache.stats()})
 
 
 @app.errorhandler(404)
@@ -433,6 +1043,32 @@ def server_error(e):
     return render_template('500.html'), 500
 
 
+# Pages requested by warm_up(): today's liturgy, every hour and the Mass forms
+WARM_UP_URLS = ('/liturgia-diaria', *(f'/liturgia-horas?hour={key}' for key, _ in HOUR_GETTERS),
+                '/missa-personalizada', '/personalizar-pdf')
+
+
+def warm_up():
+    """
+    Compile every template and request the main pages once, so the first
+    visitors of a new worker do not pay for compilation and cold caches
+    """
+    compile_templates(app.jinja_env)
+    started = datetime.now()
+    client = app.test_client()
+    for url in WARM_UP_URLS:
+        try:
+            client.get(url).close()
+        except Exception as e:
+            app.logger.warning("Falha ao preparar %s: %s", url, e)
+    app.logger.info("Rotas preparadas em %.2f s", (datetime.now() - started).total_seconds())
+
+
+# Warm-up at worker start (mod_wsgi imports this module when the daemon starts)
+if os.environ.get('PRELOAD_TEMPLATES', 'False').lower() == 'true':
+    warm_up()
+
+
 if __name__ == '__main__':
     # Only use debug mode in development
     # In production, use a WSGI server like gunicorn
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Batch leaflet generation
+Renders Mass leaflets (PDF) for every selected day of a date range,
+e.g. all Sundays of Advent, as a zip or a single merged PDF
+"""
+
+import argparse
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.batch import SELECTIONS, build_batch
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera folhetos de missa para um intervalo de datas")
+    parser.add_argument('start', help="Data inicial (AAAA-MM-DD)")
+    parser.add_argument('end', help="Data final (AAAA-MM-DD)")
+    parser.add_argument('-o', '--output', help="Arquivo de saída (padrão: folhetos_<inicio>_<fim>.zip/.pdf)")
+    parser.add_argument('--only', choices=SELECTIONS, default='sundays', help="Dias incluídos (padrão: sundays)")
+    parser.add_argument('--merge', action='store_true', help="Gerar um único PDF em vez de um zip")
+    parser.add_argument('--workers', type=int, default=None, help="Processos de renderização (padrão: nº de CPUs)")
+    parser.add_argument('--font-family', default='Times-Roman')
+    parser.add_argument('--font-size', type=int, default=12)
+    parser.add_argument('--title-size', type=int, default=18)
+    parser.add_argument('--page-size', default='A4', choices=('A4', 'Letter', 'A5'))
+    parser.add_argument('--margins', type=int, default=72)
+    parser.add_argument('--db', action='store_true', help="Usar as liturgias cadastradas no banco de dados")
+    args = parser.parse_args()
+
+    if args.db:
+        from app import app
+        with app.app_context():
+            run(args)
+    else:
+        run(args)
+
+
+def run(args):
+    """Build the batch and write the output file"""
+    output = 'pdf' if args.merge else 'zip'
+    result = build_batch(
+        args.start, args.end,
+        selection=args.only,
+        output=output,
+        workers=args.workers,
+        font_family=args.font_family,
+        font_size=args.font_size,
+        title_size=args.title_size,
+        page_size=args.page_size,
+        margins=args.margins
+    )
+
+    filename = args.output or f"folhetos_{args.start}_{args.end}.{output}"
+    with open(filename, 'wb') as f:
+        f.write(result.data)
+
+    for item in result.items:
+        print(f"  {item.date}  {item.seconds * 1000:8.1f} ms  {item.size / 1024:7.1f} KB  {item.name}")
+    print(f"{len(result.items)} folhetos em {result.seconds:.2f} s -> {filename}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Static site export
+Renders the daily liturgy page, the seven hours and the /api/liturgy JSON
+of every date of one or more years through the application templates, in
+parallel worker processes. Later runs only render the dates whose content
+changed (e.g. after an edit in the admin or a lectionary import).
+
+Apache can then serve the files without going through mod_wsgi, falling
+back to the application for dates that were not exported:
+
+    RewriteEngine On
+    RewriteCond /var/www/liturgia-static/liturgia-diaria/$1.html -f
+    RewriteRule ^/liturgia-diaria/(\\d{4}-\\d{2}-\\d{2})$ /var/www/liturgia-static/liturgia-diaria/$1.html [L]
+    RewriteCond /var/www/liturgia-static/api/liturgy/$1.json -f
+    RewriteRule ^/api/liturgy/(\\d{4}-\\d{2}-\\d{2})$ /var/www/liturgia-static/api/liturgy/$1.json [L]
+    RewriteCond /var/www/liturgia-static/liturgia-horas/$1 -d
+    RewriteCond %{QUERY_STRING} ^$
+    RewriteRule ^/liturgia-horas/(\\d{4}-\\d{2}-\\d{2})$ /var/www/liturgia-static/liturgia-horas/$1/laudes.html [L]
+    RewriteCond /var/www/liturgia-static/liturgia-horas/$1 -d
+    RewriteCond %{QUERY_STRING} ^hour=(office_readings|laudes|terca|sexta|nona|vesperas|completas)$
+    RewriteRule ^/liturgia-horas/(\\d{4}-\\d{2}-\\d{2})$ /var/www/liturgia-static/liturgia-horas/$1/%1.html [L]
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import (app, TEMPLATES_VERSION, render_daily_liturgy, render_liturgy_hours,
+                 render_liturgy_json)
+from models.daily_liturgy import LiturgiaDaily
+from models.liturgy_hours import HOUR_GETTERS, LiturgiaHoras
+from models.static_site import StaticSite, fingerprint
+
+
+def year_dates(year):
+    day = date(year, 1, 1)
+    while day.year == year:
+        yield day.strftime('%Y-%m-%d')
+        day += timedelta(days=1)
+
+
+def fingerprints(dates):
+    """Content fingerprint of each date (no rendering)"""
+    result = {}
+    for date_str in dates:
+        hours = LiturgiaHoras.get_all_hours(date_str)
+        result[date_str] = fingerprint(LiturgiaDaily.get_for_date(date_str),
+                                       [hours[key] for key, _ in HOUR_GETTERS])
+    return result
+
+
+def render_dates(job):
+    """Render and write the files of some dates (runs in a worker process)"""
+    output, dates = job
+    site = StaticSite(output)
+    written = 0
+    with app.test_request_context():
+        for date_str in dates:
+            liturgy = LiturgiaDaily.get_for_date(date_str)
+            files = {
+                site.page_path(date_str): render_daily_liturgy(liturgy, date_str, None).encode('utf-8'),
+                site.api_path(date_str): render_liturgy_json(liturgy, date_str).get_data(),
+            }
+            for key, hour in LiturgiaHoras.get_all_hours(date_str).items():
+                html = render_liturgy_hours(hour, date_str, key, None)
+                files[site.hour_path(date_str, key)] = html.encode('utf-8')
+            written += sum(site.write(path, data) for path, data in files.items())
+    return len(dates), written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera as páginas estáticas da liturgia de um ou mais anos")
+    parser.add_argument('years', type=int, nargs='*', help="Ano(s) civil(is), ex.: 2026 2027")
+    parser.add_argument('--dates', nargs='+', default=[],
+                        help="Datas (AAAA-MM-DD) regeradas mesmo sem alteração, ex.: 2026-04-05")
+    parser.add_argument('--output', default=os.environ.get('STATIC_SITE_DIR', 'static_site'),
+                        help="Diretório de saída (padrão: STATIC_SITE_DIR ou ./static_site)")
+    parser.add_argument('--workers', type=int, default=multiprocessing.cpu_count(),
+                        help="Processos de renderização (padrão: número de CPUs)")
+    parser.add_argument('--full', action='store_true', help="Regerar todas as datas, alteradas ou não")
+    args = parser.parse_args()
+    if not args.years and not args.dates:
+        parser.error("informe ao menos um ano ou --dates")
+    for date_str in args.dates:
+        datetime.strptime(date_str, '%Y-%m-%d')
+
+    started = time.perf_counter()
+    dates = sorted({*args.dates, *(d for year in args.years for d in year_dates(year))})
+    with app.app_context():
+        prints = fingerprints(dates)
+
+    site = StaticSite(args.output)
+    manifest = site.load_manifest()
+    if args.full:
+        stale = dates
+    else:
+        stale = sorted(set(site.stale_dates(prints, TEMPLATES_VERSION, manifest)) | set(args.dates))
+    print(f"{len(stale)} de {len(dates)} datas a gerar em {args.output}", flush=True)
+
+    rendered = written = 0
+    if stale:
+        workers = max(1, min(args.workers, len(stale)))
+        size = max(1, -(-len(stale) // (workers * 4)))
+        jobs = [(args.output, stale[i:i + size]) for i in range(0, len(stale), size)]
+        if workers == 1:
+            results = map(render_dates, jobs)
+            pool = None
+        else:
+            # spawn: each worker imports the application on its own
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            results = pool.map(render_dates, jobs)
+        try:
+            for count, files in results:
+                rendered += count
+                written += files
+                print(f"  {rendered}/{len(stale)} datas", flush=True)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+    if manifest.get('templates') != TEMPLATES_VERSION:
+        manifest = {'templates': TEMPLATES_VERSION, 'dates': {}}
+    manifest['dates'].update({date_str: prints[date_str] for date_str in stale})
+    site.save_manifest(manifest)
+
+    print(f"{rendered} datas, {written} arquivos gravados em {time.perf_counter() - started:.2f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Export worker
+Consumes PDF/DOCX export jobs and leaflet batches queued by the web app
+when EXPORT_QUEUE=redis; batches render on BATCH_WORKERS processes
+"""
+
+import logging
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import redis
+
+from app import app
+from models.batch import BatchRequest
+from models.jobs import RedisJobQueue, render_export
+
+# Worker processes used by each leaflet batch
+BATCH_WORKERS = int(os.environ.get('BATCH_WORKERS', 2))
+
+
+def render(payload, export_format, options):
+    """Render a job; batches read the stored liturgies in an app context"""
+    if isinstance(payload, BatchRequest):
+        with app.app_context():
+            return render_export(payload, export_format, options, batch_workers=BATCH_WORKERS)
+    return render_export(payload, export_format, options)
+
+
+def main():
+    """Run the worker loop until interrupted"""
+    logging.basicConfig(level=logging.INFO)
+    client = redis.Redis(
+        host=os.environ.get('REDIS_HOST', 'localhost'),
+        port=int(os.environ.get('REDIS_PORT', 6379)),
+        password=os.environ.get('REDIS_PASSWORD') or None
+    )
+    print("Export worker waiting for jobs...")
+    try:
+        RedisJobQueue(client, render=render).work()
+    except KeyboardInterrupt:
+        print("Export worker stopped.")
+
+
+if __name__ == '__main__':
+    main()
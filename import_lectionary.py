@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Lectionary import
+Streams a lectionary dataset (CSV or JSON lines) into the readings,
+psalms, prayers, celebrations and daily_liturgies tables in batched
+transactions; an interrupted import resumes from its checkpoint file
+"""
+
+import argparse
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app, db
+from models.lectionary import LectionaryImporter, iter_records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Importa um lecionário (CSV ou JSON lines) para o banco de dados")
+    parser.add_argument('file', help="Arquivo do lecionário (.csv ou .jsonl)")
+    parser.add_argument('--format', choices=('csv', 'jsonl'), help="Formato do arquivo (padrão: pela extensão)")
+    parser.add_argument('--years', type=int, nargs='*', default=[],
+                        help="Anos em que os registros sem data são aplicados, ex.: 2026 2027")
+    parser.add_argument('--batch-size', type=int, default=500, help="Registros por transação (padrão: 500)")
+    parser.add_argument('--checkpoint', help="Arquivo de progresso (padrão: <arquivo>.checkpoint)")
+    parser.add_argument('--restart', action='store_true', help="Ignorar o progresso salvo e importar do início")
+    args = parser.parse_args()
+
+    importer = LectionaryImporter(
+        years=args.years,
+        batch_size=args.batch_size,
+        checkpoint=args.checkpoint or f"{args.file}.checkpoint"
+    )
+
+    def progress(stats):
+        print(f"  {stats.records} registros ({stats.rate:,.0f}/s)", flush=True)
+
+    with app.app_context():
+        db.create_all()
+        stats = importer.run(iter_records(args.file, args.format), resume=not args.restart, progress=progress)
+
+    print(f"{stats.records} registros em {stats.seconds:.2f} s: "
+          f"{stats.inserted} liturgias novas, {stats.updated} atualizadas, {stats.skipped} sem data")
+
+
+if __name__ == '__main__':
+    main()
@@ -2,8 +2,17 @@
 """
 Database initialization script
 Creates tables and seeds initial data for the Liturgia system
+
+The seed data lives in data/seed.json and is loaded with set-based
+upserts (INSERT ... ON CONFLICT), one statement per table. The hash of
+the applied file is stored in seed_versions, so later runs (e.g. on every
+container start) return right after a single lookup while the file is
+unchanged.
 """
 
+import argparse
+import hashlib
+import json
 import os
 import sys
 from datetime import date, datetime
@@ -11,243 +20,190 @@ from datetime import date, datetime
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from sqlalchemy import insert, select
+from sqlalchemy.exc import SQLAlchemyError
+
 from app import app, db
 from models.db_models import (
     LiturgicalColor, Celebration, Reading, Psalm, Prayer,
-    DailyLiturgy, Antiphon, LiturgyHour, CustomMass
+    DailyLiturgy, SeedVersion
+)
+from models.repository import (
+    DuplicateRowsError, ReadingRepository, ensure_schema, merge_duplicates, reading_index_values,
+    upsert_statement
 )
+from models.search import ensure_search_index
+
+SEED_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'seed.json')
+SEED_NAME = 'sample'
+
+# Tables whose seed rows are matched on a natural key
+KEYED_MODELS = (Celebration, Reading, Psalm, Prayer)
+
+LITURGY_READINGS = ('first_reading', 'second_reading', 'gospel')
+LITURGY_PRAYERS = ('collect_prayer', 'offertory_prayer', 'communion_prayer')
+
+
+def load_seed(path: str = SEED_FILE):
+    """Seed data and its version (SHA-256 of the file)"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return json.loads(raw), hashlib.sha256(raw).hexdigest()
+
+
+def applied_version(name: str = SEED_NAME):
+    """Version of the seed last applied, or None"""
+    try:
+        return db.session.execute(
+            select(SeedVersion.version).where(SeedVersion.name == name)
+        ).scalar()
+    except SQLAlchemyError:
+        db.session.rollback()
+        return None
+
 
+def upsert(model, rows, keys):
+    """Insert or update rows matched on keys in one statement"""
+    if not rows:
+        return
+    update_columns = [column for column in rows[0] if column not in keys]
+    db.session.execute(upsert_statement(model, keys, update_columns), rows)
+
+
+def id_map(model, *columns):
+    """Natural key -> id of every row in a table"""
+    key_columns = [getattr(model, column) for column in columns]
+    rows = db.session.execute(select(model.id, *key_columns)).all()
+    if len(columns) == 1:
+        return {row[1]: row[0] for row in rows}
+    return {tuple(row[1:]): row[0] for row in rows}
 
-def init_liturgical_colors():
-    """Initialize liturgical colors"""
+
+def seed_liturgical_colors(colors):
     print("Initializing liturgical colors...")
-    colors = [
-        {'name': 'verde', 'meaning': 'Tempo Comum - Esperança e crescimento'},
-        {'name': 'branco', 'meaning': 'Natal e Páscoa - Pureza e alegria'},
-        {'name': 'vermelho', 'meaning': 'Pentecostes e mártires - Fogo do Espírito Santo'},
-        {'name': 'roxo', 'meaning': 'Advento e Quaresma - Penitência e preparação'},
-        {'name': 'rosa', 'meaning': 'Gaudete e Laetare - Alegria na preparação'},
-    ]
-    
-    for color_data in colors:
-        color = LiturgicalColor.query.filter_by(name=color_data['name']).first()
-        if not color:
-            color = LiturgicalColor(**color_data)
-            db.session.add(color)
-            print(f"  Added color: {color_data['name']}")
-    
-    db.session.commit()
-    print("Liturgical colors initialized.")
-
-
-def init_sample_celebrations():
-    """Initialize sample celebrations"""
+    upsert(LiturgicalColor, colors, ['name'])
+    return id_map(LiturgicalColor, 'name')
+
+
+def seed_celebrations(celebrations, color_ids):
     print("Initializing sample celebrations...")
-    
-    verde = LiturgicalColor.query.filter_by(name='verde').first()
-    branco = LiturgicalColor.query.filter_by(name='branco').first()
-    vermelho = LiturgicalColor.query.filter_by(name='vermelho').first()
-    
-    celebrations = [
-        {
-            'name': 'Epifania do Senhor',
-            'date': date(2026, 1, 6),
-            'type': 'solenidade',
-            'season': 'Natal',
-            'color': branco
-        },
-        {
-            'name': 'Domingo Ordinário - 2ª Semana',
-            'date': date(2026, 1, 18),
-            'type': 'feria',
-            'season': 'Tempo Comum',
-            'color': verde
-        },
+    rows = [
         {
-            'name': 'Pentecostes',
-            'date': date(2026, 5, 24),
-            'type': 'solenidade',
-            'season': 'Páscoa',
-            'color': vermelho
-        },
+            'name': c['name'],
+            'date': date.fromisoformat(c['date']),
+            'type': c['type'],
+            'season': c['season'],
+            'color_id': color_ids.get(c.get('color')),
+        }
+        for c in celebrations
     ]
-    
-    for cel_data in celebrations:
-        celebration = Celebration.query.filter_by(
-            name=cel_data['name'],
-            date=cel_data['date']
-        ).first()
-        if not celebration:
-            celebration = Celebration(**cel_data)
-            db.session.add(celebration)
-            print(f"  Added celebration: {cel_data['name']}")
-    
-    db.session.commit()
-    print("Sample celebrations initialized.")
-
-
-def init_sample_readings():
-    """Initialize sample readings"""
-    print("Initializing sample readings...")
-    
-    readings = [
-        {
-            'reference': 'Is 60,1-6',
-            'book': 'Isaías',
-            'chapter': 60,
-            'verses': '1-6',
-            'text': 'Levanta-te, acende as lâmpadas, Jerusalém, porque chegou a tua luz...'
-        },
-        {
-            'reference': 'Ef 3,2-3a.5-6',
-            'book': 'Efésios',
-            'chapter': 3,
-            'verses': '2-3a.5-6',
-            'text': 'Certamente ouvistes falar da missão da graça de Deus...'
-        },
-        {
-            'reference': 'Mt 2,1-12',
-            'book': 'Mateus',
-            'chapter': 2,
-            'verses': '1-12',
-            'text': 'Tendo Jesus nascido em Belém da Judeia...'
-        },
-    ]
-    
-    for read_data in readings:
-        reading = Reading.query.filter_by(reference=read_data['reference']).first()
-        if not reading:
-            reading = Reading(**read_data)
-            db.session.add(reading)
-            print(f"  Added reading: {read_data['reference']}")
-    
-    db.session.commit()
-    print("Sample readings initialized.")
-
-
-def init_sample_psalms():
-    """Initialize sample psalms"""
-    print("Initializing sample psalms...")
-    
-    psalms = [
-        {
-            'number': 71,
-            'reference': 'Sl 71',
-            'response': 'Todos os povos, Senhor, hão de adorar-vos',
-            'verses': 'V. Ó Deus, dai ao rei vosso julgamento\nV. Nele floresça a justiça nestes dias'
-        },
-        {
-            'number': 23,
-            'reference': 'Sl 23',
-            'response': 'O Senhor é meu pastor, nada me falta',
-            'verses': 'V. O Senhor é meu pastor, nada me falta\nV. Pelos prados verdejantes me conduz'
-        },
-    ]
-    
-    for psalm_data in psalms:
-        psalm = Psalm.query.filter_by(number=psalm_data['number'], reference=psalm_data['reference']).first()
-        if not psalm:
-            psalm = Psalm(**psalm_data)
-            db.session.add(psalm)
-            print(f"  Added psalm: {psalm_data['reference']}")
-    
-    db.session.commit()
-    print("Sample psalms initialized.")
-
-
-def init_sample_prayers():
-    """Initialize sample prayers"""
-    print("Initializing sample prayers...")
-    
-    prayers = [
-        {
-            'title': 'Oração do Dia - Epifania',
-            'text': 'Ó Deus, que neste dia revelastes vosso Filho às nações...',
-            'category': 'collect',
-            'response': 'Amém'
-        },
-        {
-            'title': 'Oração sobre as Oferendas',
-            'text': 'Olhai, ó Deus, as oferendas da vossa Igreja...',
-            'category': 'offertory',
-            'response': 'Amém'
-        },
-    ]
-    
-    for prayer_data in prayers:
-        prayer = Prayer.query.filter_by(title=prayer_data['title']).first()
-        if not prayer:
-            prayer = Prayer(**prayer_data)
-            db.session.add(prayer)
-            print(f"  Added prayer: {prayer_data['title']}")
-    
-    db.session.commit()
-    print("Sample prayers initialized.")
-
-
-def init_sample_daily_liturgy():
-    """Initialize sample daily liturgy"""
+    upsert(Celebration, rows, ['name', 'date'])
+
+
+def seed_daily_liturgies(liturgies):
+    """
+    Insert the liturgies of celebrations that have none yet
+
+    A celebration may have several liturgies, so there is no key to
+    upsert on; existing ones are left as they are.
+    """
     print("Initializing sample daily liturgy...")
-    
-    # Get Epiphany celebration
-    epifania = Celebration.query.filter_by(name='Epifania do Senhor').first()
-    if not epifania:
-        print("  Epifania celebration not found, skipping daily liturgy")
-        return
-    
-    # Check if liturgy already exists
-    existing = DailyLiturgy.query.filter_by(celebration_id=epifania.id).first()
-    if existing:
-        print("  Daily liturgy for Epifania already exists")
-        return
-    
-    # Get readings
-    first_reading = Reading.query.filter_by(reference='Is 60,1-6').first()
-    second_reading = Reading.query.filter_by(reference='Ef 3,2-3a.5-6').first()
-    gospel = Reading.query.filter_by(reference='Mt 2,1-12').first()
-    psalm = Psalm.query.filter_by(number=71).first()
-    collect_prayer = Prayer.query.filter_by(category='collect').first()
-    
-    liturgy = DailyLiturgy(
-        celebration=epifania,
-        first_reading=first_reading,
-        second_reading=second_reading,
-        gospel=gospel,
-        psalm=psalm,
-        collect_prayer=collect_prayer
-    )
-    db.session.add(liturgy)
-    db.session.commit()
-    print("  Added daily liturgy for Epifania")
-    print("Sample daily liturgy initialized.")
-
-
-def initialize_database():
+    celebration_ids = id_map(Celebration, 'name', 'date')
+    reading_ids = id_map(Reading, 'reference')
+    psalm_ids = id_map(Psalm, 'number', 'reference')
+    prayer_ids = id_map(Prayer, 'title')
+
+    rows = []
+    for liturgy in liturgies:
+        name, day = liturgy['celebration']
+        celebration_id = celebration_ids.get((name, date.fromisoformat(day)))
+        if celebration_id is None:
+            print(f"  Celebration not found, skipping daily liturgy: {name}")
+            continue
+        row = {'celebration_id': celebration_id}
+        for field in LITURGY_READINGS:
+            row[f'{field}_id'] = reading_ids.get(liturgy.get(field))
+        for field in LITURGY_PRAYERS:
+            row[f'{field}_id'] = prayer_ids.get(liturgy.get(field))
+        psalm = liturgy.get('psalm')
+        row['psalm_id'] = psalm_ids.get(tuple(psalm)) if psalm else None
+        rows.append(row)
+
+    existing = set(db.session.execute(
+        select(DailyLiturgy.celebration_id)
+        .where(DailyLiturgy.celebration_id.in_([row['celebration_id'] for row in rows]))
+    ).scalars())
+    missing = [row for row in rows if row['celebration_id'] not in existing]
+    if missing:
+        db.session.execute(insert(DailyLiturgy), missing)
+    print(f"  Added {len(missing)} daily liturgies")
+
+
+def apply_seed(data, version, name: str = SEED_NAME):
+    """Upsert all seed tables and record the version in one transaction"""
+    try:
+        color_ids = seed_liturgical_colors(data.get('liturgical_colors', []))
+        seed_celebrations(data.get('celebrations', []), color_ids)
+        print("Initializing sample readings...")
+        readings = [{**reading_index_values(r['reference']), **r} for r in data.get('readings', [])]
+        upsert(Reading, readings, ['reference'])
+        print("Initializing sample psalms...")
+        upsert(Psalm, data.get('psalms', []), ['number', 'reference'])
+        print("Initializing sample prayers...")
+        upsert(Prayer, data.get('prayers', []), ['title'])
+        seed_daily_liturgies(data.get('daily_liturgies', []))
+        upsert(SeedVersion, [{'name': name, 'version': version, 'applied_at': datetime.utcnow()}], ['name'])
+        db.session.commit()
+    except SQLAlchemyError:
+        db.session.rollback()
+        raise
+
+
+def merge_duplicate_rows():
+    """Merge the rows that block the unique indexes of KEYED_MODELS (logged one by one)"""
+    try:
+        removed = merge_duplicates(*KEYED_MODELS)
+        db.session.commit()
+    except SQLAlchemyError:
+        db.session.rollback()
+        raise
+    print(f"  Merged {removed} duplicate rows")
+
+
+def initialize_database(seed_file: str = SEED_FILE, force: bool = False, merge: bool = False):
     """Main initialization function"""
     print("=" * 80)
     print("INITIALIZING LITURGIA DATABASE")
     print("=" * 80)
-    
+
+    data, version = load_seed(seed_file)
+
     with app.app_context():
         # Create all tables
         print("\nCreating database tables...")
         db.create_all()
+        if merge:
+            merge_duplicate_rows()
+        ensure_schema(*KEYED_MODELS)
+        indexed = ReadingRepository().reindex()
+        if indexed:
+            print(f"  Indexed {indexed} readings")
+        ensure_search_index()
         print("Database tables created.")
-        
-        # Initialize data
-        init_liturgical_colors()
-        init_sample_celebrations()
-        init_sample_readings()
-        init_sample_psalms()
-        init_sample_prayers()
-        init_sample_daily_liturgy()
-        
+
+        if not force and applied_version() == version:
+            print(f"\nSeed data unchanged ({version[:12]}), nothing to do.")
+            return
+
+        apply_seed(data, version)
+
         print("\n" + "=" * 80)
         print("DATABASE INITIALIZATION COMPLETE")
         print("=" * 80)
-        
+
         # Print summary
         print("\nDatabase Summary:")
+        print(f"  Seed version: {version[:12]}")
         print(f"  Liturgical Colors: {LiturgicalColor.query.count()}")
         print(f"  Celebrations: {Celebration.query.count()}")
         print(f"  Readings: {Reading.query.count()}")
@@ -257,5 +213,19 @@ def initialize_database():
         print()
 
 
+def main():
+    parser = argparse.ArgumentParser(description="Cria as tabelas e carrega os dados iniciais")
+    parser.add_argument('--seed-file', default=SEED_FILE, help="Arquivo JSON de dados iniciais")
+    parser.add_argument('--force', action='store_true', help="Reaplicar mesmo sem alterações no arquivo")
+    parser.add_argument('--merge-duplicates', action='store_true',
+                        help="Mesclar linhas duplicadas que impedem os índices únicos, mantendo a de menor id "
+                             "(cada linha removida é registrada no log)")
+    args = parser.parse_args()
+    try:
+        initialize_database(args.seed_file, args.force, args.merge_duplicates)
+    except DuplicateRowsError as e:
+        sys.exit(f"ERRO: {e}")
+
+
 if __name__ == '__main__':
-    initialize_database()
+    main()
@@ -4,12 +4,21 @@ Models for the Liturgia system
 
 from .base import Reading, Psalm, Prayer, Antiphon, LiturgicalColor, Celebration
 from .custom_mass import CustomMass, MassPart
+from .pdf_cache import PDFCache
 from .daily_liturgy import DailyLiturgy, LiturgiaDaily
 from .liturgy_hours import LiturgiaHoras, Hour
+from .liturgical_calendar import LiturgicalCalendar, LiturgicalYear, CalendarDay
+from .cache import (
+    LRUCache, RedisCache, TieredCache, InMemoryRedis,
+    liturgy_cache, content_cache, invalidate_date
+)
 
 __all__ = [
     "Reading", "Psalm", "Prayer", "Antiphon", "LiturgicalColor", "Celebration",
-    "CustomMass", "MassPart",
+    "CustomMass", "MassPart", "PDFCache",
     "DailyLiturgy", "LiturgiaDaily",
-    "LiturgiaHoras", "Hour"
+    "LiturgiaHoras", "Hour",
+    "LiturgicalCalendar", "LiturgicalYear", "CalendarDay",
+    "LRUCache", "RedisCache", "TieredCache", "InMemoryRedis",
+    "liturgy_cache", "content_cache", "invalidate_date"
 ]
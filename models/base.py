@@ -3,7 +3,7 @@ Base models for liturgical components
 """
 
 from dataclasses import dataclass, field
-from typing import Optional, List
+from typing import Iterable, Iterator, Optional, List
 from datetime import date
 
 
@@ -31,7 +31,9 @@ class Psalm:
     verses: List[str] = field(default_factory=list)
     
     def __str__(self):
-        result = [f"Salmo {self.number} ({self.reference})"]
+        # Canticles have no psalm number
+        result = [f"Salmo {self.number} ({self.reference})" if self.number
+                  else f"Cântico ({self.reference})"]
         if self.response:
             result.append(f"R. {self.response}")
         for verse in self.verses:
@@ -88,3 +90,25 @@ class Celebration:
     
     def __str__(self):
         return f"{self.name} ({self.type})"
+
+
+def iter_text(lines: Iterable[str], chunk_size: int = 8192) -> Iterator[str]:
+    """
+    Join lines with newlines (like ``"\n".join(lines)``), yielding chunks of
+    about chunk_size characters as the lines are produced
+    """
+    buffer = []
+    size = 0
+    first = True
+    for line in lines:
+        if not first:
+            buffer.append("\n")
+        first = False
+        buffer.append(line)
+        size += len(line) + 1
+        if size >= chunk_size:
+            yield "".join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield "".join(buffer)
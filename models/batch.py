@@ -0,0 +1,178 @@
+"""
+Batch generation of Mass leaflets for a range of dates
+
+Masses are filled from LiturgiaDaily in the calling process and rendered
+to PDF in parallel on a process pool (ReportLab is CPU bound). The result
+is a zip with one PDF per date or a single merged PDF, plus the time
+spent on each item.
+"""
+
+import io
+import multiprocessing
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from .custom_mass import CustomMass
+from .daily_liturgy import DailyLiturgy, LiturgiaDaily
+
+# Which days of the range get a leaflet
+SELECTIONS = ('all', 'sundays', 'sundays_and_solemnities')
+
+
+@dataclass
+class BatchItem:
+    """One rendered leaflet"""
+    date: str
+    name: str
+    filename: str
+    size: int
+    seconds: float
+
+
+@dataclass
+class BatchResult:
+    """Output of a batch run"""
+    data: bytes
+    format: str  # zip or pdf
+    items: List[BatchItem] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def mimetype(self) -> str:
+        return 'application/zip' if self.format == 'zip' else 'application/pdf'
+
+
+@dataclass(frozen=True)
+class BatchRequest:
+    """A batch of leaflets submitted as an export job (see models.jobs)"""
+    start: str
+    end: str
+    selection: str = 'sundays'
+    output: str = 'zip'
+
+    def __post_init__(self):
+        if self.selection not in SELECTIONS:
+            raise ValueError(f"Seleção inválida: {self.selection}")
+        if self.output not in ('zip', 'pdf'):
+            raise ValueError(f"Formato de saída inválido: {self.output}")
+
+    def render(self, options: Dict, workers: Optional[int] = 1) -> bytes:
+        """Build the batch (inline unless workers > 1)"""
+        return build_batch(self.start, self.end, selection=self.selection, output=self.output,
+                           workers=workers, **options).data
+
+
+def mass_from_liturgy(liturgy: DailyLiturgy) -> CustomMass:
+    """Fill a CustomMass with the celebration, readings and prayers of a day"""
+    cel = liturgy.celebration
+    mass = CustomMass()
+    mass.set_celebration(
+        name=cel.name,
+        date_str=cel.date.strftime('%Y-%m-%d'),
+        celebration_type=cel.type,
+        color=str(cel.color),
+        season=cel.season
+    )
+    mass.set_readings(
+        first_reading=liturgy.first_reading.reference if liturgy.first_reading else "",
+        psalm=liturgy.psalm.reference if liturgy.psalm else "",
+        second_reading=liturgy.second_reading.reference if liturgy.second_reading else "",
+        gospel=liturgy.gospel.reference if liturgy.gospel else ""
+    )
+    if liturgy.collect_prayer:
+        mass.set_part_content("collect", liturgy.collect_prayer.text)
+    if liturgy.offertory_prayer:
+        mass.set_part_content("prayer_offerings", liturgy.offertory_prayer.text)
+    if liturgy.communion_prayer:
+        mass.set_part_content("prayer_communion", liturgy.communion_prayer.text)
+    return mass
+
+
+def _selected(liturgy: DailyLiturgy, selection: str) -> bool:
+    cel = liturgy.celebration
+    if selection == 'sundays':
+        return cel.date.weekday() == 6
+    if selection == 'sundays_and_solemnities':
+        return cel.date.weekday() == 6 or cel.type == 'solenidade'
+    return True
+
+
+def _render(job: Tuple[str, str, CustomMass, Dict]) -> Tuple[str, str, bytes, float]:
+    """Render one mass (runs in a worker process)"""
+    date_str, name, mass, options = job
+    started = time.perf_counter()
+    data = mass.export_to_pdf(**options)
+    return date_str, name, data, time.perf_counter() - started
+
+
+def build_batch(start_str: str, end_str: str, selection: str = 'sundays',
+                output: str = 'zip', workers: Optional[int] = None,
+                **options) -> BatchResult:
+    """
+    Render leaflets for the dates from start to end (inclusive)
+
+    Args:
+        start_str, end_str: Dates in format YYYY-MM-DD
+        selection: 'all', 'sundays' or 'sundays_and_solemnities'
+        output: 'zip' (one PDF per date) or 'pdf' (a single merged PDF)
+        workers: Worker processes (default: CPU count; 1 renders inline)
+        **options: export_to_pdf options
+    """
+    if selection not in SELECTIONS:
+        raise ValueError(f"Seleção inválida: {selection}")
+    if output not in ('zip', 'pdf'):
+        raise ValueError(f"Formato de saída inválido: {output}")
+
+    started = time.perf_counter()
+    options = CustomMass.normalize_pdf_options(options)
+    jobs = [
+        (liturgy.celebration.date.strftime('%Y-%m-%d'), liturgy.celebration.name,
+         mass_from_liturgy(liturgy), options)
+        for liturgy in LiturgiaDaily.get_for_range(start_str, end_str)
+        if _selected(liturgy, selection)
+    ]
+
+    workers = workers or multiprocessing.cpu_count()
+    if workers == 1 or len(jobs) <= 1:
+        rendered = [_render(job) for job in jobs]
+    else:
+        # spawn: never fork a threaded web process
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs)), mp_context=context) as pool:
+            rendered = list(pool.map(_render, jobs))
+
+    items = []
+    if output == 'zip':
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for date_str, name, data, seconds in rendered:
+                filename = f"missa_{date_str}.pdf"
+                archive.writestr(filename, data)
+                items.append(BatchItem(date_str, name, filename, len(data), seconds))
+        data = buffer.getvalue()
+    else:
+        data = _merge_pdfs([pdf for _, _, pdf, _ in rendered])
+        items = [BatchItem(date_str, name, "", len(pdf), seconds)
+                 for date_str, name, pdf, seconds in rendered]
+
+    return BatchResult(data=data, format=output, items=items,
+                       seconds=time.perf_counter() - started)
+
+
+def _merge_pdfs(documents: List[bytes]) -> bytes:
+    """Concatenate PDF documents"""
+    try:
+        from pypdf import PdfReader, PdfWriter
+    except ImportError:
+        raise ImportError("pypdf is required to merge PDFs. Install with: pip install pypdf")
+
+    writer = PdfWriter()
+    for document in documents:
+        writer.append(PdfReader(io.BytesIO(document)))
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
@@ -0,0 +1,169 @@
+"""
+Bible references in the Brazilian liturgical notation
+
+Parses references such as "Ef 3,2-3a.5-6", "Ap 4,11; 5,9.10.12",
+"Is 61,10-62,5" or "Sl 71(72)" into a canonical form: book code, chapter
+and a list of verse ranges. The patterns are compiled once and parsed
+references are memoized, so hot paths can call parse_reference freely.
+
+Notation: a comma separates chapter and verses, a dot separates verse
+groups, a hyphen makes a range (across chapters when the end has its own
+"chapter,"), a semicolon starts another chapter of the same book and a
+parenthesized number is the alternate (Hebrew) psalm numbering. Letter
+suffixes (3a, 10b) mark half verses; they are kept in ``verses`` and
+ignored in the numeric ranges.
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, NamedTuple, Optional, Tuple
+
+
+# Canonical code and name of each book, in canonical order
+BOOKS: Tuple[Tuple[str, str], ...] = (
+    ("Gn", "Gênesis"), ("Ex", "Êxodo"), ("Lv", "Levítico"), ("Nm", "Números"),
+    ("Dt", "Deuteronômio"), ("Js", "Josué"), ("Jz", "Juízes"), ("Rt", "Rute"),
+    ("1Sm", "1 Samuel"), ("2Sm", "2 Samuel"), ("1Rs", "1 Reis"), ("2Rs", "2 Reis"),
+    ("1Cr", "1 Crônicas"), ("2Cr", "2 Crônicas"), ("Esd", "Esdras"), ("Ne", "Neemias"),
+    ("Tb", "Tobias"), ("Jt", "Judite"), ("Est", "Ester"), ("1Mc", "1 Macabeus"),
+    ("2Mc", "2 Macabeus"), ("Jó", "Jó"), ("Sl", "Salmos"), ("Pr", "Provérbios"),
+    ("Ecl", "Eclesiastes"), ("Ct", "Cântico dos Cânticos"), ("Sb", "Sabedoria"),
+    ("Eclo", "Eclesiástico"), ("Is", "Isaías"), ("Jr", "Jeremias"), ("Lm", "Lamentações"),
+    ("Br", "Baruc"), ("Ez", "Ezequiel"), ("Dn", "Daniel"), ("Os", "Oseias"), ("Jl", "Joel"),
+    ("Am", "Amós"), ("Ab", "Abdias"), ("Jn", "Jonas"), ("Mq", "Miqueias"), ("Na", "Naum"),
+    ("Hab", "Habacuc"), ("Sf", "Sofonias"), ("Ag", "Ageu"), ("Zc", "Zacarias"),
+    ("Ml", "Malaquias"),
+    ("Mt", "Mateus"), ("Mc", "Marcos"), ("Lc", "Lucas"), ("Jo", "João"), ("At", "Atos dos Apóstolos"),
+    ("Rm", "Romanos"), ("1Cor", "1 Coríntios"), ("2Cor", "2 Coríntios"), ("Gl", "Gálatas"),
+    ("Ef", "Efésios"), ("Fl", "Filipenses"), ("Cl", "Colossenses"), ("1Ts", "1 Tessalonicenses"),
+    ("2Ts", "2 Tessalonicenses"), ("1Tm", "1 Timóteo"), ("2Tm", "2 Timóteo"), ("Tt", "Tito"),
+    ("Fm", "Filêmon"), ("Hb", "Hebreus"), ("Tg", "Tiago"), ("1Pd", "1 Pedro"), ("2Pd", "2 Pedro"),
+    ("1Jo", "1 João"), ("2Jo", "2 João"), ("3Jo", "3 João"), ("Jd", "Judas"), ("Ap", "Apocalipse"),
+)
+
+BOOK_NAMES: Dict[str, str] = dict(BOOKS)
+
+# Other spellings found in lectionaries
+_ALIASES = {
+    "Job": "Jó", "Sal": "Sl", "Salmo": "Sl", "Eclu": "Eclo", "Sir": "Eclo", "Ecle": "Ecl",
+    "Fp": "Fl", "Fil": "Fl", "1Pe": "1Pd", "2Pe": "2Pd", "1Co": "1Cor", "2Co": "2Cor",
+    "Abd": "Ab", "Mi": "Mq", "Sof": "Sf",
+}
+
+_BOOK_INDEX: Dict[str, str] = {}
+for _code, _name in BOOKS:
+    _BOOK_INDEX[_code.casefold()] = _code
+    _BOOK_INDEX[_name.replace(" ", "").casefold()] = _code
+for _alias, _code in _ALIASES.items():
+    _BOOK_INDEX.setdefault(_alias.casefold(), _code)
+
+_REFERENCE_RE = re.compile(r"^\s*([1-3]?\s?[^\W\d_]+)\.?\s+(\d.*?)\s*$")
+_CHAPTER_RE = re.compile(r"^(\d+)(?:\s*\((\d+)\))?(?:\s*,\s*(.+))?$")
+_VERSES_RE = re.compile(r"^(\d+)[a-z]*(?:\s*-\s*(?:(\d+)\s*,\s*)?(\d+)[a-z]*)?$")
+_SPACES_RE = re.compile(r"\s+")
+
+
+class VerseRange(NamedTuple):
+    """Verses from chapter:start to end_chapter:end (0, 0 for a whole chapter)"""
+    chapter: int
+    start: int
+    end_chapter: int
+    end: int
+
+
+@dataclass(frozen=True)
+class BibleReference:
+    """Canonical form of a reference"""
+    book: str
+    chapter: int
+    verses: str
+    ranges: Tuple[VerseRange, ...]
+    alt_chapter: Optional[int] = None
+
+    @property
+    def book_name(self) -> str:
+        return BOOK_NAMES[self.book]
+
+    @property
+    def end_chapter(self) -> int:
+        """Last chapter the reference reaches"""
+        return max(r.end_chapter for r in self.ranges)
+
+    def __str__(self):
+        head = f"{self.book} {self.chapter}"
+        if self.alt_chapter:
+            head += f"({self.alt_chapter})"
+        return f"{head},{self.verses}" if self.verses else head
+
+
+def book_code(book: str) -> Optional[str]:
+    """Canonical code of a book code, alias or name (None if unknown)"""
+    return _BOOK_INDEX.get(_SPACES_RE.sub("", book).rstrip(".").casefold())
+
+
+def _ranges(chapter: int, spec: str) -> Tuple[VerseRange, ...]:
+    ranges = []
+    for group in spec.split("."):
+        match = _VERSES_RE.match(group.strip())
+        if not match:
+            raise ValueError(f"Versículos inválidos: {group!r}")
+        start = int(match.group(1))
+        end_chapter = int(match.group(2)) if match.group(2) else chapter
+        end = int(match.group(3)) if match.group(3) else start
+        ranges.append(VerseRange(chapter, start, end_chapter, end))
+        chapter = end_chapter
+    return tuple(ranges)
+
+
+@lru_cache(maxsize=8192)
+def parse_reference(reference: str) -> BibleReference:
+    """
+    Parse a reference like "Ef 3,2-3a.5-6"
+
+    Raises ValueError if the reference does not follow the notation or
+    names an unknown book.
+    """
+    match = _REFERENCE_RE.match(reference)
+    if not match:
+        raise ValueError(f"Referência bíblica inválida: {reference!r}")
+    code = book_code(match.group(1))
+    if code is None:
+        raise ValueError(f"Livro desconhecido: {match.group(1)!r}")
+
+    chapter = alt_chapter = None
+    verse_specs = []
+    ranges = []
+    for i, part in enumerate(match.group(2).split(";")):
+        part = _SPACES_RE.sub("", part)
+        chapter_match = _CHAPTER_RE.match(part)
+        if not chapter_match:
+            raise ValueError(f"Referência bíblica inválida: {reference!r}")
+        part_chapter = int(chapter_match.group(1))
+        spec = chapter_match.group(3)
+        if i == 0:
+            chapter = part_chapter
+            alt_chapter = int(chapter_match.group(2)) if chapter_match.group(2) else None
+            verse_specs.append(spec or "")
+        else:
+            verse_specs.append(f"{part_chapter},{spec}" if spec else str(part_chapter))
+        ranges.extend(_ranges(part_chapter, spec) if spec else [VerseRange(part_chapter, 0, part_chapter, 0)])
+
+    verses = "; ".join(verse_specs)
+    return BibleReference(code, chapter, verses, tuple(ranges), alt_chapter)
+
+
+def try_parse_reference(reference: str) -> Optional[BibleReference]:
+    """parse_reference, returning None instead of raising"""
+    try:
+        return parse_reference(reference)
+    except ValueError:
+        return None
+
+
+def psalm_number(reference: str) -> Optional[int]:
+    """Psalm number of a reference like "Sl 71(72)" (None if not a psalm)"""
+    parsed = try_parse_reference(reference) if reference else None
+    if parsed is None or parsed.book != "Sl":
+        return None
+    return parsed.chapter
@@ -0,0 +1,451 @@
+"""
+Caches for liturgy content
+
+Daily liturgies and canonical hours for a date are immutable unless an
+admin edits them, so results are cached per process in a bounded LRU
+with a TTL and invalidated explicitly on edits. Optionally a shared Redis
+tier sits behind the in-process LRU so every worker process and replica
+reuses the same entries.
+"""
+
+import fnmatch
+import functools
+import logging
+import pickle
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    Thread-safe LRU cache with per-entry expiry and hit/miss counters
+
+    Cached objects are shared between requests and must be treated as
+    read-only by callers.
+    """
+
+    def __init__(self, maxsize: int = 2048, ttl: Optional[float] = 3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def configure(self, maxsize: Optional[int] = None, ttl: Optional[float] = _MISSING):
+        """Change size and/or TTL (a TTL of None disables expiry)"""
+        with self._lock:
+            if maxsize is not None:
+                self.maxsize = maxsize
+            if ttl is not _MISSING:
+                self.ttl = ttl
+            self._evict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a value, counting the hit or miss"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires = entry
+                if expires is None or expires > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any):
+        """Store a value, evicting the least recently used entries if full"""
+        expires = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            self._evict()
+
+    def delete(self, key: Hashable) -> bool:
+        """Remove a key; returns whether it was present"""
+        with self._lock:
+            return self._data.pop(key, None) is not None
+
+    def delete_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Remove every key matching predicate; returns how many were removed"""
+        with self._lock:
+            keys = [key for key in self._data if predicate(key)]
+            for key in keys:
+                del self._data[key]
+            return len(keys)
+
+    def clear(self):
+        """Remove all entries (counters are kept)"""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Current size and counters"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': round(self.hits / total, 4) if total else 0.0,
+            }
+
+    def __len__(self):
+        return len(self._data)
+
+    def _evict(self):
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+
+class InMemoryRedis:
+    """
+    Minimal in-process stand-in for a redis.Redis client
+
+    Implements the subset used by RedisCache and RedisJobQueue (get/set/
+    mget/delete/scan_iter/pipeline/ping/lpush/brpop), so the shared tier
+    and the job queue can be exercised without a server.
+    """
+
+    def __init__(self):
+        self._data: Dict[str, tuple] = {}
+        self._lists: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+
+    def _live(self, name: str) -> Optional[bytes]:
+        entry = self._data.get(name)
+        if entry is None:
+            return None
+        value, expires = entry
+        if expires is not None and expires <= time.monotonic():
+            del self._data[name]
+            return None
+        return value
+
+    def ping(self) -> bool:
+        return True
+
+    def get(self, name: str) -> Optional[bytes]:
+        with self._lock:
+            return self._live(name)
+
+    def mget(self, keys: Iterable[str]) -> List[Optional[bytes]]:
+        with self._lock:
+            return [self._live(key) for key in keys]
+
+    def set(self, name: str, value: bytes, ex: Optional[int] = None) -> bool:
+        with self._lock:
+            self._data[name] = (value, time.monotonic() + ex if ex else None)
+        return True
+
+    def delete(self, *names: str) -> int:
+        with self._lock:
+            return sum(self._data.pop(name, None) is not None for name in names)
+
+    def scan_iter(self, match: str = "*"):
+        with self._lock:
+            # Redis escapes with a backslash, fnmatch with a one-character set
+            pattern = re.sub(r'\\(.)', r'[\1]', match)
+            keys = [key for key in self._data if fnmatch.fnmatchcase(key, pattern)]
+        return iter(keys)
+
+    def lpush(self, name: str, *values: bytes) -> int:
+        with self._changed:
+            items = self._lists.setdefault(name, deque())
+            items.extendleft(values)
+            self._changed.notify_all()
+            return len(items)
+
+    def brpop(self, keys, timeout: float = 0) -> Optional[tuple]:
+        keys = [keys] if isinstance(keys, str) else list(keys)
+        deadline = time.monotonic() + timeout if timeout else None
+        with self._changed:
+            while True:
+                for key in keys:
+                    if self._lists.get(key):
+                        return key, self._lists[key].pop()
+                remaining = deadline - time.monotonic() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._changed.wait(remaining)
+
+    def flushdb(self) -> bool:
+        with self._lock:
+            self._data.clear()
+            self._lists.clear()
+        return True
+
+    def pipeline(self, transaction: bool = False):
+        return _InMemoryPipeline(self)
+
+
+class _InMemoryPipeline:
+    """Buffers commands and runs them on execute(), like redis.client.Pipeline"""
+
+    def __init__(self, client: InMemoryRedis):
+        self._client = client
+        self._commands: List[tuple] = []
+
+    def __getattr__(self, name):
+        def command(*args, **kwargs):
+            self._commands.append((name, args, kwargs))
+            return self
+        return command
+
+    def execute(self) -> List[Any]:
+        results = [getattr(self._client, name)(*args, **kwargs)
+                   for name, args, kwargs in self._commands]
+        self._commands = []
+        return results
+
+
+class RedisCache:
+    """
+    Shared cache tier stored in Redis
+
+    Values are pickled; keys are ``prefix + ":".join(key parts)``. Errors
+    never propagate: after a failure the tier is skipped for ``retry_after``
+    seconds and callers fall back to the in-process cache.
+    """
+
+    def __init__(self, client, prefix: str = "liturgia", ttl: Optional[int] = 86400,
+                 retry_after: float = 30.0):
+        self.client = client
+        self.prefix = prefix
+        self.ttl = ttl
+        self.retry_after = retry_after
+        self._down_until = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def _name(self, key: Hashable) -> str:
+        parts = key if isinstance(key, tuple) else (key,)
+        return ":".join([self.prefix, *map(str, parts)])
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self._down_until
+
+    def _failed(self, e: Exception):
+        self.errors += 1
+        self._down_until = time.monotonic() + self.retry_after
+        logger.warning("Cache Redis indisponível: %s", e)
+
+    def get_many(self, keys: List[Hashable]) -> Dict[Hashable, Any]:
+        """Fetch several keys in one round trip (MGET); absent keys are omitted"""
+        if not keys or not self.available:
+            return {}
+        try:
+            raw = self.client.mget([self._name(key) for key in keys])
+        except Exception as e:
+            self._failed(e)
+            return {}
+        found = {}
+        for key, value in zip(keys, raw):
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                found[key] = pickle.loads(value)
+        return found
+
+    def set_many(self, items: Dict[Hashable, Any]):
+        """Store several values in one pipelined round trip"""
+        if not items or not self.available:
+            return
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for key, value in items.items():
+                pipe.set(self._name(key), pickle.dumps(value, pickle.HIGHEST_PROTOCOL), ex=self.ttl)
+            pipe.execute()
+        except Exception as e:
+            self._failed(e)
+
+    def delete_many(self, keys: List[Hashable]):
+        """Delete several keys in one round trip"""
+        if not keys or not self.available:
+            return
+        try:
+            self.client.delete(*[self._name(key) for key in keys])
+        except Exception as e:
+            self._failed(e)
+
+    def delete_pattern(self, *parts: str):
+        """Delete every key under prefix:parts (glob wildcards allowed)"""
+        if not self.available:
+            return
+        try:
+            names = list(self.client.scan_iter(match=self._name(tuple(parts))))
+            if names:
+                self.client.delete(*names)
+        except Exception as e:
+            self._failed(e)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'errors': self.errors,
+            'available': self.available,
+        }
+
+
+class TieredCache:
+    """
+    In-process LRU in front of an optional shared RedisCache
+
+    Reads go to the LRU first and then to Redis (populating the LRU);
+    writes and invalidations go to both tiers.
+    """
+
+    def __init__(self, local: LRUCache, remote: Optional[RedisCache] = None):
+        self.local = local
+        self.remote = remote
+
+    def set_remote(self, remote: Optional[RedisCache]):
+        """Attach (or detach with None) the shared tier"""
+        self.remote = remote
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        value = self.local.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        if self.remote is not None:
+            found = self.remote.get_many([key])
+            if key in found:
+                self.local.set(key, found[key])
+                return found[key]
+        return default
+
+    def get_many(self, keys: List[Hashable]) -> Dict[Hashable, Any]:
+        """Look up several keys; Redis is queried once for all local misses"""
+        found = {}
+        missing = []
+        for key in keys:
+            value = self.local.get(key, _MISSING)
+            if value is _MISSING:
+                missing.append(key)
+            else:
+                found[key] = value
+        if missing and self.remote is not None:
+            remote = self.remote.get_many(missing)
+            for key, value in remote.items():
+                self.local.set(key, value)
+            found.update(remote)
+        return found
+
+    def set(self, key: Hashable, value: Any):
+        self.local.set(key, value)
+        if self.remote is not None:
+            self.remote.set_many({key: value})
+
+    def set_many(self, items: Dict[Hashable, Any]):
+        for key, value in items.items():
+            self.local.set(key, value)
+        if self.remote is not None:
+            self.remote.set_many(items)
+
+    def delete(self, key: Hashable) -> bool:
+        removed = self.local.delete(key)
+        if self.remote is not None:
+            self.remote.delete_many([key])
+        return removed
+
+    def delete_where(self, predicate: Callable[[Hashable], bool], *pattern: str) -> int:
+        """Remove matching local keys and the Redis keys matching pattern parts"""
+        removed = self.local.delete_where(predicate)
+        if self.remote is not None and pattern:
+            self.remote.delete_pattern(*pattern)
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        result = self.local.stats()
+        if self.remote is not None:
+            result['redis'] = self.remote.stats()
+        return result
+
+
+# Process-wide cache for liturgy content, keyed by (date_str, kind)
+liturgy_cache = LRUCache()
+
+# Cache used by the models: the LRU above plus the optional Redis tier
+content_cache = TieredCache(liturgy_cache)
+
+
+def cached_by_date(kind: str):
+    """
+    Cache the result of a ``(cls, date_str)`` classmethod in content_cache
+
+    Apply below ``@classmethod``. The key is ``(date_str, kind)``, where kind
+    identifies the content ("daily", "laudes", "vesperas", ...).
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(cls, date_str: str):
+            key = (date_str, kind)
+            value = content_cache.get(key, _MISSING)
+            if value is _MISSING:
+                value = func(cls, date_str)
+                content_cache.set(key, value)
+            return value
+        return wrapper
+    return decorator
+
+
+def _glob_literal(part: str) -> str:
+    """Escape Redis glob metacharacters so part only matches itself"""
+    return re.sub(r'([\\*?\[\]])', r'\\\1', part)
+
+
+def invalidate_date(date_str: str, kind: Optional[str] = None) -> int:
+    """
+    Drop cached content of a date (all kinds, or only the given one)
+
+    Call after admin edits; returns the number of local entries removed.
+    Raises ValueError if date_str is not a YYYY-MM-DD date.
+    """
+    datetime.strptime(date_str, "%Y-%m-%d")
+    if kind is not None:
+        return int(content_cache.delete((date_str, kind)))
+    return content_cache.delete_where(lambda key: key[0] == date_str,
+                                      _glob_literal(date_str), "*")
+
+
+def invalidate_kind(kind: str) -> int:
+    """Drop cached content of one kind for every date"""
+    return content_cache.delete_where(lambda key: key[1] == kind, "*", _glob_literal(kind))
+
+
+def connect_redis(host: str, port: int = 6379, password: Optional[str] = None,
+                  **options) -> Optional[RedisCache]:
+    """
+    Build the shared Redis tier, or return None if redis is unavailable
+
+    Requires the optional ``redis`` package.
+    """
+    try:
+        import redis
+    except ImportError:
+        logger.warning("Pacote redis não instalado; usando apenas o cache em memória")
+        return None
+    client = redis.Redis(host=host, port=port, password=password or None,
+                         socket_timeout=0.5, socket_connect_timeout=0.5)
+    return RedisCache(client, **options)
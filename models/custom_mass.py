@@ -2,23 +2,256 @@
 Model for complete Mass structure with customization capabilities
 """
 
-from dataclasses import dataclass, field
-from typing import Optional, List, Dict
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Optional, List, Dict, Iterator, Tuple, Union, BinaryIO
 from datetime import date
-from .base import Reading, Psalm, Prayer, Antiphon, Celebration, LiturgicalColor
+import bisect
+import hashlib
+import io
+import json
+import math
+import os
+from .base import Reading, Psalm, Prayer, Antiphon, Celebration, LiturgicalColor, iter_text
+from .pdf_styles import (FONT_SIZE_RANGE, MARGIN_RANGE, PAGE_SIZES, TITLE_SIZE_RANGE,
+                         get_pdf_styles)
+
+
+# Form values read as True by normalize_pdf_options
+TRUE_VALUES = ('on', 'true', '1', 'yes', 'sim')
+
+# Bounds of the numeric export_to_pdf options, in points
+PDF_NUMBER_RANGES = {
+    'font_size': FONT_SIZE_RANGE,
+    'title_size': TITLE_SIZE_RANGE,
+    'margins': MARGIN_RANGE,
+}
+
+
+def _pdf_number(value, default: int, bounds: Tuple[int, int]) -> int:
+    """A numeric PDF option from form input (e.g. "14.5"), rounded and clamped"""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return default
+    if not math.isfinite(number):
+        return default
+    return max(bounds[0], min(bounds[1], round(number)))
 
 
-@dataclass
 class MassPart:
     """Represents a part of the Mass"""
-    title: str
-    content: str
-    order: int = 0
+    __slots__ = ('title', 'content', 'order')
+    
+    def __init__(self, title: str, content: str, order: int = 0):
+        self.title = title
+        self.content = content
+        self.order = order
+    
+    def __repr__(self):
+        return f"MassPart(title={self.title!r}, content={self.content!r}, order={self.order!r})"
+    
+    def __eq__(self, other):
+        if not isinstance(other, MassPart):
+            return NotImplemented
+        return (self.title, self.content, self.order) == (other.title, other.content, other.order)
     
     def __str__(self):
         return f"\n{self.title}\n{'=' * len(self.title)}\n{self.content}\n"
 
 
+class _DefaultPart(MassPart):
+    """Read-only part of the shared default template"""
+    __slots__ = ()
+    
+    def __init__(self, title: str, content: str, order: int):
+        object.__setattr__(self, 'title', title)
+        object.__setattr__(self, 'content', content)
+        object.__setattr__(self, 'order', order)
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("Default Mass parts are shared; change them through CustomMass.parts")
+
+
+# Complete Mass structure including all possible parts: (key, title, default content)
+_DEFAULT_STRUCTURE = (
+    # Ritos Iniciais
+    ("entrance_procession", "Procissão de Entrada", ""),
+    ("entrance_antiphon", "Antífona de Entrada", ""),
+    ("entrance_hymn", "Canto de Entrada", ""),
+    ("sign_cross", "Sinal da Cruz", ""),
+    ("greeting", "Saudação", "Em nome do Pai, do Filho e do Espírito Santo."),
+    ("introduction", "Introdução à Celebração", ""),
+    ("blessing_water", "Bênção e Aspersão da Água (opcional)", ""),
+    ("penitential_intro", "Introdução ao Ato Penitencial", ""),
+    ("penitential", "Ato Penitencial", ""),
+    ("kyrie", "Kyrie", "Senhor, tende piedade de nós."),
+    ("gloria", "Glória", ""),
+    ("collect", "Oração do Dia (Coleta)", ""),
+
+    # Liturgia da Palavra
+    ("first_reading", "Primeira Leitura", ""),
+    ("responsorial_gradual", "Canto Responsorial/Gradual", ""),
+    ("psalm", "Salmo Responsorial", ""),
+    ("second_reading", "Segunda Leitura", ""),
+    ("sequence", "Sequência (dias especiais)", ""),
+    ("gospel_acclamation", "Aclamação ao Evangelho (Aleluia)", ""),
+    ("gospel_procession", "Procissão do Evangelho", ""),
+    ("gospel", "Evangelho", ""),
+    ("homily", "Homilia", ""),
+    ("silence_reflection", "Silêncio para Reflexão", ""),
+    ("creed", "Profissão de Fé (Credo)", ""),
+    ("prayers_faithful_intro", "Introdução à Oração dos Fiéis", ""),
+    ("prayers_faithful", "Oração dos Fiéis", ""),
+    ("prayers_faithful_conclusion", "Conclusão da Oração dos Fiéis", ""),
+
+    # Liturgia Eucarística
+    # Preparação das Oferendas
+    ("offertory_procession", "Procissão das Oferendas", ""),
+    ("offertory_hymn", "Canto das Oferendas", ""),
+    ("offertory", "Apresentação das Oferendas", ""),
+    ("preparation_bread", "Preparação do Pão", ""),
+    ("preparation_wine", "Preparação do Vinho", ""),
+    ("mixing_water_wine", "Mistura da Água com o Vinho", ""),
+    ("offering_incense", "Incensação das Oferendas (opcional)", ""),
+    ("washing_hands", "Lavabo (Lavagem das Mãos)", ""),
+    ("invitation_prayer", "Convite à Oração", ""),
+    ("prayer_offerings", "Oração sobre as Oferendas", ""),
+
+    # Oração Eucarística
+    ("preface_dialogue", "Diálogo do Prefácio", ""),
+    ("preface", "Prefácio", ""),
+    ("sanctus", "Santo", ""),
+    ("epiclesis_1", "Primeira Epiclese (invocação do Espírito Santo)", ""),
+    ("institution_narrative", "Narrativa da Instituição", ""),
+    ("consecration_bread", "Consagração do Pão", ""),
+    ("consecration_wine", "Consagração do Vinho", ""),
+    ("elevation", "Elevação", ""),
+    ("mystery_faith", "Mistério da Fé (Aclamação)", ""),
+    ("anamnesis", "Anamnese (Memorial)", ""),
+    ("epiclesis_2", "Segunda Epiclese", ""),
+    ("intercessions", "Intercessões", ""),
+    ("doxology", "Doxologia Final", ""),
+    ("great_amen", "Grande Amém", ""),
+
+    # Rito da Comunhão
+    ("our_father_intro", "Introdução ao Pai Nosso", ""),
+    ("our_father", "Pai Nosso", ""),
+    ("embolism", "Embolismo (Livrai-nos de todos os males)", ""),
+    ("doxology_prayer", "Doxologia do Povo", ""),
+    ("peace_prayer", "Oração pela Paz", ""),
+    ("peace", "Rito da Paz", ""),
+    ("peace_exchange", "Saudação da Paz", ""),
+    ("fraction", "Fração do Pão", ""),
+    ("agnus_dei", "Cordeiro de Deus", ""),
+    ("commingling", "Imissão (mistura do pão e vinho)", ""),
+    ("private_preparation", "Oração Privada do Sacerdote", ""),
+    ("invitation_communion", "Convite à Comunhão", ""),
+    ("communion", "Comunhão", ""),
+    ("communion_antiphon", "Antífona da Comunhão", ""),
+    ("communion_hymn", "Canto de Comunhão", ""),
+    ("communion_meditation", "Momento de Ação de Graças", ""),
+    ("purification", "Purificação dos Vasos Sagrados", ""),
+    ("silence_thanksgiving", "Silêncio para Ação de Graças", ""),
+    ("prayer_communion", "Oração depois da Comunhão", ""),
+
+    # Ritos Finais
+    ("greeting_final", "Saudação Final", ""),
+    ("announcements", "Avisos", ""),
+    ("blessing_introduction", "Introdução à Bênção", ""),
+    ("solemn_blessing", "Bênção Solene (opcional)", ""),
+    ("blessing", "Bênção", ""),
+    ("dismissal", "Despedida", ""),
+    ("recession", "Procissão de Saída", ""),
+    ("final_hymn", "Canto Final", ""),
+)
+
+# Shared by every CustomMass; a Mass only stores the parts that differ
+DEFAULT_PARTS: Mapping[str, MassPart] = MappingProxyType({
+    key: _DefaultPart(title, content, order)
+    for order, (key, title, content) in enumerate(_DEFAULT_STRUCTURE, start=1)
+})
+
+
+class _PartView(MassPart):
+    """
+    A part of a CustomMass as returned by ``mass.parts[key]``
+    
+    Reads come from the Mass's own copy or the shared template; the first
+    write copies the part into the Mass (copy on write).
+    """
+    __slots__ = ('_mass', '_key')
+    
+    def __init__(self, mass: "CustomMass", key: str):
+        object.__setattr__(self, '_mass', mass)
+        object.__setattr__(self, '_key', key)
+    
+    def _current(self) -> MassPart:
+        part = self._mass._overrides.get(self._key)
+        return part if part is not None else DEFAULT_PARTS[self._key]
+    
+    @property
+    def title(self) -> str:
+        return self._current().title
+    
+    @title.setter
+    def title(self, value: str):
+        self._mass._own_part(self._key).title = value
+    
+    @property
+    def content(self) -> str:
+        return self._current().content
+    
+    @content.setter
+    def content(self, value: str):
+        self._mass._own_part(self._key).content = value
+    
+    @property
+    def order(self) -> int:
+        return self._current().order
+    
+    @order.setter
+    def order(self, value: int):
+        # Through move_part, so the Mass's order index follows
+        self._mass.move_part(self._key, value)
+
+
+class MassParts(Mapping):
+    """
+    Dict-like view of the parts of a CustomMass
+    
+    Reads fall back to the shared default template without copying it;
+    assigning an attribute of a looked-up part copies that part into the
+    Mass, so ``mass.parts[key].content = ...`` keeps working.
+    """
+    __slots__ = ('_mass',)
+    
+    def __init__(self, mass: "CustomMass"):
+        self._mass = mass
+    
+    def __getitem__(self, key: str) -> MassPart:
+        if key not in self:
+            raise KeyError(key)
+        return _PartView(self._mass, key)
+    
+    def __setitem__(self, key: str, part: MassPart):
+        if isinstance(part, _PartView):
+            part = MassPart(part.title, part.content, part.order)
+        self._mass._put_part(key, part)
+    
+    def __contains__(self, key) -> bool:
+        return key in self._mass._overrides or key in DEFAULT_PARTS
+    
+    def __iter__(self):
+        yield from DEFAULT_PARTS
+        for key in self._mass._overrides:
+            if key not in DEFAULT_PARTS:
+                yield key
+    
+    def __len__(self) -> int:
+        return len(DEFAULT_PARTS) + sum(1 for key in self._mass._overrides if key not in DEFAULT_PARTS)
+
+
 class CustomMass:
     """
     Represents a fully customizable Catholic Mass with all its parts.
@@ -30,102 +263,57 @@ class CustomMass:
     4. Ritos Finais (Concluding Rites)
     """
     
+    # Default options of export_to_pdf
+    PDF_OPTIONS = {
+        'font_family': 'Times-Roman',
+        'font_size': 12,
+        'page_size': 'A4',
+        'margins': 72,
+        'title_size': 18,
+        'include_header': True,
+        'include_footer': True,
+        'liturgical_color': 'verde',
+    }
+    
+    __slots__ = ('celebration', '_overrides', '_index', '_next_seq')
+    
     def __init__(self):
         self.celebration: Optional[Celebration] = None
-        self.parts: Dict[str, MassPart] = {}
-        self._init_default_structure()
-    
-    def _init_default_structure(self):
-        """Initialize with complete Mass structure including all possible parts"""
-        # Ritos Iniciais
-        self.parts["entrance_procession"] = MassPart("Procissão de Entrada", "", 1)
-        self.parts["entrance_antiphon"] = MassPart("Antífona de Entrada", "", 2)
-        self.parts["entrance_hymn"] = MassPart("Canto de Entrada", "", 3)
-        self.parts["sign_cross"] = MassPart("Sinal da Cruz", "", 4)
-        self.parts["greeting"] = MassPart("Saudação", "Em nome do Pai, do Filho e do Espírito Santo.", 5)
-        self.parts["introduction"] = MassPart("Introdução à Celebração", "", 6)
-        self.parts["blessing_water"] = MassPart("Bênção e Aspersão da Água (opcional)", "", 7)
-        self.parts["penitential_intro"] = MassPart("Introdução ao Ato Penitencial", "", 8)
-        self.parts["penitential"] = MassPart("Ato Penitencial", "", 9)
-        self.parts["kyrie"] = MassPart("Kyrie", "Senhor, tende piedade de nós.", 10)
-        self.parts["gloria"] = MassPart("Glória", "", 11)
-        self.parts["collect"] = MassPart("Oração do Dia (Coleta)", "", 12)
-        
-        # Liturgia da Palavra
-        self.parts["first_reading"] = MassPart("Primeira Leitura", "", 13)
-        self.parts["responsorial_gradual"] = MassPart("Canto Responsorial/Gradual", "", 14)
-        self.parts["psalm"] = MassPart("Salmo Responsorial", "", 15)
-        self.parts["second_reading"] = MassPart("Segunda Leitura", "", 16)
-        self.parts["sequence"] = MassPart("Sequência (dias especiais)", "", 17)
-        self.parts["gospel_acclamation"] = MassPart("Aclamação ao Evangelho (Aleluia)", "", 18)
-        self.parts["gospel_procession"] = MassPart("Procissão do Evangelho", "", 19)
-        self.parts["gospel"] = MassPart("Evangelho", "", 20)
-        self.parts["homily"] = MassPart("Homilia", "", 21)
-        self.parts["silence_reflection"] = MassPart("Silêncio para Reflexão", "", 22)
-        self.parts["creed"] = MassPart("Profissão de Fé (Credo)", "", 23)
-        self.parts["prayers_faithful_intro"] = MassPart("Introdução à Oração dos Fiéis", "", 24)
-        self.parts["prayers_faithful"] = MassPart("Oração dos Fiéis", "", 25)
-        self.parts["prayers_faithful_conclusion"] = MassPart("Conclusão da Oração dos Fiéis", "", 26)
-        
-        # Liturgia Eucarística
-        # Preparação das Oferendas
-        self.parts["offertory_procession"] = MassPart("Procissão das Oferendas", "", 27)
-        self.parts["offertory_hymn"] = MassPart("Canto das Oferendas", "", 28)
-        self.parts["offertory"] = MassPart("Apresentação das Oferendas", "", 29)
-        self.parts["preparation_bread"] = MassPart("Preparação do Pão", "", 30)
-        self.parts["preparation_wine"] = MassPart("Preparação do Vinho", "", 31)
-        self.parts["mixing_water_wine"] = MassPart("Mistura da Água com o Vinho", "", 32)
-        self.parts["offering_incense"] = MassPart("Incensação das Oferendas (opcional)", "", 33)
-        self.parts["washing_hands"] = MassPart("Lavabo (Lavagem das Mãos)", "", 34)
-        self.parts["invitation_prayer"] = MassPart("Convite à Oração", "", 35)
-        self.parts["prayer_offerings"] = MassPart("Oração sobre as Oferendas", "", 36)
-        
-        # Oração Eucarística
-        self.parts["preface_dialogue"] = MassPart("Diálogo do Prefácio", "", 37)
-        self.parts["preface"] = MassPart("Prefácio", "", 38)
-        self.parts["sanctus"] = MassPart("Santo", "", 39)
-        self.parts["epiclesis_1"] = MassPart("Primeira Epiclese (invocação do Espírito Santo)", "", 40)
-        self.parts["institution_narrative"] = MassPart("Narrativa da Instituição", "", 41)
-        self.parts["consecration_bread"] = MassPart("Consagração do Pão", "", 42)
-        self.parts["consecration_wine"] = MassPart("Consagração do Vinho", "", 43)
-        self.parts["elevation"] = MassPart("Elevação", "", 44)
-        self.parts["mystery_faith"] = MassPart("Mistério da Fé (Aclamação)", "", 45)
-        self.parts["anamnesis"] = MassPart("Anamnese (Memorial)", "", 46)
-        self.parts["epiclesis_2"] = MassPart("Segunda Epiclese", "", 47)
-        self.parts["intercessions"] = MassPart("Intercessões", "", 48)
-        self.parts["doxology"] = MassPart("Doxologia Final", "", 49)
-        self.parts["great_amen"] = MassPart("Grande Amém", "", 50)
-        
-        # Rito da Comunhão
-        self.parts["our_father_intro"] = MassPart("Introdução ao Pai Nosso", "", 51)
-        self.parts["our_father"] = MassPart("Pai Nosso", "", 52)
-        self.parts["embolism"] = MassPart("Embolismo (Livrai-nos de todos os males)", "", 53)
-        self.parts["doxology_prayer"] = MassPart("Doxologia do Povo", "", 54)
-        self.parts["peace_prayer"] = MassPart("Oração pela Paz", "", 55)
-        self.parts["peace"] = MassPart("Rito da Paz", "", 56)
-        self.parts["peace_exchange"] = MassPart("Saudação da Paz", "", 57)
-        self.parts["fraction"] = MassPart("Fração do Pão", "", 58)
-        self.parts["agnus_dei"] = MassPart("Cordeiro de Deus", "", 59)
-        self.parts["commingling"] = MassPart("Imissão (mistura do pão e vinho)", "", 60)
-        self.parts["private_preparation"] = MassPart("Oração Privada do Sacerdote", "", 61)
-        self.parts["invitation_communion"] = MassPart("Convite à Comunhão", "", 62)
-        self.parts["communion"] = MassPart("Comunhão", "", 63)
-        self.parts["communion_antiphon"] = MassPart("Antífona da Comunhão", "", 64)
-        self.parts["communion_hymn"] = MassPart("Canto de Comunhão", "", 65)
-        self.parts["communion_meditation"] = MassPart("Momento de Ação de Graças", "", 66)
-        self.parts["purification"] = MassPart("Purificação dos Vasos Sagrados", "", 67)
-        self.parts["silence_thanksgiving"] = MassPart("Silêncio para Ação de Graças", "", 68)
-        self.parts["prayer_communion"] = MassPart("Oração depois da Comunhão", "", 69)
-        
-        # Ritos Finais
-        self.parts["greeting_final"] = MassPart("Saudação Final", "", 70)
-        self.parts["announcements"] = MassPart("Avisos", "", 71)
-        self.parts["blessing_introduction"] = MassPart("Introdução à Bênção", "", 72)
-        self.parts["solemn_blessing"] = MassPart("Bênção Solene (opcional)", "", 73)
-        self.parts["blessing"] = MassPart("Bênção", "", 74)
-        self.parts["dismissal"] = MassPart("Despedida", "", 75)
-        self.parts["recession"] = MassPart("Procissão de Saída", "", 76)
-        self.parts["final_hymn"] = MassPart("Canto Final", "", 77)
+        # Customized and added parts; everything else comes from DEFAULT_PARTS
+        self._overrides: Dict[str, MassPart] = {}
+        # (order, slot, key) of parts outside their template position (added
+        # or moved), kept sorted. slot breaks ties as the position of the part
+        # in the Mass: its template position, or after the template in
+        # insertion order for added parts
+        self._index: List[Tuple[int, int, str]] = []
+        self._next_seq = 0
+    
+    @property
+    def parts(self) -> MassParts:
+        """All parts of the Mass, keyed by part key"""
+        return MassParts(self)
+    
+    def _own_part(self, key: str) -> MassPart:
+        """The Mass's own copy of a part, copied from the template if needed"""
+        part = self._overrides.get(key)
+        if part is None:
+            default = DEFAULT_PARTS[key]
+            part = self._overrides[key] = MassPart(default.title, default.content, default.order)
+        return part
+    
+    def _put_part(self, key: str, part: MassPart):
+        """Store a part, indexing it by order unless it sits at its template position"""
+        self._overrides[key] = part
+        slot = next((entry[1] for entry in self._index if entry[2] == key), None)
+        self._index = [entry for entry in self._index if entry[2] != key]
+        default = DEFAULT_PARTS.get(key)
+        if default is None or part.order != default.order:
+            if default is not None:
+                slot = default.order
+            elif slot is None:
+                slot = len(DEFAULT_PARTS) + self._next_seq
+                self._next_seq += 1
+            bisect.insort(self._index, (part.order, slot, key))
     
     def set_celebration(self, name: str, date_str: Optional[str] = None, 
                        celebration_type: str = "solenidade",
@@ -147,29 +335,29 @@ class CustomMass:
     def set_entrance_antiphon(self, text: str, reference: str = ""):
         """Set the entrance antiphon"""
         antiphon = Antiphon("Entrada", text, reference)
-        self.parts["entrance_antiphon"].content = str(antiphon)
+        self._own_part("entrance_antiphon").content = str(antiphon)
     
     def set_communion_antiphon(self, text: str, reference: str = ""):
         """Set the communion antiphon"""
         antiphon = Antiphon("Comunhão", text, reference)
-        self.parts["communion_antiphon"].content = str(antiphon)
+        self._own_part("communion_antiphon").content = str(antiphon)
     
     def set_readings(self, first_reading: str = "", psalm: str = "", 
                     second_reading: str = "", gospel: str = ""):
         """Set the readings for the Mass"""
         if first_reading:
-            self.parts["first_reading"].content = f"Leitura: {first_reading}"
+            self._own_part("first_reading").content = f"Leitura: {first_reading}"
         if psalm:
-            self.parts["psalm"].content = f"Salmo: {psalm}"
+            self._own_part("psalm").content = f"Salmo: {psalm}"
         if second_reading:
-            self.parts["second_reading"].content = f"Leitura: {second_reading}"
+            self._own_part("second_reading").content = f"Leitura: {second_reading}"
         if gospel:
-            self.parts["gospel"].content = f"Evangelho: {gospel}"
+            self._own_part("gospel").content = f"Evangelho: {gospel}"
     
     def set_part_content(self, part_key: str, content: str):
         """Set content for a specific part of the Mass"""
         if part_key in self.parts:
-            self.parts[part_key].content = content
+            self._own_part(part_key).content = content
     
     def add_custom_prayer(self, title: str, text: str, position: int = 14):
         """Add a custom prayer at a specific position"""
@@ -180,39 +368,182 @@ class CustomMass:
         while key in self.parts:
             key = f"{base_key}_{counter}"
             counter += 1
-        self.parts[key] = MassPart(title, text, position)
+        self._put_part(key, MassPart(title, text, position))
+    
+    def move_part(self, part_key: str, position: int):
+        """Move a part to another position"""
+        part = self._own_part(part_key)
+        part.order = position
+        self._put_part(part_key, part)
+    
+    def to_dict(self) -> Dict:
+        """
+        Compact, JSON-serializable form of the Mass: the celebration plus
+        only what differs from the default template
+        
+        - parts: template parts at their default position whose content
+          (or [title, content], if the title changed) differs
+        - added: [key, title, content, order] of moved parts in template
+          order, then added parts in insertion order
+        """
+        data = {'celebration': None, 'parts': {}, 'added': []}
+        if self.celebration:
+            data['celebration'] = {
+                'name': self.celebration.name,
+                'date': self.celebration.date.isoformat(),
+                'type': self.celebration.type,
+                'color': str(self.celebration.color),
+                'season': self.celebration.season,
+            }
+        indexed = {key for _, _, key in self._index}
+        for key, part in self._overrides.items():
+            if key in indexed:
+                continue
+            default = DEFAULT_PARTS[key]
+            if part.title != default.title:
+                data['parts'][key] = [part.title, part.content]
+            elif part.content != default.content:
+                data['parts'][key] = part.content
+        for order, _, key in sorted(self._index, key=lambda entry: entry[1]):
+            part = self._overrides[key]
+            data['added'].append([key, part.title, part.content, order])
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "CustomMass":
+        """Rebuild a Mass from the output of to_dict"""
+        mass = cls()
+        celebration = data.get('celebration')
+        if celebration:
+            mass.set_celebration(
+                name=celebration['name'],
+                date_str=celebration.get('date'),
+                celebration_type=celebration.get('type', 'solenidade'),
+                color=celebration.get('color', 'branco'),
+                season=celebration.get('season', 'tempo comum')
+            )
+        for key, value in (data.get('parts') or {}).items():
+            if key not in DEFAULT_PARTS:
+                continue
+            part = mass._own_part(key)
+            if isinstance(value, list):
+                part.title, part.content = value
+            else:
+                part.content = value
+        for key, title, content, order in data.get('added') or []:
+            mass._put_part(key, MassPart(title, content, order))
+        return mass
+    
+    def _get_sorted_parts(self) -> Iterator[MassPart]:
+        """
+        Get parts sorted by order
+        
+        Merges the template (already in order) with the sorted index of added
+        and moved parts, so no sort is needed. On equal order, parts keep
+        their position in the Mass: template parts in template order, then
+        added parts in insertion order.
+        """
+        overrides = self._overrides
+        index = self._index
+        moved = {key for _, _, key in index} if index else ()
+        i = 0
+        for key, default in DEFAULT_PARTS.items():
+            while i < len(index) and index[i][:2] < (default.order, default.order):
+                yield overrides[index[i][2]]
+                i += 1
+            if key not in moved:
+                yield overrides.get(key, default)
+        for _, _, key in index[i:]:
+            yield overrides[key]
     
-    def _get_sorted_parts(self):
-        """Get parts sorted by order"""
-        return sorted(self.parts.values(), key=lambda x: x.order)
+    @classmethod
+    def normalize_pdf_options(cls, options: Dict) -> Dict:
+        """
+        Fill in defaults and coerce types of export_to_pdf options
+        
+        Numbers that do not parse fall back to the default and are clamped
+        to PDF_NUMBER_RANGES, so form input never raises.
+        """
+        normalized = dict(cls.PDF_OPTIONS)
+        for key, default in cls.PDF_OPTIONS.items():
+            value = options.get(key)
+            if value is None:
+                continue
+            if isinstance(default, bool):
+                # bool("False") is True: parse form values explicitly
+                normalized[key] = value if isinstance(value, bool) else str(value).strip().lower() in TRUE_VALUES
+            elif key in PDF_NUMBER_RANGES:
+                normalized[key] = _pdf_number(value, default, PDF_NUMBER_RANGES[key])
+            else:
+                normalized[key] = str(value)
+        if normalized['page_size'] not in PAGE_SIZES:
+            normalized['page_size'] = 'A4'
+        return normalized
+    
+    def fingerprint(self) -> str:
+        """
+        Stable hash of everything that is rendered: the celebration and the
+        ordered parts with content
+        """
+        digest = hashlib.sha256()
+        if self.celebration:
+            digest.update(json.dumps([
+                self.celebration.name,
+                self.celebration.date.isoformat(),
+                self.celebration.type,
+                str(self.celebration.color),
+                self.celebration.season,
+            ]).encode('utf-8'))
+        for part in self._get_sorted_parts():
+            if part.content:
+                digest.update(json.dumps([part.title, part.content]).encode('utf-8'))
+        return digest.hexdigest()
     
     def get_full_text(self) -> str:
         """Get the complete formatted text of the Mass"""
-        result = []
-        
+        return "\n".join(self.iter_lines())
+    
+    def iter_lines(self) -> Iterator[str]:
+        """Yield the lines of get_full_text one by one"""
         if self.celebration:
-            result.append(f"\n{'=' * 80}")
-            result.append(f"{self.celebration.name.upper()}")
-            result.append(f"Data: {self.celebration.date.strftime('%d/%m/%Y')}")
-            result.append(f"Cor Litúrgica: {self.celebration.color}")
-            result.append(f"{'=' * 80}\n")
+            yield f"\n{'=' * 80}"
+            yield f"{self.celebration.name.upper()}"
+            yield f"Data: {self.celebration.date.strftime('%d/%m/%Y')}"
+            yield f"Cor Litúrgica: {self.celebration.color}"
+            yield f"{'=' * 80}\n"
         
         # Use helper method to get sorted parts
         for part in self._get_sorted_parts():
             if part.content:  # Only include parts with content
-                result.append(str(part))
-        
-        return "\n".join(result)
+                yield str(part)
     
-    def export_to_text(self, filename: str):
-        """Export the Mass to a text file"""
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(self.get_full_text())
+    def export_to_text(self, target: Union[str, BinaryIO, None] = None) -> Optional[bytes]:
+        """
+        Export the Mass as UTF-8 text
+        
+        Args:
+            target: File name, writable binary stream, or None to return bytes
+        """
+        if target is None:
+            return self.get_full_text().encode('utf-8')
+        # Written chunk by chunk as the text is rendered
+        if isinstance(target, (str, os.PathLike)):
+            with open(target, 'w', encoding='utf-8') as f:
+                for chunk in iter_text(self.iter_lines()):
+                    f.write(chunk)
+        else:
+            for chunk in iter_text(self.iter_lines()):
+                target.write(chunk.encode('utf-8'))
+        return None
     
-    def export_to_pdf(self, filename: str, **options):
+    def export_to_pdf(self, target: Union[str, BinaryIO, None] = None, **options) -> Optional[bytes]:
         """
         Export the Mass to PDF format with customization options
         
+        Args:
+            target: File name, writable binary stream, or None to return
+                the PDF as bytes (rendered in memory)
+        
         Options:
             font_family: str - Font family (Times-Roman, Helvetica, Courier)
             font_size: int - Base font size (default: 12)
@@ -223,118 +554,83 @@ class CustomMass:
             include_footer: bool - Include footer (default: True)
             liturgical_color: str - Liturgical color for accent (default: verde)
         """
+        if target is None:
+            buffer = io.BytesIO()
+            self.export_to_pdf(buffer, **options)
+            return buffer.getvalue()
+        
         try:
-            from reportlab.lib.pagesizes import letter, A4, A5
             from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
-            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
             from reportlab.lib.units import inch
-            from reportlab.lib import colors
-            
-            # Get options with defaults
-            font_family = options.get('font_family', 'Times-Roman')
-            font_size = options.get('font_size', 12)
-            page_size_str = options.get('page_size', 'A4')
-            margins = options.get('margins', 72)
-            title_size = options.get('title_size', 18)
-            include_header = options.get('include_header', True)
-            include_footer = options.get('include_footer', True)
-            
-            # Map page size string to actual page size
-            page_sizes = {
-                'A4': A4,
-                'Letter': letter,
-                'A5': A5
-            }
-            page_size = page_sizes.get(page_size_str, A4)
-            
-            # Create document
-            doc = SimpleDocTemplate(
-                filename, 
-                pagesize=page_size,
-                leftMargin=margins,
-                rightMargin=margins,
-                topMargin=margins,
-                bottomMargin=margins
-            )
-            
-            styles = getSampleStyleSheet()
-            story = []
-            
-            # Custom styles
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontName=font_family,
-                fontSize=title_size,
-                textColor=colors.black,
-                spaceAfter=20,
-                alignment=1,  # Center
-                leading=title_size * 1.2
-            )
-            
-            heading_style = ParagraphStyle(
-                'CustomHeading',
-                parent=styles['Heading2'],
-                fontName=font_family,
-                fontSize=font_size + 2,
-                textColor=colors.HexColor('#5e72e4'),
-                spaceAfter=10,
-                spaceBefore=15,
-                leading=(font_size + 2) * 1.3
-            )
-            
-            body_style = ParagraphStyle(
-                'CustomBody',
-                parent=styles['Normal'],
-                fontName=font_family,
-                fontSize=font_size,
-                textColor=colors.black,
-                spaceAfter=6,
-                leading=font_size * 1.4,
-                alignment=0  # Left
-            )
-            
-            # Add header if requested
-            if include_header and self.celebration:
-                story.append(Paragraph(self.celebration.name.upper(), title_style))
-                info_text = f"Data: {self.celebration.date.strftime('%d/%m/%Y')}"
-                if hasattr(self.celebration, 'color') and self.celebration.color:
-                    color_name = str(self.celebration.color).title()
-                    info_text += f" | Cor Litúrgica: {color_name}"
-                story.append(Paragraph(info_text, body_style))
-                story.append(Spacer(1, 0.3*inch))
-            
-            # Add content
-            for part in self._get_sorted_parts():
-                if part.content:
-                    # Add part title
-                    story.append(Paragraph(f"<b>{part.title}</b>", heading_style))
-                    
-                    # Add part content
-                    content = part.content.replace('\n', '<br/>')
-                    story.append(Paragraph(content, body_style))
-                    story.append(Spacer(1, 0.15*inch))
-            
-            # Add footer if requested
-            if include_footer:
-                story.append(Spacer(1, 0.5*inch))
-                footer_style = ParagraphStyle(
-                    'Footer',
-                    parent=body_style,
-                    fontSize=font_size - 2,
-                    textColor=colors.grey,
-                    alignment=1
-                )
-                story.append(Paragraph("Folheto de Missa - Liturgia Católica", footer_style))
-            
-            # Build PDF
-            doc.build(story)
-            
         except ImportError:
             raise ImportError("reportlab is required for PDF export. Install with: pip install reportlab")
+        
+        # Get options with defaults
+        options = self.normalize_pdf_options(options)
+        margins = options['margins']
+        
+        # Paragraph styles are built once per layout and shared
+        styles = get_pdf_styles(
+            options['font_family'],
+            options['font_size'],
+            options['title_size'],
+            options['page_size']
+        )
+        
+        # Create document
+        doc = SimpleDocTemplate(
+            target, 
+            pagesize=styles.page_size,
+            leftMargin=margins,
+            rightMargin=margins,
+            topMargin=margins,
+            bottomMargin=margins
+        )
+        
+        story = []
+        
+        # Add header if requested
+        if options['include_header'] and self.celebration:
+            story.append(Paragraph(self.celebration.name.upper(), styles.title))
+            info_text = f"Data: {self.celebration.date.strftime('%d/%m/%Y')}"
+            if hasattr(self.celebration, 'color') and self.celebration.color:
+                color_name = str(self.celebration.color).title()
+                info_text += f" | Cor Litúrgica: {color_name}"
+            story.append(Paragraph(info_text, styles.body))
+            story.append(Spacer(1, 0.3*inch))
+        
+        # Add content
+        for part in self._get_sorted_parts():
+            if part.content:
+                # Add part title
+                story.append(Paragraph(f"<b>{part.title}</b>", styles.heading))
+                
+                # Add part content
+                content = part.content.replace('\n', '<br/>')
+                story.append(Paragraph(content, styles.body))
+                story.append(Spacer(1, 0.15*inch))
+        
+        # Add footer if requested
+        if options['include_footer']:
+            story.append(Spacer(1, 0.5*inch))
+            story.append(Paragraph("Folheto de Missa - Liturgia Católica", styles.footer))
+        
+        # Build PDF
+        doc.build(story)
+        return None
     
-    def export_to_docx(self, filename: str):
-        """Export the Mass to DOCX format"""
+    def export_to_docx(self, target: Union[str, BinaryIO, None] = None) -> Optional[bytes]:
+        """
+        Export the Mass to DOCX format
+        
+        Args:
+            target: File name, writable binary stream, or None to return bytes
+        """
+        if target is None:
+            buffer = io.BytesIO()
+            self.export_to_docx(buffer)
+            return buffer.getvalue()
+        
         try:
             from docx import Document
             from docx.shared import Pt, Inches
@@ -356,6 +652,6 @@ class CustomMass:
                     doc.add_heading(part.title, level=2)
                     doc.add_paragraph(part.content)
             
-            doc.save(filename)
+            doc.save(target)
         except ImportError:
             raise ImportError("python-docx is required for DOCX export. Install with: pip install python-docx")
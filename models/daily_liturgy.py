@@ -2,10 +2,13 @@
 Model for Daily Liturgy
 """
 
-from dataclasses import dataclass
-from typing import Optional, Dict
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Iterator, List
 from datetime import date, datetime
 from .base import Reading, Psalm, Prayer, Celebration, LiturgicalColor
+from .bible import psalm_number
+from .liturgical_calendar import LiturgicalCalendar
+from .cache import cached_by_date, content_cache, invalidate_date, invalidate_kind
 
 
 @dataclass
@@ -19,45 +22,54 @@ class DailyLiturgy:
     collect_prayer: Optional[Prayer] = None
     offertory_prayer: Optional[Prayer] = None
     communion_prayer: Optional[Prayer] = None
+    # Last update of the stored row (None when computed), for HTTP validators
+    updated_at: Optional[datetime] = field(default=None, compare=False)
     
     def get_full_text(self) -> str:
         """Get formatted text of the daily liturgy"""
-        result = []
-        result.append(f"\n{'=' * 80}")
-        result.append(f"LITURGIA DIÁRIA - {self.celebration.name.upper()}")
-        result.append(f"Data: {self.celebration.date.strftime('%d/%m/%Y')}")
-        result.append(f"Cor Litúrgica: {self.celebration.color}")
-        result.append(f"Tempo: {self.celebration.season}")
-        result.append(f"{'=' * 80}\n")
+        return "\n".join(self.iter_lines())
+    
+    def iter_lines(self) -> Iterator[str]:
+        """Yield the lines of get_full_text one by one"""
+        yield f"\n{'=' * 80}"
+        yield f"LITURGIA DIÁRIA - {self.celebration.name.upper()}"
+        yield f"Data: {self.celebration.date.strftime('%d/%m/%Y')}"
+        yield f"Cor Litúrgica: {self.celebration.color}"
+        yield f"Tempo: {self.celebration.season}"
+        yield f"{'=' * 80}\n"
         
         if self.collect_prayer:
-            result.append("\nORAÇÃO DO DIA")
-            result.append(str(self.collect_prayer))
+            yield "\nORAÇÃO DO DIA"
+            yield str(self.collect_prayer)
         
         if self.first_reading:
-            result.append("\nPRIMEIRA LEITURA")
-            result.append(str(self.first_reading))
+            yield "\nPRIMEIRA LEITURA"
+            yield str(self.first_reading)
         
         if self.psalm:
-            result.append("\nSALMO RESPONSORIAL")
-            result.append(str(self.psalm))
+            yield "\nSALMO RESPONSORIAL"
+            yield str(self.psalm)
         
         if self.second_reading:
-            result.append("\nSEGUNDA LEITURA")
-            result.append(str(self.second_reading))
+            yield "\nSEGUNDA LEITURA"
+            yield str(self.second_reading)
         
         if self.gospel:
-            result.append("\nEVANGELHO")
-            result.append(str(self.gospel))
-        
-        return "\n".join(result)
+            yield "\nEVANGELHO"
+            yield str(self.gospel)
 
 
 class LiturgiaDaily:
     """
     Class to manage and retrieve daily liturgy
+    
+    Lookup order: the configured repository (database), then the sample
+    data in ``_calendar``, then the computed liturgical calendar.
     """
     
+    # Optional repository (e.g. models.repository.LiturgyRepository)
+    _repository = None
+    
     # Sample liturgical calendar data
     _calendar: Dict[str, Dict] = {
         "2026-01-06": {
@@ -73,6 +85,7 @@ class LiturgiaDaily:
     }
     
     @classmethod
+    @cached_by_date("daily")
     def get_for_date(cls, date_str: str) -> DailyLiturgy:
         """
         Get the daily liturgy for a specific date
@@ -85,52 +98,97 @@ class LiturgiaDaily:
         """
         liturgy_date = datetime.strptime(date_str, "%Y-%m-%d").date()
         
+        if cls._repository is not None:
+            stored = cls._repository.get_for_date(liturgy_date)
+            if stored is not None:
+                return stored
+        
         # Check if we have specific data for this date
         if date_str in cls._calendar:
-            data = cls._calendar[date_str]
-            celebration = Celebration(
-                name=data["name"],
-                date=liturgy_date,
-                type=data["type"],
-                color=LiturgicalColor(data["color"]),
-                season=data["season"]
-            )
-            
-            first_reading = Reading(reference=data.get("first_reading", ""))
-            # Parse psalm number from reference if available
-            psalm_ref = data.get("psalm", "")
-            psalm_num = 71  # default
-            if psalm_ref:
-                # Try to extract number from reference like "Sl 71(72)"
-                import re
-                match = re.search(r'Sl\s*(\d+)', psalm_ref)
-                if match:
-                    psalm_num = int(match.group(1))
-            
-            psalm = Psalm(number=psalm_num, reference=psalm_ref)
-            second_reading = Reading(reference=data.get("second_reading", "")) if "second_reading" in data else None
-            gospel = Reading(reference=data.get("gospel", ""))
-            
-            return DailyLiturgy(
-                celebration=celebration,
-                first_reading=first_reading,
-                psalm=psalm,
-                second_reading=second_reading,
-                gospel=gospel
-            )
-        else:
-            # Return a generic weekday liturgy
-            celebration = Celebration(
-                name=f"Feria - {liturgy_date.strftime('%d/%m/%Y')}",
-                date=liturgy_date,
-                type="feria",
-                color=LiturgicalColor("verde"),
-                season="Tempo Comum"
-            )
+            return cls._from_sample_data(liturgy_date, cls._calendar[date_str])
+        
+        # Resolve the celebration from the computed liturgical calendar
+        celebration = LiturgicalCalendar.get_day(liturgy_date).to_celebration()
+        return DailyLiturgy(celebration=celebration)
+    
+    @classmethod
+    def get_for_range(cls, start_str: str, end_str: str) -> List[DailyLiturgy]:
+        """
+        Get the daily liturgy for every date from start to end (inclusive)
+        
+        Cached days are fetched in one multi-get (a single Redis round trip
+        when the shared tier is enabled); the rest come from a single
+        repository query for the uncached span and the precomputed calendar.
+        
+        Args:
+            start_str: First date in format YYYY-MM-DD
+            end_str: Last date in format YYYY-MM-DD
+        """
+        start = datetime.strptime(start_str, "%Y-%m-%d").date()
+        end = datetime.strptime(end_str, "%Y-%m-%d").date()
+        if end < start:
+            raise ValueError("A data final deve ser igual ou posterior à data inicial")
+        
+        days = LiturgicalCalendar.get_range(start, end)
+        keys = [(day.date.isoformat(), "daily") for day in days]
+        cached = content_cache.get_many(keys)
+        
+        missing = [day for day, key in zip(days, keys) if key not in cached]
+        if missing:
+            stored = {}
+            if cls._repository is not None:
+                stored = cls._repository.get_range(missing[0].date, missing[-1].date)
             
-            return DailyLiturgy(celebration=celebration)
+            computed = {}
+            for day in missing:
+                date_key = day.date.isoformat()
+                liturgy = stored.get(day.date)
+                if liturgy is None:
+                    data = cls._calendar.get(date_key)
+                    if data is not None:
+                        liturgy = cls._from_sample_data(day.date, data)
+                    else:
+                        liturgy = DailyLiturgy(celebration=day.to_celebration())
+                computed[(date_key, "daily")] = liturgy
+            content_cache.set_many(computed)
+            cached.update(computed)
+        
+        return [cached[key] for key in keys]
+    
+    @staticmethod
+    def _from_sample_data(liturgy_date: date, data: Dict) -> DailyLiturgy:
+        """Build a DailyLiturgy from an entry of the sample calendar data"""
+        celebration = Celebration(
+            name=data["name"],
+            date=liturgy_date,
+            type=data["type"],
+            color=LiturgicalColor(data["color"]),
+            season=data["season"]
+        )
+        
+        first_reading = Reading(reference=data.get("first_reading", ""))
+        # Psalm number from a reference like "Sl 71(72)" (memoized parser)
+        psalm_ref = data.get("psalm", "")
+        psalm = Psalm(number=psalm_number(psalm_ref) or 71, reference=psalm_ref)
+        second_reading = Reading(reference=data.get("second_reading", "")) if "second_reading" in data else None
+        gospel = Reading(reference=data.get("gospel", ""))
+        
+        return DailyLiturgy(
+            celebration=celebration,
+            first_reading=first_reading,
+            psalm=psalm,
+            second_reading=second_reading,
+            gospel=gospel
+        )
+    
+    @classmethod
+    def set_repository(cls, repository):
+        """Set the repository used to load stored liturgies (None disables it)"""
+        cls._repository = repository
+        invalidate_kind("daily")
     
     @classmethod
     def add_liturgy_data(cls, date_str: str, data: Dict):
         """Add or update liturgy data for a specific date"""
         cls._calendar[date_str] = data
+        invalidate_date(date_str, "daily")
@@ -35,6 +35,10 @@ class Celebration(db.Model):
     color = db.relationship('LiturgicalColor', backref='celebrations')
     liturgies = db.relationship('DailyLiturgy', back_populates='celebration', cascade='all, delete-orphan')
     
+    __table_args__ = (
+        db.Index('uq_celebrations_name_date', 'name', 'date', unique=True),
+    )
+    
     def __repr__(self):
         return f'<Celebration {self.name} - {self.date}>'
 
@@ -49,8 +53,15 @@ class Reading(db.Model):
     book = db.Column(db.String(50))
     chapter = db.Column(db.Integer)
     verses = db.Column(db.String(50))
+    book_code = db.Column(db.String(10))  # Canonical book code (models.bible), e.g. Mt, 1Cor
+    end_chapter = db.Column(db.Integer)  # Last chapter the reading reaches
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    __table_args__ = (
+        db.Index('uq_readings_reference', 'reference', unique=True),
+        db.Index('ix_readings_book_chapter', 'book_code', 'chapter', 'end_chapter'),
+    )
+    
     def __repr__(self):
         return f'<Reading {self.reference}>'
 
@@ -66,6 +77,10 @@ class Psalm(db.Model):
     verses = db.Column(db.Text)  # JSON or text with newlines
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    __table_args__ = (
+        db.Index('uq_psalms_number_reference', 'number', 'reference', unique=True),
+    )
+    
     def __repr__(self):
         return f'<Psalm {self.number}>'
 
@@ -81,6 +96,10 @@ class Prayer(db.Model):
     category = db.Column(db.String(50))  # collect, offertory, communion, etc.
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    __table_args__ = (
+        db.Index('uq_prayers_title', 'title', unique=True),
+    )
+    
     def __repr__(self):
         return f'<Prayer {self.title}>'
 
@@ -90,7 +109,7 @@ class DailyLiturgy(db.Model):
     __tablename__ = 'daily_liturgies'
     
     id = db.Column(db.Integer, primary_key=True)
-    celebration_id = db.Column(db.Integer, db.ForeignKey('celebrations.id'), nullable=False)
+    celebration_id = db.Column(db.Integer, db.ForeignKey('celebrations.id'), nullable=False, index=True)
     first_reading_id = db.Column(db.Integer, db.ForeignKey('readings.id'))
     psalm_id = db.Column(db.Integer, db.ForeignKey('psalms.id'))
     second_reading_id = db.Column(db.Integer, db.ForeignKey('readings.id'))
@@ -171,3 +190,15 @@ class CustomMass(db.Model):
     
     def __repr__(self):
         return f'<CustomMass {self.name}>'
+
+
+class SeedVersion(db.Model):
+    """Version of each bundled seed file applied to the database"""
+    __tablename__ = 'seed_versions'
+    
+    name = db.Column(db.String(100), primary_key=True)
+    version = db.Column(db.String(64), nullable=False)  # Hash of the seed file
+    applied_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<SeedVersion {self.name} {self.version}>'
@@ -0,0 +1,229 @@
+"""
+Background export jobs (PDF/DOCX) for Mass leaflets and leaflet batches
+
+Rendering a long leaflet can take seconds; instead of holding a web
+request thread, the request submits a job and the client polls (or
+long-polls) its status and downloads the file when it is done.
+
+Two queues share the same interface:
+- LocalJobQueue runs jobs on an in-process thread pool
+- RedisJobQueue pushes jobs to a Redis list consumed by worker processes
+  (see export_worker.py)
+"""
+
+import logging
+import pickle
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, Union
+
+from .batch import BatchRequest
+from .custom_mass import CustomMass
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = {
+    'pdf': 'application/pdf',
+    'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    'zip': 'application/zip',
+}
+
+# What a job renders: one Mass or a batch of leaflets
+ExportPayload = Union[CustomMass, BatchRequest]
+
+
+def render_export(mass: ExportPayload, export_format: str, options: Dict,
+                  batch_workers: Optional[int] = 1) -> bytes:
+    """
+    Render a Mass in memory to the requested format
+
+    A BatchRequest is rendered to its own output format (zip or merged
+    pdf), inline unless batch_workers > 1.
+    """
+    if isinstance(mass, BatchRequest):
+        return mass.render(options, workers=batch_workers)
+    if export_format == 'pdf':
+        return mass.export_to_pdf(**options)
+    if export_format == 'docx':
+        return mass.export_to_docx()
+    raise ValueError(f"Formato de exportação inválido: {export_format}")
+
+
+@dataclass
+class ExportJob:
+    """State of an export job"""
+    id: str
+    format: str
+    filename: str
+    status: str = 'pending'  # pending, running, done, failed
+    error: str = ""
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ('done', 'failed')
+
+    @property
+    def mimetype(self) -> str:
+        return EXPORT_FORMATS[self.format]
+
+    def to_dict(self) -> Dict:
+        return {
+            'id': self.id,
+            'format': self.format,
+            'filename': self.filename,
+            'status': self.status,
+            'error': self.error or None,
+            'created_at': self.created_at,
+            'finished_at': self.finished_at,
+        }
+
+
+class LocalJobQueue:
+    """
+    Job queue running on an in-process thread pool
+
+    Finished jobs and their results are kept for ``result_ttl`` seconds.
+    """
+
+    def __init__(self, max_workers: int = 2, result_ttl: float = 600,
+                 render: Callable[[ExportPayload, str, Dict], bytes] = render_export):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='export')
+        self._jobs: Dict[str, ExportJob] = {}
+        self._results: Dict[str, bytes] = {}
+        self._events: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        self.result_ttl = result_ttl
+        self.render = render
+
+    def submit(self, mass: ExportPayload, export_format: str, options: Optional[Dict] = None,
+               filename: str = "missa") -> ExportJob:
+        """Queue an export and return the job (status 'pending')"""
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Formato de exportação inválido: {export_format}")
+        self._purge()
+        job = ExportJob(id=uuid.uuid4().hex, format=export_format,
+                        filename=f"{filename}.{export_format}")
+        with self._lock:
+            self._jobs[job.id] = job
+            self._events[job.id] = threading.Event()
+        self._executor.submit(self._run, job, mass, options or {})
+        return job
+
+    def _run(self, job: ExportJob, mass: ExportPayload, options: Dict):
+        job.status = 'running'
+        try:
+            data = self.render(mass, job.format, options)
+            with self._lock:
+                self._results[job.id] = data
+            job.status = 'done'
+        except Exception as e:
+            logger.exception("Falha no job de exportação %s", job.id)
+            job.error = str(e)
+            job.status = 'failed'
+        job.finished_at = time.time()
+        self._events[job.id].set()
+
+    def get(self, job_id: str, wait: float = 0) -> Optional[ExportJob]:
+        """Get a job, optionally blocking up to ``wait`` seconds until it finishes"""
+        job = self._jobs.get(job_id)
+        if job is not None and wait > 0 and not job.finished:
+            self._events[job_id].wait(wait)
+        return job
+
+    def result(self, job_id: str) -> Optional[bytes]:
+        """Bytes of a finished job, or None"""
+        return self._results.get(job_id)
+
+    def _purge(self):
+        cutoff = time.time() - self.result_ttl
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items()
+                       if job.finished and job.finished_at < cutoff]
+            for job_id in expired:
+                self._jobs.pop(job_id, None)
+                self._results.pop(job_id, None)
+                self._events.pop(job_id, None)
+
+
+class RedisJobQueue:
+    """
+    Job queue backed by Redis
+
+    ``submit`` stores the job and pushes its payload onto a list; worker
+    processes run ``work()`` to consume it. Job state and results expire
+    after ``result_ttl`` seconds.
+    """
+
+    def __init__(self, client, prefix: str = "liturgia:jobs", result_ttl: int = 600,
+                 render: Callable[[ExportPayload, str, Dict], bytes] = render_export,
+                 poll_interval: float = 0.25):
+        self.client = client
+        self.prefix = prefix
+        self.result_ttl = result_ttl
+        self.render = render
+        self.poll_interval = poll_interval
+
+    def _key(self, *parts: str) -> str:
+        return ":".join([self.prefix, *parts])
+
+    def _save(self, job: ExportJob):
+        self.client.set(self._key('job', job.id), pickle.dumps(job), ex=self.result_ttl)
+
+    def submit(self, mass: ExportPayload, export_format: str, options: Optional[Dict] = None,
+               filename: str = "missa") -> ExportJob:
+        """Queue an export and return the job (status 'pending')"""
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Formato de exportação inválido: {export_format}")
+        job = ExportJob(id=uuid.uuid4().hex, format=export_format,
+                        filename=f"{filename}.{export_format}")
+        self._save(job)
+        self.client.lpush(self._key('queue'), pickle.dumps((job.id, mass, options or {})))
+        return job
+
+    def get(self, job_id: str, wait: float = 0) -> Optional[ExportJob]:
+        """Get a job, optionally polling up to ``wait`` seconds until it finishes"""
+        deadline = time.monotonic() + wait
+        while True:
+            raw = self.client.get(self._key('job', job_id))
+            job = pickle.loads(raw) if raw is not None else None
+            if job is None or job.finished or time.monotonic() >= deadline:
+                return job
+            time.sleep(self.poll_interval)
+
+    def result(self, job_id: str) -> Optional[bytes]:
+        """Bytes of a finished job, or None"""
+        return self.client.get(self._key('result', job_id))
+
+    def work_once(self, timeout: int = 5) -> bool:
+        """Run the next queued job; returns False if none arrived within timeout"""
+        item = self.client.brpop(self._key('queue'), timeout=timeout)
+        if item is None:
+            return False
+        job_id, mass, options = pickle.loads(item[1])
+        job = self.get(job_id)
+        if job is None:
+            # Expired before a worker picked it up
+            return True
+        job.status = 'running'
+        self._save(job)
+        try:
+            data = self.render(mass, job.format, options)
+            self.client.set(self._key('result', job.id), data, ex=self.result_ttl)
+            job.status = 'done'
+        except Exception as e:
+            logger.exception("Falha no job de exportação %s", job.id)
+            job.error = str(e)
+            job.status = 'failed'
+        job.finished_at = time.time()
+        self._save(job)
+        return True
+
+    def work(self, stop: Optional[threading.Event] = None):
+        """Consume jobs until stop is set"""
+        while stop is None or not stop.is_set():
+            self.work_once()
@@ -0,0 +1,438 @@
+"""
+Streaming import of a lectionary dataset
+
+A dataset is a CSV or JSON-lines file with one Mass per record. Records
+are read one at a time and written in batched transactions, so memory
+stays constant however large the file is. Readings, psalms and prayers
+are resolved to ids through in-memory reference maps (one SELECT per
+batch for the keys not seen yet) instead of a lookup per row.
+
+A JSON-lines record looks like::
+
+    {"celebration": "Epifania do Senhor", "date": "2026-01-06",
+     "first_reading": {"reference": "Is 60,1-6", "text": "..."},
+     "psalm": {"reference": "Sl 71", "response": "...", "verses": ["..."]},
+     "second_reading": "Ef 3,2-3a.5-6",
+     "gospel": {"reference": "Mt 2,1-12", "text": "..."},
+     "collect_prayer": {"title": "...", "text": "..."}}
+
+Records are matched to the stored liturgy by date: the liturgy served
+for that date is updated (its celebration renamed if the record names
+it differently) and a new one is only inserted for dates without any.
+
+Records without a date are matched by name against the computed
+calendar of the requested years; their optional ``cycle`` (A, B, C for
+Sundays and solemnities, I, II for weekdays) restricts the match to the
+years of that cycle. Missing type, season and color come from the
+calendar as well.
+
+In CSV files each part is a column holding its reference (or prayer
+title) plus ``<part>_<field>`` columns, e.g. ``gospel``, ``gospel_text``,
+``psalm_response``, ``collect_prayer_text``.
+
+Every write is an upsert, so a batch can be replayed safely; after each
+committed batch the number of records done is saved to a checkpoint file
+and an interrupted import resumes from there.
+"""
+
+import csv
+import json
+import logging
+import os
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import SQLAlchemyError
+
+from .bible import psalm_number
+from .cache import invalidate_date
+from .liturgical_calendar import LiturgicalCalendar
+from .db_models import (
+    db, LiturgicalColor as ColorRow, Celebration as CelebrationRow,
+    Reading as ReadingRow, Psalm as PsalmRow, Prayer as PrayerRow,
+    DailyLiturgy as DailyLiturgyRow
+)
+from .repository import ensure_schema, reading_index_values, upsert_statement
+
+logger = logging.getLogger(__name__)
+
+READING_PARTS = ('first_reading', 'second_reading', 'gospel')
+PRAYER_PARTS = ('collect_prayer', 'offertory_prayer', 'communion_prayer')
+
+# Title of a prayer given without one, completed with the celebration name
+PRAYER_TITLES = {
+    'collect_prayer': 'Oração do Dia',
+    'offertory_prayer': 'Oração sobre as Oferendas',
+    'communion_prayer': 'Oração depois da Comunhão',
+}
+
+# Main field of each part (the CSV column without suffix)
+_PART_KEYS = {
+    **{part: 'reference' for part in READING_PARTS},
+    'psalm': 'reference',
+    **{part: 'title' for part in PRAYER_PARTS},
+}
+
+
+@dataclass
+class ImportStats:
+    """Progress of an import"""
+    records: int = 0
+    inserted: int = 0
+    updated: int = 0
+    skipped: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rate(self) -> float:
+        return self.records / self.seconds if self.seconds else 0.0
+
+
+def _nest_csv_row(row: Dict[str, str]) -> Dict:
+    """Group the <part>_<field> columns of a CSV row into part dicts"""
+    record: Dict = {}
+    parts: Dict[str, Dict] = defaultdict(dict)
+    for column, value in row.items():
+        if column is None or value in (None, ''):
+            continue
+        for part, key in _PART_KEYS.items():
+            if column == part:
+                parts[part][key] = value
+                break
+            if column.startswith(part + '_'):
+                parts[part][column[len(part) + 1:]] = value
+                break
+        else:
+            record[column] = value
+    record.update(parts)
+    return record
+
+
+def iter_records(path: str, fmt: Optional[str] = None) -> Iterator[Dict]:
+    """
+    Stream the records of a dataset file
+
+    fmt is 'csv' or 'jsonl'; by default it follows the file extension.
+    """
+    fmt = fmt or ('csv' if path.lower().endswith('.csv') else 'jsonl')
+    with open(path, newline='' if fmt == 'csv' else None, encoding='utf-8') as f:
+        if fmt == 'csv':
+            for row in csv.DictReader(f):
+                yield _nest_csv_row(row)
+        else:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+
+def _verses_text(verses) -> Optional[str]:
+    if isinstance(verses, (list, tuple)):
+        return '\n'.join(verses)
+    return verses
+
+
+class _CalendarIndex:
+    """Calendar days of some years by name, for records without a date"""
+
+    def __init__(self, years: Sequence[int]):
+        self._days = defaultdict(list)
+        for year in years:
+            for day in LiturgicalCalendar.for_year(year):
+                self._days[day.name].append(day)
+
+    def match(self, name: str, cycle: Optional[str]) -> List:
+        return [day for day in self._days.get(name, ())
+                if not cycle or cycle in (day.sunday_cycle, day.weekday_cycle)]
+
+
+class _ReferenceMap:
+    """
+    Natural key -> id of a content table, kept across batches
+
+    Rows with any content column set are upserted (every column is
+    updated); bare references are only inserted when unknown, so they
+    never blank out existing text. With insert_bare False they are left
+    unresolved instead.
+    """
+
+    def __init__(self, model, keys: Sequence[str], content: Sequence[str], insert_bare: bool = True):
+        self.model = model
+        self.keys = list(keys)
+        self.content = list(content)
+        self.insert_bare = insert_bare
+        self.ids: Dict[Tuple, int] = {}
+        key_columns = [getattr(model, key) for key in self.keys]
+        for row in db.session.execute(select(model.id, *key_columns)):
+            self.ids[tuple(row[1:])] = row[0]
+
+    def key(self, values: Dict) -> Tuple:
+        return tuple(values[key] for key in self.keys)
+
+    def sync(self, rows: Dict[Tuple, Dict]):
+        """Write a batch of rows (key -> values) and map their ids"""
+        filled = [values for values in rows.values() if any(values.get(c) for c in self.content)]
+        bare = [values for key, values in rows.items()
+                if key not in self.ids and not any(values.get(c) for c in self.content)]
+        if filled:
+            update_columns = [column for column in filled[0] if column not in self.keys]
+            db.session.execute(upsert_statement(self.model, self.keys, update_columns), filled)
+        if bare and self.insert_bare:
+            db.session.execute(upsert_statement(self.model, self.keys, ()), bare)
+
+        missing = [key for key in rows if key not in self.ids]
+        if missing:
+            first = getattr(self.model, self.keys[0])
+            key_columns = [getattr(self.model, key) for key in self.keys]
+            wanted = set(missing)
+            query = select(self.model.id, *key_columns).where(first.in_(list({key[0] for key in missing})))
+            for row in db.session.execute(query):
+                if tuple(row[1:]) in wanted:
+                    self.ids[tuple(row[1:])] = row[0]
+
+
+class LectionaryImporter:
+    """
+    Loads a stream of lectionary records into the database
+
+    Call inside an application context. years is needed only for records
+    without a date.
+    """
+
+    def __init__(self, years: Sequence[int] = (), batch_size: int = 500,
+                 checkpoint: Optional[str] = None):
+        self.batch_size = batch_size
+        self.checkpoint = checkpoint
+        self._calendar = _CalendarIndex(years)
+        self._colors: Dict[str, int] = {}
+        self._readings: Optional[_ReferenceMap] = None
+        self._psalms: Optional[_ReferenceMap] = None
+        self._prayers: Optional[_ReferenceMap] = None
+
+    def _load_maps(self):
+        ensure_schema(CelebrationRow, ReadingRow, PsalmRow, PrayerRow)
+        self._colors = dict((name, id_) for id_, name in db.session.execute(select(ColorRow.id, ColorRow.name)))
+        self._readings = _ReferenceMap(ReadingRow, ['reference'], ['text'])
+        self._psalms = _ReferenceMap(PsalmRow, ['number', 'reference'], ['response', 'verses'])
+        # prayers.text is required: a title alone can only refer to an existing prayer
+        self._prayers = _ReferenceMap(PrayerRow, ['title'], ['text', 'response', 'category'],
+                                      insert_bare=False)
+
+    def read_checkpoint(self) -> int:
+        """Records already imported according to the checkpoint file"""
+        if not self.checkpoint or not os.path.exists(self.checkpoint):
+            return 0
+        with open(self.checkpoint, encoding='utf-8') as f:
+            return int(json.load(f).get('records', 0))
+
+    def _write_checkpoint(self, records: int):
+        if not self.checkpoint:
+            return
+        tmp = f"{self.checkpoint}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'records': records, 'updated_at': datetime.utcnow().isoformat()}, f)
+        os.replace(tmp, self.checkpoint)
+
+    def run(self, records: Iterable[Dict], resume: bool = True, progress=None) -> ImportStats:
+        """
+        Import records in batches of batch_size
+
+        With resume, records counted in the checkpoint file are skipped.
+        progress, if given, is called with the ImportStats after each batch.
+        """
+        stats = ImportStats()
+        started = time.perf_counter()
+        done = self.read_checkpoint() if resume else 0
+        records = iter(records)
+        if done:
+            for _ in islice(records, done):
+                pass
+            stats.records = done
+
+        self._load_maps()
+        while True:
+            batch = list(islice(records, self.batch_size))
+            if not batch:
+                break
+            try:
+                self._import_batch(batch, stats)
+                db.session.commit()
+            except SQLAlchemyError:
+                db.session.rollback()
+                raise
+            stats.records += len(batch)
+            self._write_checkpoint(stats.records)
+            stats.seconds = time.perf_counter() - started
+            if progress:
+                progress(stats)
+
+        stats.seconds = time.perf_counter() - started
+        return stats
+
+    def _days(self, record: Dict) -> List[Dict]:
+        """Celebration values of every date a record applies to"""
+        name = record.get('celebration') or record.get('name')
+        if record.get('date'):
+            day = date.fromisoformat(record['date'])
+            calendar_days = [LiturgicalCalendar.get_day(day)]
+        else:
+            calendar_days = self._calendar.match(name, record.get('cycle'))
+        return [
+            {
+                'name': name or day.name,
+                'date': day.date,
+                'type': record.get('type') or day.type,
+                'season': record.get('season') or day.season,
+                'color_id': self._colors.get(record.get('color') or day.color),
+            }
+            for day in calendar_days
+        ]
+
+    def _import_batch(self, batch: List[Dict], stats: ImportStats):
+        readings: Dict[Tuple, Dict] = {}
+        psalms: Dict[Tuple, Dict] = {}
+        prayers: Dict[Tuple, Dict] = {}
+        celebrations: Dict[date, Dict] = {}
+        liturgies: Dict[date, Dict] = {}  # date -> part keys
+
+        # Later records win within a batch; a statement must not touch a row twice
+        for record in batch:
+            days = self._days(record)
+            if not days:
+                logger.info("Registro sem data no calendário: %s", record.get('celebration'))
+                stats.skipped += 1
+                continue
+            parts: Dict[str, Tuple] = {}
+            for part in READING_PARTS:
+                values = self._reading_values(record.get(part))
+                if values:
+                    key = self._readings.key(values)
+                    readings[key] = values
+                    parts[f'{part}_id'] = (self._readings, key)
+            values = self._psalm_values(record.get('psalm'))
+            if values:
+                key = self._psalms.key(values)
+                psalms[key] = values
+                parts['psalm_id'] = (self._psalms, key)
+            for part in PRAYER_PARTS:
+                values = self._prayer_values(part, record.get(part), days[0]['name'])
+                if values:
+                    key = self._prayers.key(values)
+                    prayers[key] = values
+                    parts[f'{part}_id'] = (self._prayers, key)
+            for day in days:
+                # One liturgy per date: the one LiturgyRepository serves
+                celebrations[day['date']] = day
+                liturgies[day['date']] = parts
+
+        self._readings.sync(readings)
+        self._psalms.sync(psalms)
+        self._prayers.sync(prayers)
+
+        if not celebrations:
+            return
+        dates = list(celebrations)
+        served = {}
+        for row in db.session.execute(
+            select(DailyLiturgyRow.id, DailyLiturgyRow.celebration_id, CelebrationRow.name, CelebrationRow.date)
+            .join(DailyLiturgyRow.celebration)
+            .where(CelebrationRow.date.in_(dates))
+            .order_by(DailyLiturgyRow.id.desc())
+        ):
+            # First liturgy of a date wins, as in LiturgyRepository
+            served[row.date] = row
+        names = set(db.session.execute(
+            select(CelebrationRow.name, CelebrationRow.date).where(CelebrationRow.date.in_(dates))
+        ).tuples())
+
+        # A served celebration under another name is renamed, so the upsert
+        # below updates it instead of adding a celebration that is never read
+        renames = []
+        for day, values in celebrations.items():
+            current = served.get(day)
+            if current is not None and current.name != values['name'] and (values['name'], day) not in names:
+                logger.info("%s: celebração %r renomeada para %r", day, current.name, values['name'])
+                renames.append({'id': current.celebration_id, 'name': values['name']})
+        if renames:
+            db.session.execute(update(CelebrationRow), renames)
+        db.session.execute(
+            upsert_statement(CelebrationRow, ['name', 'date'], ['type', 'season', 'color_id']),
+            list(celebrations.values())
+        )
+        celebration_ids = {
+            (row.name, row.date): row.id
+            for row in db.session.execute(
+                select(CelebrationRow.id, CelebrationRow.name, CelebrationRow.date)
+                .where(CelebrationRow.date.in_(dates))
+            )
+        }
+
+        inserts, updates = [], []
+        for day, parts in liturgies.items():
+            celebration_id = celebration_ids[(celebrations[day]['name'], day)]
+            values = {column: ref_map.ids.get(ref_key) for column, (ref_map, ref_key) in parts.items()}
+            values['celebration_id'] = celebration_id
+            if day in served:
+                updates.append({**values, 'id': served[day].id, 'updated_at': datetime.utcnow()})
+            else:
+                inserts.append(values)
+        if inserts:
+            db.session.execute(insert(DailyLiturgyRow), inserts)
+        if updates:
+            db.session.execute(update(DailyLiturgyRow), updates)
+        stats.inserted += len(inserts)
+        stats.updated += len(updates)
+
+        for day in dates:
+            invalidate_date(day.isoformat(), "daily")
+
+    @staticmethod
+    def _reading_values(part) -> Optional[Dict]:
+        if not part:
+            return None
+        if isinstance(part, str):
+            part = {'reference': part}
+        reference = part['reference'].strip()
+        values = {'book_code': None, 'book': None, 'chapter': None, 'end_chapter': None, 'verses': None}
+        values.update(reading_index_values(reference))
+        for column in ('book', 'chapter', 'verses'):
+            if part.get(column) not in (None, ''):
+                values[column] = part[column]
+        if values['chapter'] is not None:
+            values['chapter'] = int(values['chapter'])
+        return {'reference': reference, 'text': part.get('text'), **values}
+
+    @staticmethod
+    def _psalm_values(part) -> Optional[Dict]:
+        if not part:
+            return None
+        if isinstance(part, str):
+            part = {'reference': part}
+        reference = part['reference'].strip()
+        number = part.get('number')
+        return {
+            'number': int(number) if number not in (None, '') else psalm_number(reference) or 0,
+            'reference': reference,
+            'response': part.get('response'),
+            'verses': _verses_text(part.get('verses')),
+        }
+
+    @staticmethod
+    def _prayer_values(kind: str, part, celebration: str) -> Optional[Dict]:
+        if not part:
+            return None
+        if isinstance(part, str):
+            part = {'text': part}
+        if not part.get('text') and not part.get('title'):
+            return None
+        return {
+            'title': part.get('title') or f"{PRAYER_TITLES[kind]} - {celebration}",
+            'text': part.get('text'),
+            'response': part.get('response') or ('Amém' if part.get('text') else None),
+            'category': part.get('category') or kind[:-len('_prayer')],
+        }
@@ -0,0 +1,371 @@
+"""
+Computed liturgical calendar (General Roman Calendar)
+
+Each civil year is computed in a single pass: Easter is found with the
+Gregorian computus, the moveable feasts and seasons are derived from it,
+and the fixed celebrations are laid over the temporal cycle following the
+table of liturgical precedence. The result is stored as compact
+date-indexed arrays so that any lookup afterwards is O(1).
+"""
+
+from array import array
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, List, Tuple
+from .base import Celebration, LiturgicalColor
+
+
+# Interned value tables (the per-day arrays store indexes into these)
+TYPES = ("feria", "domingo", "memória", "festa", "solenidade")
+COLORS = ("verde", "branco", "vermelho", "roxo", "rosa")
+SEASONS = ("Tempo Comum", "Advento", "Tempo do Natal", "Quaresma",
+           "Tríduo Pascal", "Tempo Pascal")
+SUNDAY_CYCLES = ("A", "B", "C")
+WEEKDAY_CYCLES = ("I", "II")
+
+WEEKDAY_NAMES = ("Segunda-feira", "Terça-feira", "Quarta-feira",
+                 "Quinta-feira", "Sexta-feira", "Sábado", "Domingo")
+
+# Precedence ranks (lower wins), simplified from the Table of Liturgical Days
+RANK_TRIDUUM = 1
+RANK_PRINCIPAL = 2          # Natal, Epifania, Ascensão, Pentecostes, domingos privilegiados, Semana Santa
+RANK_SOLEMNITY = 3
+RANK_LORD_FEAST = 5
+RANK_SUNDAY = 6             # domingos do Tempo do Natal e do Tempo Comum
+RANK_FEAST = 7
+RANK_PRIVILEGED_WEEKDAY = 9 # 17-24 dez., oitava do Natal, férias da Quaresma
+RANK_WEEKDAY = 13
+
+_T = {name: i for i, name in enumerate(TYPES)}
+_C = {name: i for i, name in enumerate(COLORS)}
+_S = {name: i for i, name in enumerate(SEASONS)}
+
+# Fixed celebrations: (month, day, name, type, color, rank)
+FIXED_CELEBRATIONS: List[Tuple[int, int, str, str, str, int]] = [
+    (1, 1, "Santa Maria, Mãe de Deus", "solenidade", "branco", RANK_SOLEMNITY),
+    (1, 6, "Solenidade da Epifania do Senhor", "solenidade", "branco", RANK_PRINCIPAL),
+    (1, 25, "Conversão de São Paulo, Apóstolo", "festa", "branco", RANK_FEAST),
+    (2, 2, "Apresentação do Senhor", "festa", "branco", RANK_LORD_FEAST),
+    (2, 22, "Cátedra de São Pedro, Apóstolo", "festa", "branco", RANK_FEAST),
+    (3, 19, "São José, Esposo da Virgem Maria", "solenidade", "branco", RANK_SOLEMNITY),
+    (3, 25, "Anunciação do Senhor", "solenidade", "branco", RANK_SOLEMNITY),
+    (6, 24, "Natividade de São João Batista", "solenidade", "branco", RANK_SOLEMNITY),
+    (6, 29, "São Pedro e São Paulo, Apóstolos", "solenidade", "vermelho", RANK_SOLEMNITY),
+    (8, 6, "Transfiguração do Senhor", "festa", "branco", RANK_LORD_FEAST),
+    (8, 15, "Assunção de Nossa Senhora", "solenidade", "branco", RANK_SOLEMNITY),
+    (9, 14, "Exaltação da Santa Cruz", "festa", "vermelho", RANK_LORD_FEAST),
+    (10, 12, "Nossa Senhora da Conceição Aparecida", "solenidade", "branco", RANK_SOLEMNITY),
+    (11, 1, "Todos os Santos", "solenidade", "branco", RANK_SOLEMNITY),
+    (11, 2, "Comemoração de Todos os Fiéis Defuntos", "solenidade", "roxo", RANK_SOLEMNITY),
+    (11, 9, "Dedicação da Basílica do Latrão", "festa", "branco", RANK_LORD_FEAST),
+    (12, 8, "Imaculada Conceição de Nossa Senhora", "solenidade", "branco", RANK_SOLEMNITY),
+    (12, 25, "Natal do Senhor", "solenidade", "branco", RANK_PRINCIPAL),
+]
+
+
+def easter_date(year: int) -> date:
+    """Compute Easter Sunday for a year (anonymous Gregorian algorithm)"""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def first_sunday_of_advent(year: int) -> date:
+    """First Sunday of Advent: the Sunday between November 27 and December 3"""
+    christmas = date(year, 12, 25)
+    return christmas - timedelta(days=christmas.weekday() + 1 + 21)
+
+
+def baptism_of_the_lord(year: int) -> date:
+    """Baptism of the Lord: the Sunday after January 6"""
+    epiphany = date(year, 1, 6)
+    return epiphany + timedelta(days=6 - epiphany.weekday() or 7)
+
+
+def holy_family(year: int) -> date:
+    """Holy Family: Sunday within the Christmas octave, or December 30"""
+    christmas = date(year, 12, 25)
+    if christmas.weekday() == 6:
+        return date(year, 12, 30)
+    return christmas + timedelta(days=6 - christmas.weekday())
+
+
+def _ordinal(n: int, feminine: bool = False) -> str:
+    return f"{n}{'ª' if feminine else 'º'}"
+
+
+@dataclass(frozen=True)
+class CalendarDay:
+    """A resolved day of the liturgical calendar"""
+    date: date
+    name: str
+    type: str
+    color: str
+    season: str
+    week: int              # semana do tempo (0 para dias sem numeração)
+    psalter_week: int      # semana do saltério (1-4)
+    sunday_cycle: str      # ano A, B ou C
+    weekday_cycle: str     # ano I ou II
+
+    def to_celebration(self) -> Celebration:
+        """Convert to the base Celebration model"""
+        return Celebration(
+            name=self.name,
+            date=self.date,
+            type=self.type,
+            color=LiturgicalColor(self.color),
+            season=self.season
+        )
+
+
+class LiturgicalYear:
+    """
+    Precomputed calendar of one civil year.
+
+    Every attribute of a day is kept in a parallel ``array`` indexed by the
+    day of the year; names are interned in a list and referenced by index.
+    """
+
+    def __init__(self, year: int):
+        self.year = year
+        self._start = date(year, 1, 1).toordinal()
+        size = date(year, 12, 31).toordinal() - self._start + 1
+
+        self._names: List[str] = []
+        self._name_index: Dict[str, int] = {}
+        self._name = array('H', bytes(2 * size))
+        self._type = array('B', bytes(size))
+        self._color = array('B', bytes(size))
+        self._season = array('B', bytes(size))
+        self._week = array('B', bytes(size))
+        self._psalter = array('B', bytes(size))
+        self._rank = array('B', bytes(size))
+        self._cycle = array('B', bytes(size))  # bit 0-1: domingo (A/B/C), bit 2: férias (I/II)
+
+        self._build()
+
+    def __len__(self):
+        return len(self._name)
+
+    def __contains__(self, day: date) -> bool:
+        return 0 <= day.toordinal() - self._start < len(self._name)
+
+    def __iter__(self):
+        for i in range(len(self._name)):
+            yield self._day(i)
+
+    def get(self, day: date) -> CalendarDay:
+        """O(1) lookup of a date of this year"""
+        i = day.toordinal() - self._start
+        if not 0 <= i < len(self._name):
+            raise KeyError(f"{day.isoformat()} não pertence ao ano {self.year}")
+        return self._day(i)
+
+    def _day(self, i: int) -> CalendarDay:
+        cycle = self._cycle[i]
+        return CalendarDay(
+            date=date.fromordinal(self._start + i),
+            name=self._names[self._name[i]],
+            type=TYPES[self._type[i]],
+            color=COLORS[self._color[i]],
+            season=SEASONS[self._season[i]],
+            week=self._week[i],
+            psalter_week=self._psalter[i],
+            sunday_cycle=SUNDAY_CYCLES[cycle & 3],
+            weekday_cycle=WEEKDAY_CYCLES[cycle >> 2],
+        )
+
+    def _intern(self, name: str) -> int:
+        idx = self._name_index.get(name)
+        if idx is None:
+            idx = len(self._names)
+            self._names.append(name)
+            self._name_index[name] = idx
+        return idx
+
+    def _set(self, i: int, name: str, type_: str, color: str, rank: int):
+        self._name[i] = self._intern(name)
+        self._type[i] = _T[type_]
+        self._color[i] = _C[color]
+        self._rank[i] = rank
+
+    def _build(self):
+        """Fill the arrays: temporal cycle first, then the celebrations"""
+        year = self.year
+        easter = easter_date(year)
+        ash_wednesday = easter - timedelta(days=46)
+        lent_1 = ash_wednesday + timedelta(days=4)
+        pentecost = easter + timedelta(days=49)
+        baptism = baptism_of_the_lord(year)
+        advent_prev = first_sunday_of_advent(year - 1)
+        advent = first_sunday_of_advent(year)
+
+        for i in range(len(self._name)):
+            d = date.fromordinal(self._start + i)
+            wd = d.weekday()
+            sunday = wd == 6
+            weekday_name = WEEKDAY_NAMES[wd]
+
+            # Liturgical year this day belongs to (named after the year it ends)
+            lit_year = year + 1 if d >= advent else year
+            self._cycle[i] = ((lit_year - 1) % 3) | ((lit_year % 2 == 0) << 2)
+
+            week = 0
+            if d <= baptism or d >= date(year, 12, 25):
+                season = "Tempo do Natal"
+                anchor = advent_prev if d <= baptism else advent
+                psalter = (d - anchor).days // 7 % 4 + 1
+                if sunday:
+                    name, type_, rank = "Domingo do Tempo do Natal", "domingo", RANK_SUNDAY
+                else:
+                    name, type_ = f"{weekday_name} do Tempo do Natal", "feria"
+                    rank = RANK_PRIVILEGED_WEEKDAY if d.month == 12 else RANK_WEEKDAY
+                color = "branco"
+            elif d >= advent:
+                season = "Advento"
+                week = (d - advent).days // 7 + 1
+                psalter = week
+                color = "rosa" if sunday and week == 3 else "roxo"
+                if sunday:
+                    name, type_, rank = f"{_ordinal(week)} Domingo do Advento", "domingo", RANK_PRINCIPAL
+                else:
+                    name, type_ = f"{weekday_name} da {_ordinal(week, True)} Semana do Advento", "feria"
+                    rank = RANK_PRIVILEGED_WEEKDAY if d.day >= 17 else RANK_WEEKDAY
+            elif ash_wednesday <= d < easter - timedelta(days=3):
+                season = "Quaresma"
+                if d < lent_1:
+                    week, psalter = 0, 4
+                    name = ("Quarta-feira de Cinzas" if d == ash_wednesday
+                            else f"{weekday_name} depois das Cinzas")
+                    type_, rank = "feria", RANK_PRINCIPAL if d == ash_wednesday else RANK_PRIVILEGED_WEEKDAY
+                    color = "roxo"
+                else:
+                    week = (d - lent_1).days // 7 + 1
+                    psalter = (week - 1) % 4 + 1
+                    color = "rosa" if sunday and week == 4 else "roxo"
+                    if week == 6:
+                        name = ("Domingo de Ramos e da Paixão do Senhor" if sunday
+                                else f"{weekday_name} da Semana Santa")
+                        type_ = "domingo" if sunday else "feria"
+                        rank = RANK_PRINCIPAL
+                        if sunday:
+                            color = "vermelho"
+                    elif sunday:
+                        name, type_, rank = f"{_ordinal(week)} Domingo da Quaresma", "domingo", RANK_PRINCIPAL
+                    else:
+                        name, type_ = f"{weekday_name} da {_ordinal(week, True)} Semana da Quaresma", "feria"
+                        rank = RANK_PRIVILEGED_WEEKDAY
+            elif easter - timedelta(days=3) <= d < easter:
+                season = "Tríduo Pascal"
+                week, psalter = 6, 2
+                name = {3: "Quinta-feira Santa - Ceia do Senhor",
+                        4: "Sexta-feira da Paixão do Senhor",
+                        5: "Sábado Santo"}[wd]
+                type_, rank = "solenidade", RANK_TRIDUUM
+                color = "vermelho" if wd == 4 else "branco"
+            elif easter <= d <= pentecost:
+                season = "Tempo Pascal"
+                week = (d - easter).days // 7 + 1
+                psalter = (week - 1) % 4 + 1
+                color = "branco"
+                if d == easter:
+                    season = "Tríduo Pascal"
+                    name, type_, rank = "Domingo da Páscoa na Ressurreição do Senhor", "solenidade", RANK_TRIDUUM
+                elif d == pentecost:
+                    name, type_, rank, color = "Domingo de Pentecostes", "solenidade", RANK_PRINCIPAL, "vermelho"
+                elif week == 1:
+                    name, type_, rank = f"{weekday_name} da Oitava da Páscoa", "solenidade", RANK_PRINCIPAL
+                elif sunday:
+                    name, type_, rank = f"{_ordinal(week)} Domingo da Páscoa", "domingo", RANK_PRINCIPAL
+                else:
+                    name, type_ = f"{weekday_name} da {_ordinal(week, True)} Semana da Páscoa", "feria"
+                    rank = RANK_WEEKDAY
+            else:
+                season = "Tempo Comum"
+                if d < ash_wednesday:
+                    week = (d - baptism).days // 7 + 1
+                else:
+                    week = 34 - ((advent - d).days - 1) // 7
+                psalter = (week - 1) % 4 + 1
+                color = "verde"
+                if sunday:
+                    name, type_, rank = f"{_ordinal(week)} Domingo do Tempo Comum", "domingo", RANK_SUNDAY
+                else:
+                    name, type_ = f"{weekday_name} da {_ordinal(week, True)} Semana do Tempo Comum", "feria"
+                    rank = RANK_WEEKDAY
+
+            self._season[i] = _S[season]
+            self._week[i] = week
+            self._psalter[i] = psalter
+            self._set(i, name, type_, color, rank)
+
+        # Moveable celebrations and fixed calendar, by precedence
+        moveable = [
+            (baptism, "Batismo do Senhor", "festa", "branco", RANK_LORD_FEAST),
+            (easter + timedelta(days=39), "Ascensão do Senhor", "solenidade", "branco", RANK_PRINCIPAL),
+            (pentecost + timedelta(days=7), "Santíssima Trindade", "solenidade", "branco", RANK_SOLEMNITY),
+            (pentecost + timedelta(days=11), "Santíssimo Corpo e Sangue de Cristo", "solenidade", "branco",
+             RANK_SOLEMNITY),
+            (pentecost + timedelta(days=19), "Sagrado Coração de Jesus", "solenidade", "branco", RANK_SOLEMNITY),
+            (advent - timedelta(days=7), "Nosso Senhor Jesus Cristo, Rei do Universo", "solenidade", "branco",
+             RANK_SOLEMNITY),
+            (holy_family(year), "Sagrada Família de Jesus, Maria e José", "festa", "branco", RANK_LORD_FEAST),
+        ]
+        fixed = [(date(year, m, dd), name, type_, color, rank)
+                 for m, dd, name, type_, color, rank in FIXED_CELEBRATIONS]
+
+        for day, name, type_, color, rank in sorted(moveable + fixed, key=lambda c: c[4]):
+            i = day.toordinal() - self._start
+            if rank < self._rank[i]:
+                self._set(i, name, type_, color, rank)
+            elif type_ == "solenidade":
+                # Impeded solemnities move to the next day not already taken
+                j = i + 1
+                while j < len(self._name) and self._rank[j] <= RANK_SUNDAY:
+                    j += 1
+                if j < len(self._name):
+                    self._set(j, name, type_, color, rank)
+            # Impeded feasts are omitted that year
+
+
+class LiturgicalCalendar:
+    """
+    Entry point of the calendar engine. Years are computed on first use
+    and kept for the lifetime of the process.
+    """
+
+    _years: Dict[int, LiturgicalYear] = {}
+
+    @classmethod
+    def for_year(cls, year: int) -> LiturgicalYear:
+        """Get (computing on first use) the calendar of a civil year"""
+        cal = cls._years.get(year)
+        if cal is None:
+            cal = cls._years[year] = LiturgicalYear(year)
+        return cal
+
+    @classmethod
+    def get_day(cls, day: date) -> CalendarDay:
+        """Resolve a single date"""
+        return cls.for_year(day.year).get(day)
+
+    @classmethod
+    def get_range(cls, start: date, end: date) -> List[CalendarDay]:
+        """Resolve every date from start to end (inclusive)"""
+        days = []
+        current = start
+        while current <= end:
+            year = cls.for_year(current.year)
+            last = min(end, date(current.year, 12, 31))
+            while current <= last:
+                days.append(year.get(current))
+                current += timedelta(days=1)
+        return days
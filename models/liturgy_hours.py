@@ -2,10 +2,28 @@
 Model for Liturgy of the Hours (Liturgia das Horas)
 """
 
-from dataclasses import dataclass, field
-from typing import List, Optional
+import functools
+from dataclasses import asdict, dataclass, field, replace
+from typing import Dict, Iterator, List, Optional
 from datetime import date, datetime
 from .base import Psalm, Prayer, Antiphon, Celebration
+from .cache import cached_by_date, content_cache, invalidate_kind
+from .liturgical_calendar import CalendarDay, LiturgicalCalendar
+from .psalter import get_psalmody, marian_antiphon, psalm_antiphon
+
+# Celebrations with festive psalmody
+FESTIVE_TYPES = ("solenidade", "festa")
+
+# Canonical hours in order: (key, LiturgiaHoras method)
+HOUR_GETTERS = (
+    ('office_readings', 'get_office_readings'),
+    ('laudes', 'get_laudes'),
+    ('terca', 'get_terca'),
+    ('sexta', 'get_sexta'),
+    ('nona', 'get_nona'),
+    ('vesperas', 'get_vesperas'),
+    ('completas', 'get_completas'),
+)
 
 
 @dataclass
@@ -19,44 +37,68 @@ class Hour:
     reading: Optional[str] = None
     canticle: Optional[str] = None
     prayers: List[Prayer] = field(default_factory=list)
+    # Last update of the stored row (None when computed), for HTTP validators
+    updated_at: Optional[datetime] = field(default=None, compare=False)
+    
+    def to_dict(self) -> Dict:
+        """JSON-serializable form (liturgy_hours.content)"""
+        data = asdict(self)
+        del data['updated_at']
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict, updated_at: Optional[datetime] = None) -> "Hour":
+        """Rebuild an hour from to_dict output"""
+        return cls(
+            name=data['name'],
+            time=data['time'],
+            hymn=data.get('hymn'),
+            psalms=[Psalm(**psalm) for psalm in data.get('psalms') or []],
+            antiphons=list(data.get('antiphons') or []),
+            reading=data.get('reading'),
+            canticle=data.get('canticle'),
+            prayers=[Prayer(**prayer) for prayer in data.get('prayers') or []],
+            updated_at=updated_at
+        )
     
     def format(self) -> str:
         """Format the hour for display"""
-        result = []
-        result.append(f"\n{'=' * 80}")
-        result.append(f"{self.name.upper()}")
-        result.append(f"Hora: {self.time}")
-        result.append(f"{'=' * 80}\n")
+        return "\n".join(self.iter_lines())
+    
+    def iter_lines(self) -> Iterator[str]:
+        """Yield the lines of format() one by one"""
+        yield f"\n{'=' * 80}"
+        yield f"{self.name.upper()}"
+        yield f"Hora: {self.time}"
+        yield f"{'=' * 80}\n"
         
         if self.hymn:
-            result.append("HINO")
-            result.append(self.hymn)
-            result.append("")
+            yield "HINO"
+            yield self.hymn
+            yield ""
         
         if self.psalms:
-            result.append("SALMODIA")
+            yield "SALMODIA"
             for i, (psalm, antiphon) in enumerate(zip(self.psalms, self.antiphons), 1):
                 if antiphon:
-                    result.append(f"\nAnt. {i}: {antiphon}")
-                result.append(str(psalm))
-            result.append("")
+                    yield f"\nAnt. {i}: {antiphon}"
+                yield str(psalm)
+            yield ""
         
         if self.reading:
-            result.append("LEITURA BREVE")
-            result.append(self.reading)
-            result.append("")
+            yield "LEITURA BREVE"
+            yield self.reading
+            yield ""
         
         if self.canticle:
-            result.append("CÂNTICO")
-            result.append(self.canticle)
-            result.append("")
+            yield "CÂNTICO"
+            yield self.canticle
+            yield ""
         
         if self.prayers:
             for prayer in self.prayers:
-                result.append(str(prayer))
-                result.append("")
-        
-        return "\n".join(result)
+                yield str(prayer)
+                yield ""
 
 
 class LiturgiaHoras:
@@ -74,11 +116,43 @@ class LiturgiaHoras:
     - Completas (Night Prayer)
     """
     
+    _repository = None
+    
     @classmethod
+    def set_repository(cls, repository):
+        """Set the repository of precomputed hours (None disables it)"""
+        cls._repository = repository
+        for key, _ in HOUR_GETTERS:
+            invalidate_kind(key)
+    
+    @classmethod
+    def _resolve(cls, hour_key: str, date_str: str) -> Hour:
+        """Stored hour of a date, or the hour computed from the calendar and psalter"""
+        liturgy_date = datetime.strptime(date_str, "%Y-%m-%d").date()
+        if cls._repository is not None:
+            stored = cls._repository.get_hours(liturgy_date, [hour_key]).get(hour_key)
+            if stored is not None:
+                return stored
+        return cls._compute(hour_key, LiturgicalCalendar.get_day(liturgy_date))
+    
+    @classmethod
+    def _compute(cls, hour_key: str, day: CalendarDay) -> Hour:
+        """
+        Hour of a calendar day, built once per (hour, psalter week, weekday,
+        season, festive day)
+        """
+        return _memoized_hour(cls, hour_key, day.psalter_week, day.date.weekday(), day.season,
+                              day.type in FESTIVE_TYPES)
+    
+    @classmethod
+    @cached_by_date("office_readings")
     def get_office_readings(cls, date_str: str) -> Hour:
         """Get Office of Readings for a specific date"""
-        liturgy_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-        
+        return cls._resolve("office_readings", date_str)
+    
+    @staticmethod
+    def _build_office_readings(psalter_week: int, season: str) -> Hour:
+        """Office of Readings of a psalter week and season"""
         office = Hour(
             name="Ofício das Leituras",
             time="Durante a noite ou primeira hora do dia",
@@ -107,27 +181,20 @@ class LiturgiaHoras:
         return office
     
     @classmethod
+    @cached_by_date("laudes")
     def get_laudes(cls, date_str: str) -> Hour:
         """Get Laudes (Morning Prayer) for a specific date"""
-        liturgy_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-        
+        return cls._resolve("laudes", date_str)
+    
+    @staticmethod
+    def _build_laudes(psalter_week: int, season: str) -> Hour:
+        """Laudes (Morning Prayer) of a psalter week and season"""
         # Create a sample Laudes
         laudes = Hour(
             name="Laudes (Oração da Manhã)",
             time="Ao amanhecer",
             hymn="Ó Cristo, sol da verdade,\nque iluminas o universo,\nda tua imensa bondade\na luz vem, sempre diversa.",
-            psalms=[
-                Psalm(number=63, reference="Sl 63,2-9", 
-                      response="Minha alma tem sede de Vós, ó Senhor.",
-                      verses=["Ó Deus, vós sois o meu Deus, eu vos procuro..."]),
-                Psalm(number=149, reference="Sl 149",
-                      response="O Senhor ama o seu povo.",
-                      verses=["Cantai ao Senhor Deus um canto novo..."])
-            ],
-            antiphons=[
-                "Bendizei ao Senhor todas as suas obras",
-                "Que tudo quanto existe cante um hino ao Senhor"
-            ],
+            # Psalmody comes from the psalter (models.psalter)
             reading="Leitura breve: Rm 13,11-12a",
             canticle="Benedictus - Cântico de Zacarias (Lc 1,68-79)",
             prayers=[
@@ -146,10 +213,14 @@ class LiturgiaHoras:
         return laudes
     
     @classmethod
+    @cached_by_date("terca")
     def get_terca(cls, date_str: str) -> Hour:
         """Get Terça (Mid-Morning Prayer - 9h) for a specific date"""
-        liturgy_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-        
+        return cls._resolve("terca", date_str)
+    
+    @staticmethod
+    def _build_terca(psalter_week: int, season: str) -> Hour:
+        """Terça (Mid-Morning Prayer - 9h) of a psalter week and season"""
         terca = Hour(
             name="Terça (Hora Média - Meio da Manhã)",
             time="Por volta das 9 horas",
@@ -182,10 +253,14 @@ class LiturgiaHoras:
         return terca
     
     @classmethod
+    @cached_by_date("sexta")
     def get_sexta(cls, date_str: str) -> Hour:
         """Get Sexta (Midday Prayer - 12h) for a specific date"""
-        liturgy_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-        
+        return cls._resolve("sexta", date_str)
+    
+    @staticmethod
+    def _build_sexta(psalter_week: int, season: str) -> Hour:
+        """Sexta (Midday Prayer - 12h) of a psalter week and season"""
         sexta = Hour(
             name="Sexta (Hora Média - Meio-Dia)",
             time="Por volta das 12 horas",
@@ -222,10 +297,14 @@ class LiturgiaHoras:
         return sexta
     
     @classmethod
+    @cached_by_date("nona")
     def get_nona(cls, date_str: str) -> Hour:
         """Get Nona (Mid-Afternoon Prayer - 15h) for a specific date"""
-        liturgy_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-        
+        return cls._resolve("nona", date_str)
+    
+    @staticmethod
+    def _build_nona(psalter_week: int, season: str) -> Hour:
+        """Nona (Mid-Afternoon Prayer - 15h) of a psalter week and season"""
         nona = Hour(
             name="Nona (Hora Média - Meio da Tarde)",
             time="Por volta das 15 horas",
@@ -260,26 +339,19 @@ class LiturgiaHoras:
         return nona
     
     @classmethod
+    @cached_by_date("vesperas")
     def get_vesperas(cls, date_str: str) -> Hour:
         """Get Vésperas (Evening Prayer) for a specific date"""
-        liturgy_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-        
+        return cls._resolve("vesperas", date_str)
+    
+    @staticmethod
+    def _build_vesperas(psalter_week: int, season: str) -> Hour:
+        """Vésperas (Evening Prayer) of a psalter week and season"""
         vesperas = Hour(
             name="Vésperas (Oração da Tarde)",
             time="Ao entardecer",
             hymn="Ó Cristo, luz do mundo,\nque a noite se aproxima,\nacendei em nós o fogo\nda caridade divina.",
-            psalms=[
-                Psalm(number=141, reference="Sl 141(142)",
-                      response="Suba minha oração, como incenso, à vossa presença.",
-                      verses=["Senhor, a vós clamo: vinde depressa..."]),
-                Psalm(number=110, reference="Sl 110(111)",
-                      response="Grandes são as obras do Senhor.",
-                      verses=["De todo coração agradeço ao Senhor..."])
-            ],
-            antiphons=[
-                "Como incenso suba a vós minha oração",
-                "Bendito seja Deus, agora e sempre"
-            ],
+            # Psalmody comes from the psalter (models.psalter)
             reading="Leitura breve: 1 Pd 1,3-5",
             canticle="Magnificat - Cântico de Maria (Lc 1,46-55)",
             prayers=[
@@ -302,22 +374,19 @@ class LiturgiaHoras:
         return vesperas
     
     @classmethod
+    @cached_by_date("completas")
     def get_completas(cls, date_str: str) -> Hour:
         """Get Completas (Night Prayer) for a specific date"""
-        liturgy_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-        
+        return cls._resolve("completas", date_str)
+    
+    @staticmethod
+    def _build_completas(psalter_week: int, season: str) -> Hour:
+        """Completas (Night Prayer) of a psalter week and season"""
         completas = Hour(
             name="Completas (Oração da Noite)",
             time="Antes de dormir",
             hymn="Antes que a noite desça,\na ti, Senhor, recorro;\nguarda-me nesta treva,\nde todo mal socorro.",
-            psalms=[
-                Psalm(number=91, reference="Sl 91(92)",
-                      response="Habita à sombra do Onipotente.",
-                      verses=["Aquele que no abrigo do Altíssimo reside..."])
-            ],
-            antiphons=[
-                "Em tuas mãos, Senhor, entrego meu espírito"
-            ],
+            # Psalmody comes from the psalter (models.psalter)
             reading="Leitura breve: Jr 14,9b",
             canticle="Nunc Dimittis - Cântico de Simeão (Lc 2,29-32)",
             prayers=[
@@ -337,6 +406,9 @@ class LiturgiaHoras:
         """
         Get all canonical hours for a specific date
         
+        Cached hours are read in one batch, stored hours in one query, and
+        the remaining ones are computed (memoized per psalter week).
+        
         Returns:
             Dictionary with all hours: {
                 'office_readings': Hour,
@@ -348,29 +420,82 @@ class LiturgiaHoras:
                 'completas': Hour
             }
         """
-        return {
-            'office_readings': cls.get_office_readings(date_str),
-            'laudes': cls.get_laudes(date_str),
-            'terca': cls.get_terca(date_str),
-            'sexta': cls.get_sexta(date_str),
-            'nona': cls.get_nona(date_str),
-            'vesperas': cls.get_vesperas(date_str),
-            'completas': cls.get_completas(date_str)
-        }
+        keys = [(date_str, key) for key, _ in HOUR_GETTERS]
+        hours = content_cache.get_many(keys)
+        missing = [key for key, _ in HOUR_GETTERS if (date_str, key) not in hours]
+        fetched = {}
+        liturgy_date = datetime.strptime(date_str, "%Y-%m-%d").date()
+        if missing and cls._repository is not None:
+            # The database session is not thread-safe: read in this thread
+            stored = cls._repository.get_hours(liturgy_date, missing)
+            fetched.update({(date_str, key): hour for key, hour in stored.items()})
+            missing = [key for key in missing if key not in stored]
+        if missing:
+            # Memoized and CPU bound: computed in this thread
+            day = LiturgicalCalendar.get_day(liturgy_date)
+            fetched.update({(date_str, key): cls._compute(key, day) for key in missing})
+        if fetched:
+            content_cache.set_many(fetched)
+            hours.update(fetched)
+        return {key: hours[(date_str, key)] for key, _ in HOUR_GETTERS}
     
     @classmethod
     def format_all_hours(cls, date_str: str) -> str:
         """Get formatted text of all canonical hours for a date"""
-        all_hours = cls.get_all_hours(date_str)
-        result = []
-        result.append("\n" + "=" * 80)
-        result.append("LITURGIA DAS HORAS COMPLETA")
-        result.append(f"Data: {date_str}")
-        result.append("=" * 80)
+        return "\n".join(cls.iter_all_hours_lines(date_str))
+    
+    @classmethod
+    def iter_all_hours_lines(cls, date_str: str) -> Iterator[str]:
+        """
+        Yield the lines of format_all_hours one by one
         
-        for hour_name, hour in all_hours.items():
-            result.append(hour.format())
-            result.append("\n" + "-" * 80 + "\n")
+        The seven hours are loaded together with get_all_hours; only their
+        text is produced lazily.
+        """
+        hours = cls.get_all_hours(date_str)
+        yield "\n" + "=" * 80
+        yield "LITURGIA DAS HORAS COMPLETA"
+        yield f"Data: {date_str}"
+        yield "=" * 80
         
-        return "\n".join(result)
+        for hour in hours.values():
+            yield from hour.iter_lines()
+            yield "\n" + "-" * 80 + "\n"
 
+
+@functools.lru_cache(maxsize=1024)
+def _memoized_hour(cls, hour_key: str, psalter_week: int, weekday: int, season: str,
+                   festive: bool) -> Hour:
+    """
+    Build an hour from its ordinary (hymn, reading, prayers) and the
+    psalmody of the psalter; each combination is built once
+    """
+    hour = getattr(cls, f"_build_{hour_key}")(psalter_week, season)
+    changes = {}
+    psalms = get_psalmody(psalter_week, weekday, hour_key, season, festive)
+    if psalms is not None:
+        changes['psalms'] = list(psalms)
+        changes['antiphons'] = [psalm_antiphon(psalm) for psalm in psalms]
+    if hour_key == "completas":
+        changes['prayers'] = hour.prayers + [marian_antiphon(season)]
+    return replace(hour, **changes) if changes else hour
+
+
+def iter_hour_rows(year: int) -> Iterator[Dict]:
+    """
+    Yield liturgy_hours rows (date, hour_type, content) for every hour of
+    every day of a year, computed from the calendar and the psalter
+
+    Distinct hours are few (they repeat by psalter week, weekday and
+    season), so each is serialized once and its content dict shared by
+    all the rows that use it.
+    """
+    contents: Dict[int, tuple] = {}
+    for day in LiturgicalCalendar.for_year(year):
+        for key, _ in HOUR_GETTERS:
+            hour = LiturgiaHoras._compute(key, day)
+            entry = contents.get(id(hour))
+            if entry is None:
+                # Keep the hour referenced so its id is not reused
+                entry = contents[id(hour)] = (hour, hour.to_dict())
+            yield {'date': day.date, 'hour_type': key, 'content': entry[1]}
@@ -0,0 +1,138 @@
+"""
+Content-addressed cache of generated Mass leaflets (PDF)
+
+A leaflet is identified by the hash of the rendered Mass content plus the
+normalized export options, so identical requests reuse the same file.
+Files live in a directory bounded in total size; the least recently used
+files are evicted first (recency is tracked through the file mtime).
+"""
+
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+from typing import BinaryIO, Dict, Optional
+
+from .custom_mass import CustomMass
+
+
+class PDFCache:
+    """
+    Size-bounded on-disk LRU of PDFs keyed by content hash
+
+    An optional shared tier (models.cache.RedisCache) lets other processes
+    and replicas reuse leaflets generated elsewhere.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024, shared=None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.shared = shared
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key_for(mass: CustomMass, options: Dict) -> str:
+        """Hash of the Mass content and the normalized PDF options"""
+        normalized = CustomMass.normalize_pdf_options(options)
+        digest = hashlib.sha256(mass.fingerprint().encode('ascii'))
+        digest.update(json.dumps(normalized, sort_keys=True).encode('utf-8'))
+        return digest.hexdigest()
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pdf")
+
+    def get(self, key: str) -> Optional[str]:
+        """Path of a cached PDF (refreshing its recency), or None"""
+        path = self.path_for(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            if self.shared is not None:
+                data = self.shared.get_many([('pdf', key)]).get(('pdf', key))
+                if data is not None:
+                    self._write(key, data)
+                    self.hits += 1
+                    return path
+            self.misses += 1
+            return None
+        self.hits += 1
+        return path
+
+    def put(self, key: str, data: bytes) -> str:
+        """Store PDF bytes under key and return the file path"""
+        path = self._write(key, data)
+        if self.shared is not None:
+            self.shared.set_many({('pdf', key): data})
+        return path
+
+    def get_or_create(self, mass: CustomMass, **options) -> str:
+        """
+        Path of the PDF for mass with options, generating it on a miss
+        """
+        key = self.key_for(mass, options)
+        path = self.get(key)
+        if path is not None:
+            return path
+        return self.put(key, mass.export_to_pdf(**CustomMass.normalize_pdf_options(options)))
+
+    def open(self, mass: CustomMass, **options) -> BinaryIO:
+        """
+        Readable binary stream with the PDF for mass with options
+
+        A hit opens the cached file; a miss renders in memory, stores the
+        bytes in the cache and returns them as a BytesIO without reading
+        the file back.
+        """
+        key = self.key_for(mass, options)
+        path = self.get(key)
+        if path is not None:
+            try:
+                return open(path, 'rb')
+            except FileNotFoundError:
+                # Evicted by another request in the meantime
+                pass
+        data = mass.export_to_pdf(**CustomMass.normalize_pdf_options(options))
+        self.put(key, data)
+        return io.BytesIO(data)
+
+    def _write(self, key: str, data: bytes) -> str:
+        """Atomically write a file, then evict down to max_bytes"""
+        path = self.path_for(key)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        self.evict()
+        return path
+
+    def evict(self):
+        """Delete least recently used PDFs until the directory fits max_bytes"""
+        with self._lock:
+            entries = []
+            total = 0
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.is_file() and entry.name.endswith('.pdf'):
+                        st = entry.stat()
+                        entries.append((st.st_mtime, st.st_size, entry.path))
+                        total += st.st_size
+            if total <= self.max_bytes:
+                return
+            entries.sort()
+            # Never evict the most recent file, even if it alone exceeds the limit
+            for mtime, size, path in entries[:-1]:
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    continue
+                total -= size
+                if total <= self.max_bytes:
+                    break
+
+    def stats(self) -> Dict:
+        return {'hits': self.hits, 'misses': self.misses, 'max_bytes': self.max_bytes}
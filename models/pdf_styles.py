@@ -0,0 +1,203 @@
+"""
+Registry of precompiled ReportLab styles for Mass leaflets
+
+Paragraph styles depend only on a handful of export options, so each
+combination is built once per process and shared by every export. The
+options come from user forms: unknown fonts and page sizes fall
+back to the defaults, sizes are clamped and at most STYLES_MAX_ENTRIES
+layouts are kept (least recently used first out).
+TrueType fonts are registered once (usually at startup) and can then be
+used as font_family.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+
+# Color of the part headings
+HEADING_COLOR = '#5e72e4'
+
+# The 14 standard PDF fonts, usable without registration
+STANDARD_FONTS = (
+    'Courier', 'Courier-Bold', 'Courier-Oblique', 'Courier-BoldOblique',
+    'Helvetica', 'Helvetica-Bold', 'Helvetica-Oblique', 'Helvetica-BoldOblique',
+    'Times-Roman', 'Times-Bold', 'Times-Italic', 'Times-BoldItalic',
+    'Symbol', 'ZapfDingbats',
+)
+DEFAULT_FONT = 'Times-Roman'
+PAGE_SIZES = ('A4', 'Letter', 'A5')
+FONT_SIZE_RANGE = (6, 36)
+TITLE_SIZE_RANGE = (8, 72)
+MARGIN_RANGE = (0, 144)
+STYLES_MAX_ENTRIES = 256
+
+_lock = threading.Lock()
+_styles: "OrderedDict[Tuple, PDFStyles]" = OrderedDict()
+_fonts: Dict[str, str] = {}
+
+
+@dataclass(frozen=True)
+class PDFStyles:
+    """Page size and paragraph styles of a leaflet layout"""
+    page_size: Tuple[float, float]
+    title: Any
+    heading: Any
+    body: Any
+    footer: Any
+
+
+def _reportlab_error() -> ImportError:
+    return ImportError("reportlab is required for PDF export. Install with: pip install reportlab")
+
+
+def register_font(name: str, path: str, bold: Optional[str] = None,
+                  italic: Optional[str] = None, bold_italic: Optional[str] = None):
+    """
+    Register a TrueType font (and optional variants) under name
+
+    Registering the same name again is a no-op, so it is safe to call from
+    every worker at startup.
+    """
+    with _lock:
+        if name in _fonts:
+            return
+        try:
+            from reportlab.pdfbase import pdfmetrics
+            from reportlab.pdfbase.ttfonts import TTFont
+            from reportlab.lib.fonts import addMapping
+        except ImportError:
+            raise _reportlab_error()
+
+        variants = {
+            (0, 0): (name, path),
+            (1, 0): (f"{name}-Bold", bold),
+            (0, 1): (f"{name}-Italic", italic),
+            (1, 1): (f"{name}-BoldItalic", bold_italic),
+        }
+        for (is_bold, is_italic), (font_name, font_path) in variants.items():
+            if font_path:
+                pdfmetrics.registerFont(TTFont(font_name, font_path))
+            else:
+                # Fall back to the regular face so <b>/<i> markup still renders
+                font_name = name
+            addMapping(name, is_bold, is_italic, font_name)
+        _fonts[name] = path
+
+
+def register_fonts(spec: str):
+    """
+    Register fonts from a spec like "Name=/path/regular.ttf,/path/bold.ttf;..."
+
+    The optional comma-separated paths after the regular face are bold,
+    italic and bold italic.
+    """
+    for entry in filter(None, (part.strip() for part in spec.split(';'))):
+        name, _, paths = entry.partition('=')
+        faces = [p.strip() or None for p in paths.split(',')]
+        faces += [None] * (4 - len(faces))
+        register_font(name.strip(), *faces[:4])
+
+
+def registered_fonts() -> Dict[str, str]:
+    """Fonts registered with register_font (name -> path)"""
+    return dict(_fonts)
+
+
+def get_pdf_styles(font_family: str, font_size: int, title_size: int, page_size: str) -> PDFStyles:
+    """Get (building on first use) the styles for a layout"""
+    key = _layout_key(font_family, font_size, title_size, page_size)
+    with _lock:
+        styles = _styles.get(key)
+        if styles is not None:
+            _styles.move_to_end(key)
+            return styles
+    built = _build_styles(*key)
+    with _lock:
+        styles = _styles.setdefault(key, built)
+        _styles.move_to_end(key)
+        while len(_styles) > STYLES_MAX_ENTRIES:
+            _styles.popitem(last=False)
+    return styles
+
+
+def _clamp(value: int, bounds: Tuple[int, int]) -> int:
+    return max(bounds[0], min(bounds[1], int(value)))
+
+
+def _layout_key(font_family: str, font_size: int, title_size: int, page_size: str) -> Tuple:
+    """Options reduced to the layouts that can actually be built"""
+    if font_family not in STANDARD_FONTS and font_family not in _fonts:
+        font_family = DEFAULT_FONT
+    return (
+        font_family,
+        _clamp(font_size, FONT_SIZE_RANGE),
+        _clamp(title_size, TITLE_SIZE_RANGE),
+        page_size if page_size in PAGE_SIZES else 'A4',
+    )
+
+
+def _build_styles(font_family: str, font_size: int, title_size: int, page_size: str) -> PDFStyles:
+    try:
+        from reportlab.lib.pagesizes import letter, A4, A5
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.lib import colors
+    except ImportError:
+        raise _reportlab_error()
+
+    page_sizes = {
+        'A4': A4,
+        'Letter': letter,
+        'A5': A5
+    }
+    sample = getSampleStyleSheet()
+
+    title = ParagraphStyle(
+        'CustomTitle',
+        parent=sample['Heading1'],
+        fontName=font_family,
+        fontSize=title_size,
+        textColor=colors.black,
+        spaceAfter=20,
+        alignment=1,  # Center
+        leading=title_size * 1.2
+    )
+
+    heading = ParagraphStyle(
+        'CustomHeading',
+        parent=sample['Heading2'],
+        fontName=font_family,
+        fontSize=font_size + 2,
+        textColor=colors.HexColor(HEADING_COLOR),
+        spaceAfter=10,
+        spaceBefore=15,
+        leading=(font_size + 2) * 1.3
+    )
+
+    body = ParagraphStyle(
+        'CustomBody',
+        parent=sample['Normal'],
+        fontName=font_family,
+        fontSize=font_size,
+        textColor=colors.black,
+        spaceAfter=6,
+        leading=font_size * 1.4,
+        alignment=0  # Left
+    )
+
+    footer = ParagraphStyle(
+        'Footer',
+        parent=body,
+        fontSize=font_size - 2,
+        textColor=colors.grey,
+        alignment=1
+    )
+
+    return PDFStyles(
+        page_size=page_sizes.get(page_size, A4),
+        title=title,
+        heading=heading,
+        body=body,
+        footer=footer
+    )
@@ -0,0 +1,613 @@
+"""
+Four-week psalter of the Liturgy of the Hours
+
+The psalmody of Laudes, Vésperas and Completas follows the four-week
+cycle of the psalter (Completas repeats every week). The whole table is
+expanded once at import into a dict keyed by (psalter week, weekday,
+hour), so resolving a date is a single lookup. Seasonal replacements and
+the festive psalmody of solemnities and feasts are precomputed the same
+way. Psalms are numbered Greek(Hebrew), as in the liturgical books
+("Sl 118(119),145-152"), and each one carries its antiphon, response and
+first verse.
+
+Weekdays follow ``date.weekday()`` (0 = Monday, 6 = Sunday); Saturday
+Vésperas are the I Vésperas of the following Sunday.
+"""
+
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
+from .base import Psalm, Prayer
+from .bible import psalm_number
+
+
+# Psalmody per psalter week, from Sunday to Saturday (Greek(Hebrew) numbering)
+_LAUDES = {
+    1: ("Sl 62(63),2-9 | Dn 3,57-88.56 | Sl 149",
+        "Sl 5,2-10.12-13 | 1Cr 29,10-13 | Sl 28(29)",
+        "Sl 23(24) | Tb 13,2-8 | Sl 32(33)",
+        "Sl 35(36) | Jt 16,1-2.13-15 | Sl 46(47)",
+        "Sl 56(57) | Jr 31,10-14 | Sl 47(48)",
+        "Sl 50(51) | Is 45,15-25 | Sl 99(100)",
+        "Sl 118(119),145-152 | Ex 15,1-4a.8-13.17-18 | Sl 116(117)"),
+    2: ("Sl 117(118) | Dn 3,52-57 | Sl 150",
+        "Sl 41(42) | Eclo 36,1-7.13-16 | Sl 18(19),2-7",
+        "Sl 42(43) | Is 38,10-14.17-20 | Sl 64(65)",
+        "Sl 76(77) | 1Sm 2,1-10 | Sl 96(97)",
+        "Sl 79(80) | Is 12,1-6 | Sl 80(81)",
+        "Sl 50(51) | Hab 3,2-4.13a.15-19 | Sl 147,12-20",
+        "Sl 91(92) | Dt 32,1-12 | Sl 8"),
+    3: ("Sl 92(93) | Dn 3,57-88.56 | Sl 148",
+        "Sl 83(84) | Is 2,2-5 | Sl 95(96)",
+        "Sl 84(85) | Is 26,1-4.7-9.12 | Sl 66(67)",
+        "Sl 85(86) | Is 33,13-16 | Sl 97(98)",
+        "Sl 86(87) | Is 40,10-17 | Sl 98(99)",
+        "Sl 50(51) | Jr 14,17-21 | Sl 99(100)",
+        "Sl 118(119),145-152 | Sb 9,1-6.9-11 | Sl 116(117)"),
+    4: ("Sl 117(118) | Dn 3,52-57 | Sl 150",
+        "Sl 89(90) | Is 42,10-16 | Sl 134(135),1-12",
+        "Sl 100(101) | Dn 3,26.27.29.34-41 | Sl 143(144),1-10",
+        "Sl 107(108) | Is 61,10-62,5 | Sl 145(146)",
+        "Sl 142(143),1-11 | Is 66,10-14a | Sl 146(147),1-11",
+        "Sl 50(51) | Tb 13,8-11.13-15 | Sl 147,12-20",
+        "Sl 91(92) | Ez 36,24-28 | Sl 8"),
+}
+
+_VESPERAS = {
+    1: ("Sl 109(110),1-5.7 | Sl 113(114) | Ap 19,1-7",
+        "Sl 10(11) | Sl 14(15) | Ef 1,3-10",
+        "Sl 19(20) | Sl 20(21),2-8.14 | Ap 4,11; 5,9.10.12",
+        "Sl 26(27),1-6 | Sl 26(27),7-14 | Cl 1,12-20",
+        "Sl 29(30) | Sl 31(32) | Ap 11,17-18; 12,10b-12a",
+        "Sl 40(41) | Sl 45(46) | Ap 15,3-4",
+        "Sl 118(119),105-112 | Sl 15(16) | Fl 2,6-11"),
+    2: ("Sl 109(110),1-5.7 | Sl 113(115) | Ap 19,1-7",
+        "Sl 44(45),2-10 | Sl 44(45),11-18 | Ef 1,3-10",
+        "Sl 48(49),1-13 | Sl 48(49),14-21 | Ap 4,11; 5,9.10.12",
+        "Sl 61(62) | Sl 66(67) | Cl 1,12-20",
+        "Sl 71(72),1-11 | Sl 71(72),12-19 | Ap 11,17-18; 12,10b-12a",
+        "Sl 114(116),1-9 | Sl 120(121) | Ap 15,3-4",
+        "Sl 112(113) | Sl 115(116),10-19 | Fl 2,6-11"),
+    3: ("Sl 109(110),1-5.7 | Sl 110(111) | Ap 19,1-7",
+        "Sl 122(123) | Sl 123(124) | Ef 1,3-10",
+        "Sl 124(125) | Sl 130(131) | Ap 4,11; 5,9.10.12",
+        "Sl 125(126) | Sl 126(127) | Cl 1,12-20",
+        "Sl 131(132),1-10 | Sl 131(132),11-18 | Ap 11,17-18; 12,10b-12a",
+        "Sl 134(135),1-12 | Sl 134(135),13-21 | Ap 15,3-4",
+        "Sl 121(122) | Sl 129(130) | Fl 2,6-11"),
+    4: ("Sl 109(110),1-5.7 | Sl 111(112) | Ap 19,1-7",
+        "Sl 135(136),1-9 | Sl 135(136),10-26 | Ef 1,3-10",
+        "Sl 136(137),1-6 | Sl 137(138) | Ap 4,11; 5,9.10.12",
+        "Sl 138(139),1-12 | Sl 138(139),13-18.23-24 | Cl 1,12-20",
+        "Sl 143(144),1-8 | Sl 143(144),9-15 | Ap 11,17-18; 12,10b-12a",
+        "Sl 144(145),1-13 | Sl 144(145),14-21 | Ap 15,3-4",
+        "Sl 140(141),1-9 | Sl 141(142) | Fl 2,6-11"),
+}
+
+_COMPLETAS = (
+    "Sl 90(91)",
+    "Sl 85(86)",
+    "Sl 142(143),1-11",
+    "Sl 30(31),2-6 | Sl 129(130)",
+    "Sl 15(16)",
+    "Sl 87(88)",
+    "Sl 4 | Sl 133(134)",
+)
+
+# Seasonal replacements: (season, weekday, hour) -> {position: reference}
+_SEASONAL = {
+    # Domingos da Quaresma: cântico de 1Pd nas II Vésperas
+    ("Quaresma", 6, "vesperas"): {2: "1Pd 2,21-24"},
+}
+
+# Antiphon, response and first verse of every psalm and canticle above
+_TEXTS = {
+    # Laudes
+    "Sl 62(63),2-9": ("Ó Deus, sois vós o meu Deus; desde a aurora eu vos procuro.",
+                      "Minha alma tem sede de vós, ó Senhor.",
+                      "Ó Deus, vós sois o meu Deus, eu vos procuro, minha alma tem sede de vós."),
+    "Dn 3,57-88.56": ("Bendizei ao Senhor todas as suas obras, louvai-o e exaltai-o para sempre.",
+                      "A ele glória e louvor eternamente!",
+                      "Obras do Senhor, bendizei o Senhor, louvai-o e exaltai-o pelos séculos sem fim!"),
+    "Sl 149": ("Que os filhos de Sião exultem em seu Rei.",
+               "O Senhor ama o seu povo.",
+               "Cantai ao Senhor Deus um canto novo, e o seu louvor na assembleia dos fiéis!"),
+    "Sl 5,2-10.12-13": ("A vós eu dirijo a minha prece, Senhor; de manhã já me escutais.",
+                        "Senhor, escutai a minha voz.",
+                        "Escutai, ó Senhor Deus, minhas palavras, atendei o meu gemido!"),
+    "1Cr 29,10-13": ("Nós vos louvamos, ó nosso Deus, e celebramos vosso nome glorioso.",
+                     "Bendito sejais, Senhor, Deus de Israel!",
+                     "Bendito sejais vós, ó Senhor Deus, Senhor Deus de Israel, o nosso Pai, desde sempre e por toda a eternidade!"),
+    "Sl 28(29)": ("Adorai o Senhor no seu templo santo.",
+                  "O Senhor abençoa o seu povo com a paz.",
+                  "Filhos de Deus, tributai ao Senhor, tributai-lhe a glória e o poder!"),
+    "Sl 23(24)": ("Quem subirá até o monte do Senhor? Quem tem mãos puras e inocente coração.",
+                  "É assim a geração dos que procuram o Senhor.",
+                  "Ao Senhor pertence a terra e o que ela encerra, o mundo inteiro com os seres que o povoam."),
+    "Tb 13,2-8": ("Exaltai o Rei dos séculos em vossas obras.",
+                  "Bendito seja Deus, que vive eternamente!",
+                  "Bendito seja Deus, que vive eternamente, e bendito seja o seu reino!"),
+    "Sl 32(33)": ("Ao Senhor convém o louvor dos corações retos.",
+                  "Feliz o povo que o Senhor escolheu por sua herança.",
+                  "Ó justos, alegrai-vos no Senhor! Aos retos fica bem glorificá-lo."),
+    "Sl 35(36)": ("Senhor, em vossa luz veremos a luz.",
+                  "Em vós está a fonte da vida.",
+                  "O pecado sussurra ao ímpio lá no fundo do seu coração."),
+    "Jt 16,1-2.13-15": ("Senhor, vós sois grande e glorioso, admirável em poder e invencível.",
+                        "Cantarei ao meu Deus um canto novo.",
+                        "Entoai um canto ao meu Deus com tamborins, cantai ao Senhor com címbalos."),
+    "Sl 46(47)": ("Aclamai a Deus com brados de alegria.",
+                  "Deus é o Rei de toda a terra.",
+                  "Povos todos do universo, batei palmas, gritai a Deus aclamações de alegria!"),
+    "Sl 56(57)": ("Despertai, minha alma! Quero acordar a aurora.",
+                  "Elevai-vos, ó Deus, acima dos céus.",
+                  "Piedade, Senhor, tende piedade, pois em vós se abriga a minha alma!"),
+    "Jr 31,10-14": ("Meu povo será saciado de meus bens, diz o Senhor.",
+                    "O Senhor nos guardará qual pastor a seu rebanho.",
+                    "Ouvi, nações, a palavra do Senhor e anunciai-a nas ilhas mais distantes."),
+    "Sl 47(48)": ("Grande é o Senhor e muito digno de louvor na cidade do nosso Deus.",
+                  "Deus a sustenta para sempre.",
+                  "Grande é o Senhor e muito digno de louvores na cidade onde ele mora."),
+    "Sl 50(51)": ("Criai em mim um coração que seja puro, ó meu Deus.",
+                  "Tende piedade, ó meu Deus, misericórdia!",
+                  "Tende piedade, ó meu Deus, misericórdia! Na imensidão de vosso amor, purificai-me!"),
+    "Is 45,15-25": ("Em verdade sois um Deus escondido, ó Deus de Israel, Salvador.",
+                    "Diante de mim se dobrará todo joelho.",
+                    "Senhor Deus de Israel, verdadeiramente sois um Deus escondido, ó Salvador!"),
+    "Sl 99(100)": ("Entrai com alegria na presença do Senhor.",
+                   "Nós somos o seu povo e o rebanho que ele guia.",
+                   "Aclamai o Senhor, ó terra inteira, servi ao Senhor com alegria."),
+    "Sl 118(119),145-152": ("Antes da aurora venho a vós, Senhor, e em vossa palavra espero.",
+                            "Estais perto, ó Senhor, e vossos mandamentos são verdade.",
+                            "Clamo de todo o coração: Senhor, ouvi-me! Quero cumprir vossa vontade fielmente!"),
+    "Ex 15,1-4a.8-13.17-18": ("Cantemos ao Senhor que fez brilhar a sua glória.",
+                              "O Senhor é minha força e o meu canto.",
+                              "Ao Senhor quero cantar, pois fez brilhar a sua glória."),
+    "Sl 116(117)": ("Louvai o Senhor, todas as nações.",
+                    "Eterna é a fidelidade do Senhor.",
+                    "Cantai louvores ao Senhor, todas as gentes, povos todos, festejai-o!"),
+    "Sl 117(118)": ("Bendito o que vem em nome do Senhor.",
+                    "Este é o dia que o Senhor fez para nós.",
+                    "Dai graças ao Senhor, porque ele é bom! Eterna é a sua misericórdia!"),
+    "Dn 3,52-57": ("Bendito sejais, Senhor, no firmamento do céu.",
+                   "A vós louvor, honra e glória eternamente!",
+                   "Sede bendito, Senhor Deus de nossos pais."),
+    "Sl 150": ("Tudo quanto vive e respira louve o Senhor.",
+               "Louvai o Senhor em seu santuário.",
+               "Louvai o Senhor Deus no santuário, louvai-o no alto céu de seu poder!"),
+    "Sl 41(42)": ("Quando irei contemplar a face de Deus?",
+                  "A minha alma tem sede do Deus vivo.",
+                  "Assim como a corça suspira pelas águas correntes, suspira igualmente minh'alma por vós, ó meu Deus!"),
+    "Eclo 36,1-7.13-16": ("Mostrai-nos, Senhor, a luz de vossa misericórdia.",
+                          "Que as nações reconheçam que não há outro Deus além de vós.",
+                          "Tende piedade e compaixão, ó Senhor Deus do universo."),
+    "Sl 18(19),2-7": ("Os céus proclamam a glória de Deus.",
+                      "O firmamento anuncia a obra de suas mãos.",
+                      "Os céus proclamam a glória do Senhor, e o firmamento, a obra de suas mãos."),
+    "Sl 42(43)": ("Enviai vossa luz e vossa verdade: elas me guiarão.",
+                  "Irei ao altar de Deus, o Deus da minha alegria.",
+                  "Fazei justiça, ó meu Deus, e defendei-me contra a gente impiedosa."),
+    "Is 38,10-14.17-20": ("Salvai-nos, Senhor, todos os dias de nossa vida.",
+                          "Vós livrastes minha vida do abismo.",
+                          "Eu dizia: É necessário que eu me vá no apogeu de minha vida e de meus dias."),
+    "Sl 64(65)": ("A vós convém o louvor em Sião, ó Deus.",
+                  "Coroais o ano com vossa bondade.",
+                  "Ó Senhor, convém cantar vosso louvor com um hino em Sião!"),
+    "Sl 76(77)": ("Ó Deus, vosso caminho é santo! Que deus é tão grande como o nosso Deus?",
+                  "Recordo as maravilhas do Senhor.",
+                  "Quero clamar ao Senhor Deus em alta voz, em alta voz eu clamo a Deus: que ele me ouça!"),
+    "1Sm 2,1-10": ("Meu coração exulta no Senhor, que humilha e que exalta.",
+                   "O Senhor é quem dá a morte e a vida.",
+                   "Exulta no Senhor meu coração, e se eleva a minha fronte no meu Deus."),
+    "Sl 96(97)": ("O Senhor é Rei: exulte a terra de alegria.",
+                  "Uma luz já se levanta para os justos.",
+                  "Deus é Rei! Exulte a terra de alegria, e as ilhas numerosas rejubilem!"),
+    "Sl 79(80)": ("Despertai vosso poder, ó Senhor, e vinde salvar-nos.",
+                  "Iluminai a vossa face sobre nós.",
+                  "Ó Pastor de Israel, prestai ouvidos, vós que a José apascentais qual um rebanho!"),
+    "Is 12,1-6": ("Com alegria bebereis do manancial da salvação.",
+                  "O Senhor é minha força e meu louvor.",
+                  "Dou-vos graças, ó Senhor, porque, estando irritado, acalmou-se a vossa ira e enfim me consolastes."),
+    "Sl 80(81)": ("Exultai no Senhor, nossa força.",
+                  "Eu sou o Senhor teu Deus.",
+                  "Exultai no Senhor, nossa força, e ao Deus de Jacó aclamai!"),
+    "Hab 3,2-4.13a.15-19": ("Ainda que a figueira não floresça, eu me alegrarei no Senhor.",
+                            "Deus, o Senhor, é minha força.",
+                            "Eu ouvi vossa mensagem, ó Senhor, e enchi-me de temor."),
+    "Sl 147,12-20": ("Glorifica o Senhor, Jerusalém!",
+                     "Ele envia suas ordens para a terra.",
+                     "Glorifica o Senhor, Jerusalém! Ó Sião, canta louvores ao teu Deus!"),
+    "Sl 91(92)": ("É bom cantar ao vosso nome, ó Altíssimo.",
+                  "Anunciar pela manhã vossa bondade.",
+                  "Como é bom agradecermos ao Senhor e cantar salmos de louvor ao Deus Altíssimo!"),
+    "Dt 32,1-12": ("Dai glória à grandeza do nosso Deus.",
+                   "O Senhor guiou o seu povo.",
+                   "Ó céus, vinde, escutai; eu vou falar, ouça a terra as palavras de meus lábios!"),
+    "Sl 8": ("Ó Senhor nosso Deus, como é glorioso vosso nome em toda a terra!",
+             "Vós o fizestes pouco menor que os anjos.",
+             "Ó Senhor nosso Deus, como é grande vosso nome por todo o universo!"),
+    "Sl 92(93)": ("O Senhor reina, vestido de majestade.",
+                  "Vosso trono está firme desde sempre.",
+                  "Deus é Rei e se vestiu de majestade, revestiu-se de poder e de esplendor!"),
+    "Sl 148": ("Louvai o Senhor nos altos céus.",
+               "Só o seu nome é excelso.",
+               "Louvai o Senhor Deus nos altos céus, louvai-o no excelso firmamento!"),
+    "Sl 83(84)": ("Feliz quem habita em vossa casa, Senhor.",
+                  "Minha alma anseia pelos átrios do Senhor.",
+                  "Quão amável, ó Senhor, é vossa casa, quanto a amo, Senhor Deus do universo!"),
+    "Is 2,2-5": ("Vinde, subamos ao monte do Senhor.",
+                 "Caminhemos na luz do Senhor.",
+                 "Acontecerá, no fim dos tempos, que o monte da casa do Senhor estará firme no cume das montanhas."),
+    "Sl 95(96)": ("Cantai ao Senhor Deus um canto novo.",
+                  "Anunciai entre as nações a sua glória.",
+                  "Cantai ao Senhor Deus um canto novo, cantai ao Senhor Deus, ó terra inteira!"),
+    "Sl 84(85)": ("Mostrai-nos, ó Senhor, vossa bondade.",
+                  "Dai-nos a vossa salvação.",
+                  "Favorecestes, ó Senhor, a vossa terra, libertastes os cativos de Jacó."),
+    "Is 26,1-4.7-9.12": ("Minha alma vos deseja de noite, Senhor.",
+                         "Dai-nos a paz, Senhor.",
+                         "Nossa cidade invencível é Sião, sua muralha e sua trincheira é o Salvador."),
+    "Sl 66(67)": ("Que as nações vos glorifiquem, ó Senhor.",
+                  "Que todas as nações vos glorifiquem.",
+                  "Que Deus nos dê a sua graça e sua bênção, e sua face resplandeça sobre nós!"),
+    "Sl 85(86)": ("Alegrai a alma de vosso servo, Senhor.",
+                  "Vós sois bom e clemente, Senhor.",
+                  "Inclinai, ó Senhor, vosso ouvido, escutai, pois sou pobre e infeliz!"),
+    "Is 33,13-16": ("Feliz quem caminha na justiça e fala a verdade.",
+                    "Quem habitará com o fogo devorador?",
+                    "Vós que estais longe, escutai o que eu fiz! Vós que estais perto, conhecei o meu poder!"),
+    "Sl 97(98)": ("Aclamai o Senhor, nosso Rei.",
+                  "O Senhor fez conhecer a salvação.",
+                  "Cantai ao Senhor Deus um canto novo, porque ele fez prodígios!"),
+    "Sl 86(87)": ("Coisas gloriosas se dizem de ti, cidade de Deus.",
+                  "Em ti estão todas as nossas fontes.",
+                  "O Senhor ama a cidade que fundou no Monte santo."),
+    "Is 40,10-17": ("O Senhor vem com poder; como pastor apascenta o seu rebanho.",
+                    "Eis o vosso Deus!",
+                    "Olhai e vede: o nosso Deus vem com poder, dominará todas as coisas com seu braço."),
+    "Sl 98(99)": ("Exaltai o Senhor nosso Deus e prostrai-vos ante o escabelo dos seus pés.",
+                  "Santo é o Senhor nosso Deus.",
+                  "Deus é Rei: diante dele estremecem os povos!"),
+    "Jr 14,17-21": ("Reconhecemos, Senhor, nossa maldade; não nos rejeiteis.",
+                    "Lembrai-vos, Senhor, de vossa aliança.",
+                    "Os meus olhos, noite e dia, chorem lágrimas sem fim."),
+    "Sb 9,1-6.9-11": ("Dai-me, Senhor, a sabedoria que está junto de vós.",
+                      "Enviai-a do alto dos céus.",
+                      "Deus de meus pais, Senhor de bondade, que por vossa palavra criastes o universo."),
+    "Sl 89(90)": ("Saciai-nos de manhã com vosso amor, Senhor.",
+                  "Vós fostes um refúgio para nós.",
+                  "Vós fostes um refúgio para nós, ó Senhor, de geração em geração."),
+    "Is 42,10-16": ("Cantai ao Senhor um canto novo; seu louvor até os confins da terra.",
+                    "O Senhor sai como herói.",
+                    "Cantai ao Senhor Deus um canto novo, louvai o seu nome até os confins da terra!"),
+    "Sl 134(135),1-12": ("Louvai o nome do Senhor, vós, servos do Senhor.",
+                         "O Senhor é bom.",
+                         "Louvai o Senhor, bendizei-o; louvai o Senhor, servos seus."),
+    "Sl 100(101)": ("Cantarei a bondade e a justiça, Senhor.",
+                    "Andarei com reto coração.",
+                    "Eu quero cantar o amor e a justiça, cantar os meus hinos a vós, ó Senhor!"),
+    "Dn 3,26.27.29.34-41": ("Não nos abandoneis para sempre, Senhor, por amor do vosso nome.",
+                            "Acolhei-nos com o coração contrito.",
+                            "Sede bendito, Senhor Deus de nossos pais, louvável e glorioso é vosso nome para sempre!"),
+    "Sl 143(144),1-10": ("Ó Deus, vou cantar-vos um canto novo.",
+                         "Bendito seja o Senhor, meu rochedo.",
+                         "Bendito seja o Senhor, meu rochedo, que adestrou minhas mãos para a luta."),
+    "Sl 107(108)": ("Elevai-vos, ó Deus, acima dos céus.",
+                    "Vossa bondade é maior que os céus.",
+                    "Meu coração está pronto, meu Deus, está pronto o meu coração!"),
+    "Is 61,10-62,5": ("Eu exulto de alegria no Senhor, e minha alma rejubila no meu Deus.",
+                      "Como a noiva é a alegria do esposo, serás a alegria do teu Deus.",
+                      "Eu exulto de alegria no Senhor, e minha alma rejubila no meu Deus."),
+    "Sl 145(146)": ("Louvarei o Senhor por toda a minha vida.",
+                    "O Senhor reinará eternamente.",
+                    "Bendize, minha alma, ao Senhor! Bendirei ao Senhor toda a vida."),
+    "Sl 142(143),1-11": ("Fazei-me ouvir pela manhã vossa bondade, Senhor.",
+                         "Ensinai-me a fazer vossa vontade.",
+                         "Ó Senhor, escutai minha prece, ó meu Deus, atendei minha súplica!"),
+    "Is 66,10-14a": ("Como uma mãe consola o seu filho, assim eu vos consolarei.",
+                     "Alegrai-vos com Jerusalém.",
+                     "Alegrai-vos com Jerusalém, exultai por ela, vós todos que a amais."),
+    "Sl 146(147),1-11": ("Louvai o Senhor, porque é bom cantar ao nosso Deus.",
+                         "O Senhor cura os corações despedaçados.",
+                         "Louvai o Senhor Deus, porque ele é bom, cantai ao nosso Deus, porque é suave!"),
+    "Tb 13,8-11.13-15": ("Alegra-te, Jerusalém, por causa dos filhos dos justos.",
+                         "Bendito seja o Senhor, o Rei dos séculos.",
+                         "Bendizei o Senhor, vós todos, seus eleitos, e celebrai dias de festa."),
+    "Ez 36,24-28": ("Derramarei sobre vós uma água pura.",
+                    "Dar-vos-ei um coração novo.",
+                    "Eu vos tirarei do meio das nações e vos reunirei de todos os países."),
+    # Vésperas
+    "Sl 109(110),1-5.7": ("Disse o Senhor ao meu Senhor: Senta-te à minha direita.",
+                          "Tu és sacerdote eternamente.",
+                          "Palavra do Senhor ao meu Senhor: Assenta-te ao lado meu direito."),
+    "Sl 113(114)": ("Tremei, ó terra, diante da face do Senhor.",
+                    "Quando Israel saiu do Egito.",
+                    "Quando o povo de Israel saiu do Egito, e os filhos de Jacó, de um povo estranho."),
+    "Ap 19,1-7": ("Aleluia! O Senhor, nosso Deus, Todo-poderoso, passou a reinar.",
+                  "Aleluia, aleluia!",
+                  "A salvação, a glória e o poder pertencem ao nosso Deus."),
+    "Sl 10(11)": ("O Senhor olha o pobre com amor.",
+                  "No Senhor eu me refugio.",
+                  "No Senhor encontrei o meu abrigo; como, então, podeis dizer à minha alma: Foge, qual pássaro, ao teu monte!"),
+    "Sl 14(15)": ("Felizes os puros de coração, porque verão a Deus.",
+                  "Senhor, quem morará em vossa casa?",
+                  "Senhor, quem morará em vossa casa e em vosso Monte santo habitará?"),
+    "Ef 1,3-10": ("Deus nos escolheu em Cristo antes da criação do mundo.",
+                  "Bendito seja Deus, Pai de Nosso Senhor Jesus Cristo.",
+                  "Bendito e louvado seja Deus, o Pai de Jesus Cristo, nosso Senhor."),
+    "Sl 19(20)": ("O Senhor nos dê a vitória por seu nome.",
+                  "Que o Senhor te atenda no dia da aflição.",
+                  "Que o Senhor te escute no dia da aflição, e o nome do Deus de Jacó te proteja!"),
+    "Sl 20(21),2-8.14": ("Cantaremos e louvaremos o vosso poder, Senhor.",
+                         "O rei se alegra em vossa força.",
+                         "Ó Senhor, em vossa força o rei se alegra; quanto exulta de alegria em vosso auxílio!"),
+    "Ap 4,11; 5,9.10.12": ("Sois digno, Senhor nosso Deus, de receber a honra, a glória e o poder.",
+                           "O Cordeiro imolado é digno de receber o poder.",
+                           "Vós sois digno, Senhor nosso Deus, de receber honra, glória e poder!"),
+    "Sl 26(27),1-6": ("O Senhor é minha luz e salvação.",
+                      "De quem eu terei medo?",
+                      "O Senhor é minha luz e salvação; de quem eu terei medo?"),
+    "Sl 26(27),7-14": ("Vossa face, Senhor, eu procuro.",
+                       "Espera no Senhor e tem coragem.",
+                       "Ó Senhor, ouvi a voz do meu apelo, atendei por compaixão!"),
+    "Cl 1,12-20": ("Nele foram criadas todas as coisas, e nele tudo subsiste.",
+                   "Ele é o primogênito de toda criatura.",
+                   "Demos graças a Deus Pai onipotente, que nos chama a partilhar, na sua luz, da herança a seus santos reservada!"),
+    "Sl 29(30)": ("Eu vos exalto, ó Senhor, porque vós me livrastes.",
+                  "Transformastes o meu pranto em uma festa.",
+                  "Eu vos exalto, ó Senhor, pois me livrastes, e não deixastes rir de mim meus inimigos!"),
+    "Sl 31(32)": ("Feliz o homem a quem o Senhor não imputa culpa.",
+                  "Perdoastes, Senhor, a minha culpa.",
+                  "Feliz o homem que foi perdoado e cuja falta já foi encoberta!"),
+    "Ap 11,17-18; 12,10b-12a": ("Agora se cumpriu a salvação e o reino do nosso Deus.",
+                                "Graças vos damos, Senhor Deus Todo-poderoso.",
+                                "Graças vos damos, Senhor Deus onipotente, a vós que sois, a vós que éreis e sereis."),
+    "Sl 40(41)": ("Curai-me, Senhor, porque pequei contra vós.",
+                  "Feliz quem pensa no pobre e no fraco.",
+                  "Feliz de quem pensa no pobre e no fraco: o Senhor o liberta no dia do mal!"),
+    "Sl 45(46)": ("O Senhor do universo está conosco.",
+                  "O nosso refúgio é o Deus de Jacó.",
+                  "O Senhor para nós é refúgio e vigor, sempre pronto, mostrou-se um socorro na angústia."),
+    "Ap 15,3-4": ("Todas as nações virão prostrar-se diante de vós, Senhor.",
+                  "Grandes e admiráveis são vossas obras.",
+                  "Como são grandes e admiráveis vossas obras, ó Senhor e nosso Deus onipotente!"),
+    "Sl 118(119),105-112": ("Vossa palavra é uma luz para os meus passos.",
+                            "É uma luz em meu caminho.",
+                            "Vossa palavra é uma luz para os meus passos, é uma lâmpada luzente em meu caminho."),
+    "Sl 15(16)": ("Guardai-me, ó Deus, porque em vós me refugio.",
+                  "Vós me ensinais o caminho para a vida.",
+                  "Guardai-me, ó Deus, porque em vós me refugio! Digo ao Senhor: Somente vós sois meu Senhor."),
+    "Fl 2,6-11": ("O Senhor Jesus humilhou-se a si mesmo; por isso Deus o exaltou.",
+                  "Jesus Cristo é o Senhor, para a glória de Deus Pai.",
+                  "Embora fosse de divina condição, Cristo Jesus não se apegou ciosamente a ser igual em natureza a Deus Pai."),
+    "Sl 113(115)": ("Nosso Deus está nos céus e faz tudo o que quer.",
+                    "Não a nós, Senhor, mas ao vosso nome dai glória.",
+                    "Não a nós, ó Senhor, não a nós, ao vosso nome, porém, seja a glória."),
+    "Sl 44(45),2-10": ("Sois o mais belo dos filhos dos homens.",
+                       "A graça se derramou em vossos lábios.",
+                       "Transborda um poema do meu coração; vou cantar-vos, ó Rei, esta minha canção."),
+    "Sl 44(45),11-18": ("Eis que vem o Esposo: ide ao seu encontro.",
+                        "O Rei se encantou com a vossa beleza.",
+                        "Escutai, minha filha, olhai, ouvi isto: esquecei vosso povo e a casa paterna!"),
+    "Sl 48(49),1-13": ("Não podeis servir a Deus e ao dinheiro.",
+                       "O homem no seu luxo não pode permanecer.",
+                       "Ouvi isto, povos todos do universo, prestai ouvidos, habitantes deste mundo."),
+    "Sl 48(49),14-21": ("Ajuntai tesouros no céu, diz o Senhor.",
+                        "Deus resgatará a minha vida.",
+                        "Eis o fim dos que confiam em si mesmos e o destino dos que amam seus prazeres."),
+    "Sl 61(62)": ("Só em Deus a minha alma tem repouso.",
+                  "Só ele é meu rochedo e salvação.",
+                  "Só em Deus a minha alma tem repouso, porque dele é que me vem a salvação!"),
+    "Sl 71(72),1-11": ("O Rei da paz estenderá o seu domínio de um mar a outro mar.",
+                       "Todos os reis de toda a terra hão de adorá-lo.",
+                       "Dai ao Rei vossos poderes, Senhor Deus, vossa justiça ao descendente da realeza!"),
+    "Sl 71(72),12-19": ("Libertará o indigente que suplica.",
+                        "Nele serão abençoadas todas as nações.",
+                        "Libertará o indigente que suplica, e o pobre ao qual ninguém quer ajudar."),
+    "Sl 114(116),1-9": ("O Senhor livrou a minha alma da morte.",
+                        "Andarei na presença de Deus.",
+                        "Eu amo o Senhor, porque ouve o grito da minha oração."),
+    "Sl 120(121)": ("O nosso auxílio vem do Senhor, que fez o céu e a terra.",
+                    "O Senhor é o teu guarda.",
+                    "Eu levanto os meus olhos para os montes: de onde pode vir o meu socorro?"),
+    "Sl 112(113)": ("Bendito seja o nome do Senhor, agora e para sempre.",
+                    "Louvai, servos do Senhor.",
+                    "Louvai, louvai, ó servos do Senhor, louvai, louvai o nome do Senhor!"),
+    "Sl 115(116),10-19": ("Elevo o cálice da minha salvação, invocando o nome do Senhor.",
+                          "Que poderei retribuir ao Senhor Deus?",
+                          "Guardei a minha fé, mesmo dizendo: É demais o sofrimento em minha vida!"),
+    "Sl 110(111)": ("O Senhor é clemente e compassivo.",
+                    "Grandes são as obras do Senhor.",
+                    "Eu agradeço a Deus de todo o coração junto com todos os seus justos reunidos!"),
+    "Sl 122(123)": ("Os nossos olhos estão fitos no Senhor, até que tenha piedade de nós.",
+                    "Tende piedade, Senhor, de nós.",
+                    "Eu levanto os meus olhos para vós, que habitais nos altos céus."),
+    "Sl 123(124)": ("O nosso auxílio está no nome do Senhor.",
+                    "Se o Senhor não estivesse ao nosso lado.",
+                    "Se o Senhor não estivesse ao nosso lado, que o diga Israel neste momento."),
+    "Sl 124(125)": ("O Senhor protege o seu povo agora e para sempre.",
+                    "Quem confia no Senhor é como o monte de Sião.",
+                    "Quem confia no Senhor é como o monte de Sião: nada o pode abalar."),
+    "Sl 130(131)": ("Se não vos tornardes como crianças, não entrareis no Reino dos Céus.",
+                    "Guardai em paz a minha alma, Senhor.",
+                    "Senhor, meu coração não é orgulhoso, nem se eleva arrogante o meu olhar."),
+    "Sl 125(126)": ("Os que semeiam entre lágrimas colherão com alegria.",
+                    "Maravilhas fez conosco o Senhor.",
+                    "Quando o Senhor reconduziu nossos cativos, parecíamos sonhar."),
+    "Sl 126(127)": ("Se o Senhor não construir a casa, em vão trabalham os construtores.",
+                    "O Senhor dá o pão aos seus amados.",
+                    "Se o Senhor não construir a nossa casa, em vão trabalharão seus construtores."),
+    "Sl 131(132),1-10": ("Levantai-vos, Senhor, e entrai no lugar do vosso repouso.",
+                         "Lembrai-vos, Senhor, de Davi.",
+                         "Recordai-vos, ó Senhor, do rei Davi e de quanto vos foi ele dedicado."),
+    "Sl 131(132),11-18": ("O Senhor escolheu Sião para sua morada.",
+                          "Aqui é o meu repouso para sempre.",
+                          "O Senhor fez a Davi um juramento, uma promessa que jamais renegará."),
+    "Sl 134(135),13-21": ("Casa de Israel, bendizei o Senhor.",
+                          "O vosso nome, Senhor, é para sempre.",
+                          "Ó Senhor, vosso nome é para sempre! Vossa memória, de geração em geração!"),
+    "Sl 121(122)": ("Que alegria quando me disseram: Vamos à casa do Senhor!",
+                    "Pedi a paz para Jerusalém.",
+                    "Que alegria quando ouvi que me disseram: Vamos à casa do Senhor!"),
+    "Sl 129(130)": ("Das profundezas eu clamo a vós, Senhor.",
+                    "No Senhor está a misericórdia.",
+                    "Das profundezas eu clamo a vós, Senhor, escutai a minha voz!"),
+    "Sl 111(112)": ("Feliz o homem que respeita o Senhor e ama com carinho a sua lei.",
+                    "O justo viverá eternamente.",
+                    "Feliz o homem que respeita o Senhor e que ama com carinho a sua lei!"),
+    "Sl 135(136),1-9": ("Dai graças ao Senhor, porque ele é bom.",
+                        "Porque eterno é seu amor!",
+                        "Demos graças ao Senhor, porque ele é bom: porque eterno é seu amor!"),
+    "Sl 135(136),10-26": ("Dai graças ao Deus dos céus.",
+                          "Porque eterno é seu amor!",
+                          "Ele feriu os primogênitos do Egito: porque eterno é seu amor!"),
+    "Sl 136(137),1-6": ("Como cantar o canto do Senhor numa terra estrangeira?",
+                        "Que se prenda a minha língua, se de ti não me lembrar!",
+                        "Junto aos rios da Babilônia nos sentávamos chorando, com saudades de Sião."),
+    "Sl 137(138)": ("Na presença dos anjos eu vos canto, Senhor.",
+                    "Vosso amor é para sempre.",
+                    "Ó Senhor, de coração eu vos dou graças, porque ouvistes as palavras dos meus lábios!"),
+    "Sl 138(139),1-12": ("Senhor, vós me sondais e conheceis.",
+                         "Onde irei longe de vosso Espírito?",
+                         "Senhor, vós me sondais e conheceis, sabeis quando me sento ou me levanto."),
+    "Sl 138(139),13-18.23-24": ("Eu vos louvo, Senhor, porque me fizestes maravilhosamente.",
+                                "Conduzi-me pelo caminho eterno.",
+                                "Fostes vós que me formastes as entranhas, e no seio de minha mãe vós me tecestes."),
+    "Sl 143(144),1-8": ("Sois meu amor e meu refúgio, Senhor; em vós confio.",
+                        "Bendito seja o Senhor, meu rochedo.",
+                        "Bendito seja o Senhor, meu rochedo, que adestrou minhas mãos para a luta."),
+    "Sl 143(144),9-15": ("Feliz o povo cujo Deus é o Senhor.",
+                         "Vou cantar-vos um canto novo, ó meu Deus.",
+                         "Um canto novo, meu Deus, vou cantar-vos, nas dez cordas da harpa louvar-vos."),
+    "Sl 144(145),1-13": ("Bendirei o vosso nome pelos séculos, Senhor.",
+                         "O Senhor é clemente e compassivo.",
+                         "Ó meu Deus, quero exaltar-vos, ó meu Rei, e bendizer o vosso nome pelos séculos."),
+    "Sl 144(145),14-21": ("Os olhos de todos esperam em vós, Senhor.",
+                          "O Senhor está perto de quem o invoca.",
+                          "O Senhor sustenta todo aquele que vacila e levanta todo aquele que tombou."),
+    "Sl 140(141),1-9": ("Suba minha oração como incenso à vossa presença.",
+                        "Senhor, eu clamo por vós: socorrei-me!",
+                        "Senhor, eu clamo por vós, socorrei-me; quando eu grito, escutai minha voz!"),
+    "Sl 141(142)": ("Vós sois o meu refúgio, Senhor, minha herança na terra dos vivos.",
+                    "Com minha voz clamo ao Senhor.",
+                    "Em voz alta ao Senhor eu imploro, em voz alta suplico ao Senhor."),
+    "1Pd 2,21-24": ("Cristo sofreu por nós, deixando-nos o exemplo.",
+                    "Por suas chagas fomos curados.",
+                    "O Cristo por nós padeceu, deixou-nos o exemplo a seguir."),
+    # Completas
+    "Sl 90(91)": ("À sombra de vossas asas, Senhor, protegei-nos.",
+                  "Habita à sombra do Onipotente.",
+                  "Quem habita ao abrigo do Altíssimo e vive à sombra do Senhor onipotente."),
+    "Sl 30(31),2-6": ("Sede para mim, Senhor, a rocha do refúgio.",
+                      "Em vossas mãos, Senhor, entrego o meu espírito.",
+                      "Senhor, eu ponho em vós minha esperança; que eu não fique envergonhado eternamente!"),
+    "Sl 87(88)": ("Chegue até vós minha prece, Senhor, de dia e de noite.",
+                  "A vós clamo, Senhor, sem cessar.",
+                  "A vós clamo, Senhor, sem cessar, todo o dia, e de noite se eleva até vós meu gemido."),
+    "Sl 4": ("Tende piedade de mim, Senhor, e escutai a minha prece.",
+             "Em paz me deito e logo adormeço.",
+             "Quando eu chamo, respondei-me, ó meu Deus, minha justiça!"),
+    "Sl 133(134)": ("Bendizei o Senhor durante a noite.",
+                    "Erguei as mãos para o santuário.",
+                    "Vinde, agora, bendizei ao Senhor Deus, vós todos, servidores do Senhor."),
+}
+
+# Solemnities and feasts take the Laudes psalmody of Sunday, week I
+_FESTIVE = {
+    "laudes": (1, 6),
+}
+
+# Final antiphon to Our Lady at Completas, by season
+MARIAN_ANTIPHONS = {
+    "Advento": "Ó santa Mãe do Redentor, porta do céu, estrela do mar, socorrei o povo "
+               "que caiu e procura levantar-se. Vós que, para espanto da natureza, gerastes "
+               "o vosso santo Criador, permanecendo Virgem antes e depois, acolhei a "
+               "saudação do anjo Gabriel e tende piedade de nós, pecadores.",
+    "Quaresma": "Ave, Rainha do céu; ave, dos anjos Senhora; ave, raiz, ave, porta, "
+                "da luz do mundo és aurora. Exulta, ó Virgem tão bela, as outras seguem-te "
+                "após; nós te saudamos: adeus! E pede a Cristo por nós!",
+    "Tempo Pascal": "Rainha do céu, alegrai-vos, aleluia! Pois o Senhor que merecestes "
+                    "trazer em vosso seio, aleluia, ressuscitou como disse, aleluia! "
+                    "Rogai a Deus por nós, aleluia!",
+    "Tempo Comum": "Salve, Rainha, Mãe de misericórdia, vida, doçura, esperança nossa, "
+                   "salve! A vós bradamos, os degredados filhos de Eva; a vós suspiramos, "
+                   "gemendo e chorando neste vale de lágrimas. Eia, pois, advogada nossa, "
+                   "esses vossos olhos misericordiosos a nós volvei; e, depois deste "
+                   "desterro, mostrai-nos Jesus, bendito fruto do vosso ventre, ó clemente, "
+                   "ó piedosa, ó doce sempre Virgem Maria.",
+}
+MARIAN_ANTIPHONS["Tempo do Natal"] = MARIAN_ANTIPHONS["Advento"]
+MARIAN_ANTIPHONS["Tríduo Pascal"] = MARIAN_ANTIPHONS["Quaresma"]
+
+PsalterKey = Tuple[int, int, str]
+
+
+def _psalm(reference: str) -> Psalm:
+    """Psalm (or canticle, number 0) of a reference, with its response and first verse"""
+    _, response, verse = _TEXTS[reference]
+    return Psalm(number=psalm_number(reference) or 0, reference=reference,
+                 response=response, verses=[verse])
+
+
+def _psalmody(spec: str) -> Tuple[Psalm, ...]:
+    return tuple(_psalm(reference.strip()) for reference in spec.split("|"))
+
+
+def _weekday(sunday_first_index: int) -> int:
+    return (sunday_first_index - 1) % 7
+
+
+def _build() -> Dict[PsalterKey, Tuple[Psalm, ...]]:
+    index: Dict[PsalterKey, Tuple[Psalm, ...]] = {}
+    for hour, table in (("laudes", _LAUDES), ("vesperas", _VESPERAS)):
+        for week, days in table.items():
+            for i, spec in enumerate(days):
+                index[(week, _weekday(i), hour)] = _psalmody(spec)
+    for i, spec in enumerate(_COMPLETAS):
+        psalms = _psalmody(spec)
+        for week in range(1, 5):
+            index[(week, _weekday(i), "completas")] = psalms
+    return index
+
+
+def _build_seasonal(index: Mapping[PsalterKey, Tuple[Psalm, ...]]) -> Dict[Tuple, Tuple[Psalm, ...]]:
+    seasonal: Dict[Tuple, Tuple[Psalm, ...]] = {}
+    for (season, weekday, hour), replacements in _SEASONAL.items():
+        for week in range(1, 5):
+            psalms = list(index[(week, weekday, hour)])
+            for position, reference in replacements.items():
+                psalms[position] = _psalm(reference)
+            seasonal[(season, week, weekday, hour)] = tuple(psalms)
+    return seasonal
+
+
+# Precomputed once; entries are shared and must not be modified
+PSALTER: Mapping[PsalterKey, Tuple[Psalm, ...]] = MappingProxyType(_build())
+SEASONAL_PSALTER: Mapping[Tuple, Tuple[Psalm, ...]] = MappingProxyType(_build_seasonal(PSALTER))
+
+
+def get_psalmody(week: int, weekday: int, hour: str, season: str = "",
+                 festive: bool = False) -> Optional[Tuple[Psalm, ...]]:
+    """
+    Psalms and canticles of an hour, or None if the psalter does not cover it
+
+    Args:
+        week: Psalter week (1-4)
+        weekday: date.weekday() of the day
+        hour: Hour key (laudes, vesperas, completas, ...)
+        season: Liturgical season name, for seasonal replacements
+        festive: True for solemnities and feasts
+    """
+    if festive and hour in _FESTIVE:
+        week, weekday = _FESTIVE[hour]
+    return SEASONAL_PSALTER.get((season, week, weekday, hour)) or PSALTER.get((week, weekday, hour))
+
+
+def psalm_antiphon(psalm: Psalm) -> str:
+    """Antiphon of a psalm or canticle of the psalter"""
+    return _TEXTS[psalm.reference][0]
+
+
+def marian_antiphon(season: str) -> Prayer:
+    """Final antiphon to Our Lady for Completas in a season"""
+    return Prayer(title="Antífona de Nossa Senhora",
+                  text=MARIAN_ANTIPHONS.get(season, MARIAN_ANTIPHONS["Tempo Comum"]))
@@ -0,0 +1,641 @@
+"""
+Repository layer mapping the SQLAlchemy tables to the liturgy dataclasses
+"""
+
+import logging
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, delete, func, insert, inspect, or_, select, text, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import contains_eager, joinedload, load_only
+
+from . import base
+from .bible import try_parse_reference
+from .cache import invalidate_kind
+from .custom_mass import CustomMass
+from .daily_liturgy import DailyLiturgy
+from .liturgy_hours import Hour, iter_hour_rows
+from .db_models import (
+    db, DailyLiturgy as DailyLiturgyRow, Celebration as CelebrationRow,
+    CustomMass as CustomMassRow, LiturgyHour as LiturgyHourRow, Reading as ReadingRow
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _reading(row) -> Optional[base.Reading]:
+    if row is None:
+        return None
+    return base.Reading(
+        reference=row.reference,
+        text=row.text or "",
+        book=row.book or "",
+        chapter=row.chapter or 0,
+        verses=row.verses or ""
+    )
+
+
+def _psalm(row) -> Optional[base.Psalm]:
+    if row is None:
+        return None
+    return base.Psalm(
+        number=row.number,
+        reference=row.reference,
+        response=row.response or "",
+        verses=[line for line in (row.verses or "").splitlines() if line.strip()]
+    )
+
+
+def _prayer(row) -> Optional[base.Prayer]:
+    if row is None:
+        return None
+    return base.Prayer(title=row.title, text=row.text, response=row.response or "")
+
+
+def to_daily_liturgy(row: DailyLiturgyRow) -> DailyLiturgy:
+    """Convert a fully loaded DailyLiturgy row to the DailyLiturgy dataclass"""
+    cel = row.celebration
+    celebration = base.Celebration(
+        name=cel.name,
+        date=cel.date,
+        type=cel.type,
+        color=base.LiturgicalColor(cel.color.name, cel.color.meaning or "") if cel.color
+        else base.LiturgicalColor("verde"),
+        season=cel.season
+    )
+    return DailyLiturgy(
+        celebration=celebration,
+        first_reading=_reading(row.first_reading),
+        psalm=_psalm(row.psalm),
+        second_reading=_reading(row.second_reading),
+        gospel=_reading(row.gospel),
+        collect_prayer=_prayer(row.collect_prayer),
+        offertory_prayer=_prayer(row.offertory_prayer),
+        communion_prayer=_prayer(row.communion_prayer),
+        updated_at=row.updated_at
+    )
+
+
+class LiturgyRepository:
+    """
+    Reads daily liturgies from the database.
+
+    Every relationship of DailyLiturgy is eager-loaded with JOINs, so a date
+    costs a single round trip instead of one lazy load per relationship.
+    """
+
+    @staticmethod
+    def _query():
+        return (
+            db.session.query(DailyLiturgyRow)
+            .join(DailyLiturgyRow.celebration)
+            .options(
+                contains_eager(DailyLiturgyRow.celebration).joinedload(CelebrationRow.color),
+                joinedload(DailyLiturgyRow.first_reading),
+                joinedload(DailyLiturgyRow.psalm),
+                joinedload(DailyLiturgyRow.second_reading),
+                joinedload(DailyLiturgyRow.gospel),
+                joinedload(DailyLiturgyRow.collect_prayer),
+                joinedload(DailyLiturgyRow.offertory_prayer),
+                joinedload(DailyLiturgyRow.communion_prayer),
+            )
+        )
+
+    def get_row(self, liturgy_date: date) -> Optional[DailyLiturgyRow]:
+        """Get the DailyLiturgy row for a date (uses the celebrations.date index)"""
+        return (
+            self._query()
+            .filter(CelebrationRow.date == liturgy_date)
+            .order_by(DailyLiturgyRow.id)
+            .first()
+        )
+
+    def get_for_date(self, liturgy_date: date) -> Optional[DailyLiturgy]:
+        """
+        Get the liturgy stored for a date
+
+        Returns None when the date has no stored liturgy or the database is
+        unavailable, so callers can fall back to the computed calendar.
+        """
+        try:
+            row = self.get_row(liturgy_date)
+        except SQLAlchemyError as e:
+            logger.warning("Falha ao consultar liturgia de %s: %s", liturgy_date, getattr(e, "orig", e))
+            db.session.rollback()
+            return None
+        return to_daily_liturgy(row) if row is not None else None
+
+    def get_range(self, start: date, end: date) -> Dict[date, DailyLiturgy]:
+        """
+        Get every stored liturgy between two dates (inclusive) in one query
+
+        Returns a mapping of date to DailyLiturgy; dates without stored
+        content are absent. An unavailable database yields an empty mapping.
+        """
+        try:
+            rows = (
+                self._query()
+                .filter(CelebrationRow.date.between(start, end))
+                .order_by(CelebrationRow.date, DailyLiturgyRow.id)
+                .all()
+            )
+        except SQLAlchemyError as e:
+            logger.warning("Falha ao consultar liturgias de %s a %s: %s", start, end, getattr(e, "orig", e))
+            db.session.rollback()
+            return {}
+
+        result: Dict[date, DailyLiturgy] = {}
+        for row in rows:
+            # First liturgy of the day wins, as in get_row
+            if row.celebration.date not in result:
+                result[row.celebration.date] = to_daily_liturgy(row)
+        return result
+
+
+def reading_index_values(reference: str) -> Dict:
+    """
+    Normalized readings columns of a reference
+
+    Returns book_code, book, chapter, end_chapter and verses, or an empty
+    dict when the reference does not parse.
+    """
+    parsed = try_parse_reference(reference)
+    if parsed is None:
+        return {}
+    return {
+        'book_code': parsed.book,
+        'book': parsed.book_name,
+        'chapter': parsed.chapter,
+        'end_chapter': parsed.end_chapter,
+        'verses': parsed.verses,
+    }
+
+
+class ReadingRepository:
+    """
+    Finds readings through the (book_code, chapter, end_chapter) index.
+
+    A reading matches a chapter when the chapter lies between its first
+    and last chapter, so "Mt 2" also finds "Mt 1,18-2,12".
+    """
+
+    @staticmethod
+    def _matching(book: str, chapter: Optional[int]):
+        query = select(ReadingRow.id).where(ReadingRow.book_code == book)
+        if chapter is not None:
+            query = query.where(ReadingRow.chapter <= chapter, ReadingRow.end_chapter >= chapter)
+        return query
+
+    def find(self, book: str, chapter: Optional[int] = None) -> List[base.Reading]:
+        """Readings of a book (and chapter)"""
+        try:
+            rows = (
+                db.session.query(ReadingRow)
+                .filter(ReadingRow.id.in_(self._matching(book, chapter)))
+                .order_by(ReadingRow.chapter, ReadingRow.reference)
+                .all()
+            )
+        except SQLAlchemyError as e:
+            logger.warning("Falha ao consultar leituras de %s %s: %s", book, chapter, getattr(e, "orig", e))
+            db.session.rollback()
+            return []
+        return [_reading(row) for row in rows]
+
+    def dates_reading(self, book: str, chapter: Optional[int] = None) -> List[date]:
+        """Dates whose stored liturgy reads from a book (and chapter)"""
+        ids = self._matching(book, chapter)
+        try:
+            return list(db.session.execute(
+                select(CelebrationRow.date)
+                .join(DailyLiturgyRow, DailyLiturgyRow.celebration_id == CelebrationRow.id)
+                .where(or_(
+                    DailyLiturgyRow.first_reading_id.in_(ids),
+                    DailyLiturgyRow.second_reading_id.in_(ids),
+                    DailyLiturgyRow.gospel_id.in_(ids),
+                ))
+                .distinct()
+                .order_by(CelebrationRow.date)
+            ).scalars())
+        except SQLAlchemyError as e:
+            logger.warning("Falha ao consultar datas de %s %s: %s", book, chapter, getattr(e, "orig", e))
+            db.session.rollback()
+            return []
+
+    def reindex(self, only_missing: bool = True, batch_size: int = 1000) -> int:
+        """
+        Fill the normalized columns from each reference
+
+        With only_missing, rows already indexed are skipped. Returns the
+        number of rows updated; references that do not parse are left as
+        they are.
+        """
+        query = select(ReadingRow.id, ReadingRow.reference)
+        if only_missing:
+            query = query.where(ReadingRow.book_code.is_(None))
+        count = 0
+        try:
+            rows = db.session.execute(query).all()
+            for start in range(0, len(rows), batch_size):
+                updates = []
+                for reading_id, reference in rows[start:start + batch_size]:
+                    values = reading_index_values(reference)
+                    if values:
+                        updates.append({'id': reading_id, **values})
+                if updates:
+                    db.session.execute(update(ReadingRow), updates)
+                    count += len(updates)
+            db.session.commit()
+        except SQLAlchemyError:
+            db.session.rollback()
+            raise
+        return count
+
+
+# Parts of CustomMass.to_dict() kept in their own custom_masses columns
+_READING_PARTS = ('first_reading', 'psalm', 'second_reading', 'gospel')
+_ANTIPHON_PARTS = ('entrance_antiphon', 'communion_antiphon')
+
+
+def custom_mass_values(mass: CustomMass, name: str) -> Dict:
+    """
+    Column values of a custom_masses row for a CustomMass
+
+    Only the differences from the default structure are stored: readings
+    and antiphons in their columns, every other changed or added part (and
+    the celebration type and season) in custom_prayers.
+    """
+    data = mass.to_dict()
+    parts = data['parts']
+    celebration = data['celebration'] or {}
+    values = {
+        'name': name,
+        'celebration_name': celebration.get('name'),
+        'celebration_date': date.fromisoformat(celebration['date']) if celebration else None,
+        'celebration_color': celebration.get('color'),
+        'readings': {key: parts.pop(key) for key in _READING_PARTS if key in parts} or None,
+    }
+    for key in _ANTIPHON_PARTS:
+        # A retitled antiphon ([title, content]) stays in custom_prayers
+        values[key] = parts.pop(key) if isinstance(parts.get(key), str) else None
+
+    custom = {}
+    if celebration:
+        custom['celebration'] = {'type': celebration['type'], 'season': celebration['season']}
+    if parts:
+        custom['parts'] = parts
+    if data['added']:
+        custom['added'] = data['added']
+    values['custom_prayers'] = custom or None
+    return values
+
+
+def to_custom_mass(row: CustomMassRow) -> CustomMass:
+    """Convert a custom_masses row to a CustomMass"""
+    custom = row.custom_prayers or {}
+    parts = dict(custom.get('parts') or {})
+    parts.update(row.readings or {})
+    for key in _ANTIPHON_PARTS:
+        if getattr(row, key) is not None:
+            parts[key] = getattr(row, key)
+
+    celebration = None
+    if row.celebration_name and row.celebration_date:
+        celebration = {
+            'name': row.celebration_name,
+            'date': row.celebration_date.isoformat(),
+            'color': row.celebration_color or 'branco',
+            **(custom.get('celebration') or {}),
+        }
+    return CustomMass.from_dict({
+        'celebration': celebration,
+        'parts': parts,
+        'added': custom.get('added') or [],
+    })
+
+
+def _summary(row: CustomMassRow) -> Dict:
+    return {
+        'id': row.id,
+        'name': row.name,
+        'celebration_name': row.celebration_name,
+        'celebration_date': row.celebration_date.isoformat() if row.celebration_date else None,
+        'celebration_color': row.celebration_color,
+        'updated_at': row.updated_at.isoformat() if row.updated_at else None,
+    }
+
+
+class CustomMassRepository:
+    """
+    Saves and loads CustomMass objects in the custom_masses table.
+
+    Writes raise SQLAlchemyError after rolling back, so callers can report
+    the failure; reads of an unavailable database return None or an empty
+    page, as in LiturgyRepository.
+    """
+
+    def save(self, mass: CustomMass, name: str, mass_id: Optional[int] = None,
+             created_by: Optional[str] = None) -> Optional[int]:
+        """
+        Insert a Mass, or update the row mass_id
+
+        Returns the row id, or None when mass_id does not exist.
+        """
+        values = custom_mass_values(mass, name)
+        try:
+            if mass_id is None:
+                row = CustomMassRow(created_by=created_by, **values)
+                db.session.add(row)
+            else:
+                row = db.session.get(CustomMassRow, mass_id)
+                if row is None:
+                    return None
+                for column, value in values.items():
+                    setattr(row, column, value)
+            db.session.commit()
+        except SQLAlchemyError:
+            db.session.rollback()
+            raise
+        return row.id
+
+    def load(self, mass_id: int) -> Optional[CustomMass]:
+        """Get a saved Mass, or None"""
+        try:
+            row = db.session.get(CustomMassRow, mass_id)
+        except SQLAlchemyError as e:
+            logger.warning("Falha ao carregar missa %s: %s", mass_id, getattr(e, "orig", e))
+            db.session.rollback()
+            return None
+        return to_custom_mass(row) if row is not None else None
+
+    def delete(self, mass_id: int) -> bool:
+        """Delete a saved Mass; returns False if it does not exist"""
+        try:
+            deleted = (
+                db.session.query(CustomMassRow)
+                .filter(CustomMassRow.id == mass_id)
+                .delete(synchronize_session=False)
+            )
+            db.session.commit()
+        except SQLAlchemyError:
+            db.session.rollback()
+            raise
+        return deleted > 0
+
+    def list_page(self, after: Optional[int] = None,
+                  limit: int = 50) -> Tuple[List[Dict], Optional[int]]:
+        """
+        One page of saved Masses, newest first
+
+        Keyset pagination on the primary key: pass the returned cursor as
+        ``after`` to get the next page (None when there are no more rows).
+        Only the summary columns are read, never the JSON parts.
+        """
+        query = (
+            db.session.query(CustomMassRow)
+            .options(load_only(
+                CustomMassRow.name, CustomMassRow.celebration_name,
+                CustomMassRow.celebration_date, CustomMassRow.celebration_color,
+                CustomMassRow.updated_at
+            ))
+            .order_by(CustomMassRow.id.desc())
+        )
+        if after is not None:
+            query = query.filter(CustomMassRow.id < after)
+        try:
+            rows = query.limit(limit + 1).all()
+        except SQLAlchemyError as e:
+            logger.warning("Falha ao listar missas: %s", getattr(e, "orig", e))
+            db.session.rollback()
+            return [], None
+        cursor = rows[limit - 1].id if len(rows) > limit else None
+        return [_summary(row) for row in rows[:limit]], cursor
+
+    def bulk_save(self, items: Iterable[Tuple[Optional[int], str, CustomMass]],
+                  batch_size: int = 500, created_by: Optional[str] = None) -> int:
+        """
+        Insert or update many Masses in one transaction
+
+        items are (mass_id or None, name, mass); rows with an id are
+        updated, the others inserted. Statements are sent in executemany
+        batches of batch_size rows. Returns the number of rows written.
+        """
+        count = 0
+        inserts: List[Dict] = []
+        updates: List[Dict] = []
+        try:
+            for mass_id, name, mass in items:
+                values = custom_mass_values(mass, name)
+                if mass_id is None:
+                    inserts.append({**values, 'created_by': created_by})
+                else:
+                    updates.append({**values, 'id': mass_id, 'updated_at': datetime.utcnow()})
+                if len(inserts) + len(updates) >= batch_size:
+                    count += self._flush_batch(inserts, updates)
+            count += self._flush_batch(inserts, updates)
+            db.session.commit()
+        except SQLAlchemyError:
+            db.session.rollback()
+            raise
+        return count
+
+    @staticmethod
+    def _flush_batch(inserts: List[Dict], updates: List[Dict]) -> int:
+        count = len(inserts) + len(updates)
+        if inserts:
+            db.session.execute(insert(CustomMassRow), inserts)
+            inserts.clear()
+        if updates:
+            db.session.execute(update(CustomMassRow), updates)
+            updates.clear()
+        return count
+
+
+class DuplicateRowsError(RuntimeError):
+    """Rows of a table violate a unique index that is about to be created"""
+
+
+def ensure_schema(*models):
+    """
+    Add the columns and indexes of models missing from existing tables
+
+    create_all only creates whole tables, so databases created before a
+    column or index was declared get it here. New columns must be
+    nullable. A unique index is not created over duplicate rows:
+    DuplicateRowsError lists them, to be fixed by hand or merged with
+    merge_duplicates (init_db.py --merge-duplicates).
+    """
+    bind = db.session.get_bind()
+    inspector = inspect(bind)
+    reports = []
+    for model in models:
+        table = model.__table__
+        existing = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing:
+                column_type = column.type.compile(dialect=bind.dialect)
+                with bind.begin() as connection:
+                    connection.execute(text(
+                        f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'
+                    ))
+        indexes = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in indexes:
+                continue
+            if index.unique:
+                columns = [column.name for column in index.columns]
+                duplicates = find_duplicates(table, columns)
+                if duplicates:
+                    reports.append(_duplicates_report(table, index.name, columns, duplicates))
+                    continue
+            index.create(bind, checkfirst=True)
+    if reports:
+        raise DuplicateRowsError("\n".join(reports) + "\nCorrija-as manualmente ou execute "
+                                 "init_db.py --merge-duplicates para manter a linha de menor id de cada grupo.")
+
+
+def find_duplicates(table, columns: Sequence[str]) -> List[Tuple[tuple, List[int]]]:
+    """Groups of rows sharing the values of columns: (values, ids in ascending order)"""
+    key = [table.c[name] for name in columns]
+    groups = (
+        select(*key)
+        .group_by(*key)
+        .having(func.count() > 1)
+        .subquery()
+    )
+    rows = db.session.execute(
+        select(table.c.id, *key)
+        .join(groups, and_(*(column == groups.c[column.name] for column in key)))
+        .order_by(*key, table.c.id)
+    ).all()
+    duplicates: Dict[tuple, List[int]] = {}
+    for row_id, *values in rows:
+        duplicates.setdefault(tuple(values), []).append(row_id)
+    return list(duplicates.items())
+
+
+def _duplicates_report(table, index_name: str, columns: Sequence[str],
+                       duplicates: List[Tuple[tuple, List[int]]], limit: int = 20) -> str:
+    lines = [f"{table.name}: linhas duplicadas impedem a criação do índice único {index_name} "
+             f"({', '.join(columns)}):"]
+    for values, ids in duplicates[:limit]:
+        lines.append(f"  {values!r}: ids {', '.join(map(str, ids))}")
+    if len(duplicates) > limit:
+        lines.append(f"  ... e mais {len(duplicates) - limit} grupos")
+    return "\n".join(lines)
+
+
+def merge_duplicates(*models) -> int:
+    """
+    Merge the rows that would violate the unique indexes of models
+
+    One-off migration, never run by ensure_schema: each group of duplicates
+    is merged into its lowest id, foreign keys pointing to the removed rows
+    are moved to it and every removed row is logged. Returns the number of
+    removed rows.
+    """
+    removed = 0
+    for model in models:
+        table = model.__table__
+        references = [foreign_key.parent for referrer in table.metadata.tables.values()
+                      for foreign_key in referrer.foreign_keys if foreign_key.column is table.c.id]
+        for index in table.indexes:
+            if not index.unique:
+                continue
+            for _, ids in find_duplicates(table, [column.name for column in index.columns]):
+                kept_id, duplicate_ids = ids[0], ids[1:]
+                for row in db.session.execute(select(table).where(table.c.id.in_(duplicate_ids))):
+                    logger.warning("%s: linha removida (mesclada na id %d): %r",
+                                   table.name, kept_id, dict(row._mapping))
+                for column in references:
+                    values = {column.name: kept_id}
+                    if 'updated_at' in column.table.c:
+                        values['updated_at'] = datetime.utcnow()
+                    db.session.execute(update(column.table).where(column.in_(duplicate_ids)).values(values))
+                db.session.execute(delete(table).where(table.c.id.in_(duplicate_ids)))
+                removed += len(duplicate_ids)
+    return removed
+
+
+def upsert_statement(model, index_elements: Sequence[str], update_columns: Sequence[str]):
+    """
+    INSERT ... ON CONFLICT (index_elements) DO UPDATE statement for a model
+
+    Execute it with a list of row dicts to upsert them in executemany
+    batches. Supports PostgreSQL and SQLite.
+    """
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        raise NotImplementedError(f"Upsert não suportado para {dialect}")
+    statement = dialect_insert(model.__table__)
+    if not update_columns:
+        return statement.on_conflict_do_nothing(index_elements=list(index_elements))
+    return statement.on_conflict_do_update(
+        index_elements=list(index_elements),
+        set_={column: statement.excluded[column] for column in update_columns}
+    )
+
+
+class LiturgyHoursRepository:
+    """
+    Reads and bulk-loads precomputed hours in the liturgy_hours table.
+
+    Reads of an unavailable database return an empty mapping, so callers
+    fall back to computing the hours.
+    """
+
+    def get_hours(self, liturgy_date: date, hour_types: Sequence[str]) -> Dict[str, Hour]:
+        """Stored hours of a date (hour_type -> Hour) in one query"""
+        try:
+            rows = (
+                db.session.query(LiturgyHourRow.hour_type, LiturgyHourRow.content, LiturgyHourRow.updated_at)
+                .filter(LiturgyHourRow.date == liturgy_date,
+                        LiturgyHourRow.hour_type.in_(list(hour_types)))
+                .all()
+            )
+        except SQLAlchemyError as e:
+            logger.warning("Falha ao consultar horas de %s: %s", liturgy_date, getattr(e, "orig", e))
+            db.session.rollback()
+            return {}
+        return {hour_type: Hour.from_dict(content, updated_at)
+                for hour_type, content, updated_at in rows if content}
+
+    def upsert(self, rows: Iterable[Dict], batch_size: int = 1000) -> int:
+        """
+        Insert or update rows (date, hour_type, content) in one transaction
+
+        Conflicts on (date, hour_type) replace the content, and the cached
+        hours of the kinds written are dropped (local and Redis tiers).
+        Returns the number of rows written.
+        """
+        statement = upsert_statement(LiturgyHourRow, ('date', 'hour_type'), ('content', 'updated_at'))
+        count = 0
+        batch: List[Dict] = []
+        hour_types = set()
+        now = datetime.utcnow()
+        try:
+            for row in rows:
+                hour_types.add(row['hour_type'])
+                batch.append({**row, 'created_at': now, 'updated_at': now})
+                if len(batch) >= batch_size:
+                    db.session.execute(statement, batch)
+                    count += len(batch)
+                    batch = []
+            if batch:
+                db.session.execute(statement, batch)
+                count += len(batch)
+            db.session.commit()
+        except SQLAlchemyError:
+            db.session.rollback()
+            raise
+        for hour_type in hour_types:
+            invalidate_kind(hour_type)
+        return count
+
+    def populate_year(self, year: int, batch_size: int = 1000) -> int:
+        """Compute and store the seven hours of every day of a year"""
+        return self.upsert(iter_hour_rows(year), batch_size=batch_size)
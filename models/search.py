@@ -0,0 +1,214 @@
+"""
+Full-text search over readings, prayers and psalms
+
+PostgreSQL keeps a generated ``search_vector`` column (Portuguese
+configuration, title weighted above the text) with a GIN index on each
+table; results are ranked with ts_rank and snippets come from
+ts_headline. SQLite uses external-content FTS5 tables kept in sync by
+triggers, ranked with bm25 and cut with snippet(). Either way a query is
+an index lookup instead of a sequential scan.
+
+ensure_search_index() creates the columns, tables and indexes and is run
+by init_db.py. Until it has run, search() falls back to a LIKE scan.
+"""
+
+import html
+import logging
+import re
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import SQLAlchemyError
+
+from .db_models import db
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SearchTarget:
+    """A searchable table: title column, text columns and snippet column"""
+    table: str
+    title: str
+    body: Sequence[str]
+    snippet: str
+
+
+SEARCH_TARGETS: Dict[str, SearchTarget] = {
+    'readings': SearchTarget('readings', 'reference', ('text',), 'text'),
+    'prayers': SearchTarget('prayers', 'title', ('text',), 'text'),
+    'psalms': SearchTarget('psalms', 'reference', ('response', 'verses'), 'verses'),
+}
+
+TS_CONFIG = 'portuguese'
+
+# Highlight markers, replaced by <mark> after the snippet is escaped
+_START, _STOP = '\x02', '\x03'
+_TOKEN_RE = re.compile(r'\w+')
+
+_available: Dict[str, bool] = {}
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    """A search result; snippet is HTML with the matches in <mark>"""
+    kind: str
+    id: int
+    title: str
+    snippet: str
+    rank: float
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+def _dialect() -> str:
+    return db.session.get_bind().dialect.name
+
+
+def _coalesce(column: str) -> str:
+    return f"coalesce({column}, '')"
+
+
+def _pg_vector(target: SearchTarget) -> str:
+    body = " || ' ' || ".join(_coalesce(column) for column in target.body)
+    return (f"setweight(to_tsvector('{TS_CONFIG}', {_coalesce(target.title)}), 'A') || "
+            f"setweight(to_tsvector('{TS_CONFIG}', {body}), 'B')")
+
+
+def _fts_columns(target: SearchTarget) -> List[str]:
+    return [target.title, *target.body]
+
+
+def _sqlite_ddl(target: SearchTarget) -> List[str]:
+    fts = f"{target.table}_fts"
+    columns = _fts_columns(target)
+    names = ', '.join(columns)
+    new = ', '.join(f"new.{column}" for column in columns)
+    old = ', '.join(f"old.{column}" for column in columns)
+    delete = f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {old});"
+    insert = f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new});"
+    return [
+        f"CREATE VIRTUAL TABLE {fts} USING fts5({names}, content='{target.table}', "
+        f"content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {target.table} BEGIN {insert} END",
+        f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {target.table} BEGIN {delete} END",
+        f"CREATE TRIGGER {fts}_au AFTER UPDATE ON {target.table} BEGIN {delete} {insert} END",
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+def ensure_search_index():
+    """Create the search columns/tables and indexes that do not exist yet"""
+    bind = db.session.get_bind()
+    dialect = bind.dialect.name
+    inspector = inspect(bind)
+    with bind.begin() as connection:
+        for target in SEARCH_TARGETS.values():
+            if dialect == 'postgresql':
+                connection.execute(text(
+                    f"ALTER TABLE {target.table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+                    f"GENERATED ALWAYS AS ({_pg_vector(target)}) STORED"
+                ))
+                connection.execute(text(
+                    f"CREATE INDEX IF NOT EXISTS ix_{target.table}_search "
+                    f"ON {target.table} USING GIN (search_vector)"
+                ))
+            elif dialect == 'sqlite':
+                if inspector.has_table(f"{target.table}_fts"):
+                    continue
+                for statement in _sqlite_ddl(target):
+                    connection.execute(text(statement))
+            else:
+                logger.warning("Busca textual indexada não suportada para %s", dialect)
+                return
+    _available.clear()
+
+
+def _index_available(target: SearchTarget) -> bool:
+    available = _available.get(target.table)
+    if available is None:
+        inspector = inspect(db.session.get_bind())
+        dialect = _dialect()
+        if dialect == 'postgresql':
+            columns = {column['name'] for column in inspector.get_columns(target.table)}
+            available = 'search_vector' in columns
+        elif dialect == 'sqlite':
+            available = inspector.has_table(f"{target.table}_fts")
+        else:
+            available = False
+        _available[target.table] = available
+    return available
+
+
+def _snippet_html(raw: Optional[str]) -> str:
+    escaped = html.escape(raw or '')
+    return escaped.replace(_START, '<mark>').replace(_STOP, '</mark>')
+
+
+def _search_postgresql(target: SearchTarget, query: str, limit: int):
+    return db.session.execute(text(
+        f"SELECT t.id, t.{target.title} AS title, ts_rank(t.search_vector, q) AS rank, "
+        f"ts_headline('{TS_CONFIG}', {_coalesce('t.' + target.snippet)}, q, "
+        f"'StartSel=\"{_START}\", StopSel=\"{_STOP}\", MaxFragments=2, MaxWords=25, MinWords=8') AS snippet "
+        f"FROM {target.table} t, websearch_to_tsquery('{TS_CONFIG}', :query) q "
+        f"WHERE t.search_vector @@ q ORDER BY rank DESC LIMIT :limit"
+    ), {'query': query, 'limit': limit}).all()
+
+
+def _search_sqlite(target: SearchTarget, query: str, limit: int):
+    tokens = _TOKEN_RE.findall(query)
+    if not tokens:
+        return []
+    fts = f"{target.table}_fts"
+    weights = ', '.join(['10.0'] + ['1.0'] * len(target.body))
+    return db.session.execute(text(
+        f"SELECT {fts}.rowid AS id, t.{target.title} AS title, -bm25({fts}, {weights}) AS rank, "
+        f"snippet({fts}, -1, '{_START}', '{_STOP}', '…', 16) AS snippet "
+        f"FROM {fts} JOIN {target.table} t ON t.id = {fts}.rowid "
+        f"WHERE {fts} MATCH :query ORDER BY bm25({fts}, {weights}) LIMIT :limit"
+    ), {'query': ' '.join(f'"{token}"' for token in tokens), 'limit': limit}).all()
+
+
+def _search_like(target: SearchTarget, query: str, limit: int):
+    columns = [target.title, *target.body]
+    condition = ' OR '.join(f"lower({column}) LIKE :pattern" for column in columns)
+    rows = db.session.execute(text(
+        f"SELECT id, {target.title} AS title, 0.0 AS rank, substr({_coalesce(target.snippet)}, 1, 200) AS snippet "
+        f"FROM {target.table} WHERE {condition} ORDER BY id LIMIT :limit"
+    ), {'pattern': f"%{query.lower()}%", 'limit': limit}).all()
+    return rows
+
+
+def search(query: str, kinds: Optional[Sequence[str]] = None, limit: int = 20) -> List[SearchHit]:
+    """
+    Search readings, prayers and psalms (or only the given kinds)
+
+    Returns up to limit hits per kind, best first. An unavailable
+    database yields an empty list.
+    """
+    query = query.strip()
+    if not query:
+        return []
+    hits: List[SearchHit] = []
+    for kind in kinds or SEARCH_TARGETS:
+        target = SEARCH_TARGETS[kind]
+        try:
+            if not _index_available(target):
+                rows = _search_like(target, query, limit)
+            elif _dialect() == 'postgresql':
+                rows = _search_postgresql(target, query, limit)
+            else:
+                rows = _search_sqlite(target, query, limit)
+        except SQLAlchemyError as e:
+            logger.warning("Falha na busca em %s: %s", kind, getattr(e, "orig", e))
+            db.session.rollback()
+            continue
+        hits.extend(
+            SearchHit(kind, row.id, row.title, _snippet_html(row.snippet), float(row.rank or 0))
+            for row in rows
+        )
+    if kinds is None or len(kinds) > 1:
+        hits.sort(key=lambda hit: hit.rank, reverse=True)
+    return hits
@@ -0,0 +1,97 @@
+"""
+Pre-rendered static copy of the read-only liturgy pages
+
+Layout of the output directory, mirroring the dynamic URLs:
+
+    liturgia-diaria/<date>.html          /liturgia-diaria/<date>
+    liturgia-horas/<date>/<hour>.html    /liturgia-horas/<date>?hour=<hour>
+    api/liturgy/<date>.json              /api/liturgy/<date>
+
+A manifest keeps a fingerprint of the content of every built date (the
+daily liturgy and its seven hours) and the version of the templates, so a
+rebuild only renders the dates whose content changed since the last one.
+Files are replaced atomically and left untouched when their bytes are the
+same, so a server reading the directory never sees a partial page.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import asdict
+from typing import Dict, Iterable, List, Optional
+
+from .daily_liturgy import DailyLiturgy
+from .liturgy_hours import Hour
+
+MANIFEST = '.manifest.json'
+
+
+def fingerprint(liturgy: DailyLiturgy, hours: Iterable[Hour]) -> str:
+    """Hash of everything the pages of a date are rendered from"""
+    parts = [asdict(liturgy), *(hour.to_dict() for hour in hours)]
+    data = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+
+class StaticSite:
+    """Output directory of the static export and its manifest"""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    @staticmethod
+    def page_path(date_str: str) -> str:
+        return os.path.join('liturgia-diaria', f'{date_str}.html')
+
+    @staticmethod
+    def hour_path(date_str: str, hour_key: str) -> str:
+        return os.path.join('liturgia-horas', date_str, f'{hour_key}.html')
+
+    @staticmethod
+    def api_path(date_str: str) -> str:
+        return os.path.join('api', 'liturgy', f'{date_str}.json')
+
+    def write(self, path: str, data: bytes) -> bool:
+        """Write a file atomically; returns False when it already had these bytes"""
+        target = os.path.join(self.root, path)
+        try:
+            with open(target, 'rb') as f:
+                if f.read() == data:
+                    return False
+        except FileNotFoundError:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(target), prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.chmod(tmp, 0o644)
+            os.replace(tmp, target)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        return True
+
+    def load_manifest(self) -> Dict:
+        try:
+            with open(os.path.join(self.root, MANIFEST), encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {'templates': None, 'dates': {}}
+
+    def save_manifest(self, manifest: Dict):
+        os.makedirs(self.root, exist_ok=True)
+        data = json.dumps(manifest, indent=1, sort_keys=True).encode('utf-8')
+        self.write(MANIFEST, data)
+
+    def stale_dates(self, fingerprints: Dict[str, str], templates_version: Optional[str],
+                    manifest: Optional[Dict] = None) -> List[str]:
+        """
+        Dates whose pages must be rendered: all of them when the templates
+        changed, otherwise those whose fingerprint differs from the manifest
+        """
+        manifest = manifest if manifest is not None else self.load_manifest()
+        if manifest.get('templates') != templates_version:
+            return sorted(fingerprints)
+        built = manifest.get('dates', {})
+        return sorted(d for d, value in fingerprints.items() if built.get(d) != value)
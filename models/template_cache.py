@@ -0,0 +1,51 @@
+"""
+Compiled template cache shared by the worker processes
+
+Jinja compiles each template to Python code on first use, which every
+new worker repeats after a deploy or restart. A bytecode cache keeps the
+compiled code on disk (one file per template) or in Redis, so workers
+only unmarshal it; entries are keyed by template and checked against the
+source checksum, so an edited template is recompiled.
+"""
+
+import logging
+import os
+import time
+from typing import Optional
+
+from jinja2 import BytecodeCache, Environment, FileSystemBytecodeCache, MemcachedBytecodeCache
+
+logger = logging.getLogger(__name__)
+
+# Backends of TEMPLATE_CACHE
+BACKENDS = ('filesystem', 'redis', 'none')
+
+
+def bytecode_cache(backend: str, directory: Optional[str] = None, redis_client=None,
+                   ttl: Optional[int] = None) -> Optional[BytecodeCache]:
+    """
+    Bytecode cache for a backend ('none' disables it)
+
+    'redis' needs a redis client and falls back to the filesystem without
+    one. Redis errors are ignored: the template is compiled instead.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Cache de templates inválido: {backend}")
+    if backend == 'none':
+        return None
+    if backend == 'redis':
+        if redis_client is not None:
+            return MemcachedBytecodeCache(redis_client, prefix='liturgia:jinja:', timeout=ttl)
+        logger.warning("Redis não configurado; cache de templates em arquivos")
+    os.makedirs(directory, exist_ok=True)
+    return FileSystemBytecodeCache(directory)
+
+
+def compile_templates(environment: Environment) -> int:
+    """Load every template of the environment, filling its caches; returns the count"""
+    started = time.perf_counter()
+    names = environment.list_templates(extensions=('html',))
+    for name in names:
+        environment.get_template(name)
+    logger.info("%d templates compilados em %.1f ms", len(names), (time.perf_counter() - started) * 1000)
+    return len(names)
@@ -0,0 +1,225 @@
+"""
+In-memory inverted index of the built-in liturgical corpus
+
+Covers what is available without a database: the sample daily liturgy
+data, celebration names of the computed calendar, the hymns, psalms,
+readings, antiphons and prayers of the Liturgy of the Hours (including
+the four-week psalter) and the default parts of the custom Mass.
+
+Terms are accent-folded and case-folded, so "Epifania" and "epifânia"
+are the same term. The last word of a query matches as a prefix over
+the sorted vocabulary, which is what the autocomplete of the custom
+Mass form needs. The index is built once per process on first use.
+"""
+
+import logging
+import re
+import sys
+import threading
+import time
+import unicodedata
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Iterator, List, Optional, Sequence, Set
+
+from .custom_mass import DEFAULT_PARTS
+from .daily_liturgy import LiturgiaDaily
+from .liturgical_calendar import LiturgicalCalendar, SEASONS
+from .liturgy_hours import HOUR_GETTERS, LiturgiaHoras
+from .psalter import PSALTER, MARIAN_ANTIPHONS
+
+logger = logging.getLogger(__name__)
+
+KINDS = ("celebration", "reading", "psalm", "canticle", "hymn", "antiphon", "prayer", "part")
+
+_TOKEN_RE = re.compile(r"\w+")
+_LABEL_RE = re.compile(r"^[^:]{1,40}:\s*")  # "Leitura breve: Rm 13,11-12a"
+
+_lock = threading.Lock()
+_index: Optional["TextIndex"] = None
+
+
+def fold(text: str) -> str:
+    """Lowercase text without diacritics ("Epifânia" -> "epifania")"""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(fold(text))
+
+
+@dataclass(frozen=True)
+class Document:
+    """An indexed entry: kind, the text shown (title) and the body"""
+    kind: str
+    title: str
+    text: str = ""
+
+
+@dataclass(frozen=True)
+class IndexStats:
+    documents: int
+    terms: int
+    postings: int
+    build_seconds: float
+    memory_bytes: int
+
+    def __str__(self):
+        return (f"{self.documents} documentos, {self.terms} termos, {self.postings} ocorrências, "
+                f"{self.build_seconds * 1000:.1f} ms, {self.memory_bytes / 1024:.0f} KB")
+
+
+class TextIndex:
+    """Inverted index (folded term -> ascending document ids)"""
+
+    def __init__(self, documents: Sequence[Document]):
+        started = time.perf_counter()
+        self.documents: List[Document] = []
+        self._postings: Dict[str, array] = {}
+        self._title_terms: List[frozenset] = []
+        seen: Set[Document] = set()
+        for document in documents:
+            if document in seen or not document.title:
+                continue
+            seen.add(document)
+            doc_id = len(self.documents)
+            self.documents.append(document)
+            title_terms = frozenset(tokenize(document.title))
+            self._title_terms.append(title_terms)
+            for term in title_terms | set(tokenize(document.text)):
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = array("I")
+                postings.append(doc_id)
+        self._vocabulary = sorted(self._postings)
+        self.stats = IndexStats(
+            documents=len(self.documents),
+            terms=len(self._vocabulary),
+            postings=sum(len(p) for p in self._postings.values()),
+            build_seconds=time.perf_counter() - started,
+            memory_bytes=self._memory_bytes()
+        )
+
+    def _memory_bytes(self) -> int:
+        size = sys.getsizeof(self._postings) + sys.getsizeof(self._vocabulary)
+        size += sum(sys.getsizeof(term) + sys.getsizeof(p) for term, p in self._postings.items())
+        size += sys.getsizeof(self.documents) + sys.getsizeof(self._title_terms)
+        size += sum(sys.getsizeof(d) + sys.getsizeof(d.title) + sys.getsizeof(d.text) for d in self.documents)
+        size += sum(sys.getsizeof(terms) for terms in self._title_terms)
+        return size
+
+    def _prefix_terms(self, prefix: str) -> List[str]:
+        start = bisect_left(self._vocabulary, prefix)
+        end = bisect_left(self._vocabulary, prefix + "\uffff", start)
+        return self._vocabulary[start:end]
+
+    def _matching(self, term: str, prefix: bool) -> Set[int]:
+        if not prefix:
+            return set(self._postings.get(term, ()))
+        ids: Set[int] = set()
+        for expanded in self._prefix_terms(term):
+            ids.update(self._postings[expanded])
+        return ids
+
+    def search(self, query: str, kinds: Optional[Sequence[str]] = None,
+               limit: int = 10, prefix: bool = True) -> List[Document]:
+        """
+        Documents containing every word of query, best first
+
+        With prefix the last word also matches longer terms ("epif"
+        finds "Epifania"). Title matches rank above body matches.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+        # Rarest terms first keeps the intersections small
+        groups = [self._matching(term, prefix and i == len(terms) - 1) for i, term in enumerate(terms)]
+        groups.sort(key=len)
+        ids = groups[0]
+        for group in groups[1:]:
+            if not ids:
+                break
+            ids = ids & group
+        if kinds:
+            ids = {i for i in ids if self.documents[i].kind in kinds}
+
+        def score(doc_id: int):
+            title_terms = self._title_terms[doc_id]
+            in_title = sum(1 for term in terms[:-1] if term in title_terms)
+            last = terms[-1]
+            if last in title_terms or (prefix and any(t.startswith(last) for t in title_terms)):
+                in_title += 1
+            return (-in_title, len(self.documents[doc_id].title), doc_id)
+
+        return [self.documents[i] for i in sorted(ids, key=score)[:limit]]
+
+    def complete(self, prefix: str, kinds: Optional[Sequence[str]] = None, limit: int = 10) -> List[str]:
+        """Distinct titles for an autocomplete prefix"""
+        titles: List[str] = []
+        for document in self.search(prefix, kinds, limit=limit * 4):
+            if document.title not in titles:
+                titles.append(document.title)
+                if len(titles) == limit:
+                    break
+        return titles
+
+
+def _reading_title(reading: str) -> str:
+    """Reference of a reading line like "Leitura breve: Rm 13,11-12a" """
+    return _LABEL_RE.sub("", reading, count=1)
+
+
+def iter_corpus() -> Iterator[Document]:
+    """Every document of the built-in corpus (duplicates are dropped by the index)"""
+    for data in LiturgiaDaily._calendar.values():
+        yield Document("celebration", data["name"])
+        for part in ("first_reading", "second_reading", "gospel"):
+            if data.get(part):
+                yield Document("reading", data[part])
+        if data.get("psalm"):
+            yield Document("psalm", data["psalm"])
+
+    for day in LiturgicalCalendar.for_year(date.today().year):
+        yield Document("celebration", day.name)
+
+    for key, _ in HOUR_GETTERS:
+        build = getattr(LiturgiaHoras, f"_build_{key}")
+        for week in range(1, 5):
+            for season in SEASONS:
+                hour = build(week, season)
+                if hour.hymn:
+                    yield Document("hymn", f"Hino - {hour.name}", hour.hymn)
+                for psalm in hour.psalms:
+                    yield Document("psalm", psalm.reference, "\n".join([psalm.response, *psalm.verses]))
+                for antiphon in hour.antiphons:
+                    if antiphon:
+                        yield Document("antiphon", antiphon)
+                if hour.reading:
+                    yield Document("reading", _reading_title(hour.reading))
+                if hour.canticle:
+                    yield Document("canticle", hour.canticle)
+                for prayer in hour.prayers:
+                    yield Document("prayer", prayer.title, prayer.text)
+
+    for psalms in PSALTER.values():
+        for psalm in psalms:
+            yield Document("psalm" if psalm.number else "canticle", psalm.reference)
+    for antiphon in set(MARIAN_ANTIPHONS.values()):
+        yield Document("antiphon", "Antífona de Nossa Senhora", antiphon)
+
+    for part in DEFAULT_PARTS.values():
+        yield Document("part", part.title, part.content)
+
+
+def corpus_index() -> TextIndex:
+    """The index of the built-in corpus, built on first use"""
+    global _index
+    if _index is None:
+        with _lock:
+            if _index is None:
+                _index = TextIndex(list(iter_corpus()))
+                logger.info("Índice textual do acervo: %s", _index.stats)
+    return _index
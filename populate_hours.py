@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Liturgy of the Hours precomputation
+Generates the seven hours of every day of one or more years and upserts
+them into the liturgy_hours table
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app, db
+from models.repository import LiturgyHoursRepository
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pré-calcula a Liturgia das Horas de um ou mais anos")
+    parser.add_argument('years', type=int, nargs='+', help="Ano(s) civil(is), ex.: 2026 2027")
+    parser.add_argument('--batch-size', type=int, default=1000, help="Linhas por lote de INSERT (padrão: 1000)")
+    args = parser.parse_args()
+
+    repository = LiturgyHoursRepository()
+    with app.app_context():
+        db.create_all()
+        for year in args.years:
+            started = time.perf_counter()
+            count = repository.populate_year(year, batch_size=args.batch_size)
+            seconds = time.perf_counter() - started
+            print(f"{year}: {count} horas em {seconds:.2f} s ({count / seconds:,.0f} linhas/s)")
+
+
+if __name__ == '__main__':
+    main()
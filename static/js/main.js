@@ -16,6 +16,12 @@ document.addEventListener('DOMContentLoaded', function() {
     
     // Initialize form validation
     initializeFormValidation();
+    
+    // Initialize full-text search on admin pages
+    initializeContentSearch();
+    
+    // Initialize suggestions from the built-in texts
+    initializeAutocomplete();
 });
 
 /**
@@ -227,15 +233,42 @@ function exportAsText() {
     showNotification('Liturgia exportada com sucesso!', 'success');
 }
 
+// Liturgy days already fetched, keyed by YYYY-MM-DD
+const liturgyCache = new Map();
+
+/**
+ * Prefetch a range of dates (up to a liturgical year) in a single request
+ */
+async function prefetchLiturgyRange(fromDate, toDate) {
+    try {
+        const response = await fetch(`/api/liturgy?from=${fromDate}&to=${toDate}`);
+        const data = await response.json();
+        
+        if (Array.isArray(data)) {
+            data.forEach(day => liturgyCache.set(day.date, { success: true, ...day }));
+        } else {
+            showNotification('Erro ao carregar liturgia: ' + data.error, 'error');
+        }
+    } catch (error) {
+        console.error('Error prefetching liturgy:', error);
+    }
+}
+
 /**
  * Load liturgy for specific date via API
  */
 async function loadLiturgyForDate(date) {
+    if (liturgyCache.has(date)) {
+        updateLiturgyDisplay(liturgyCache.get(date));
+        return;
+    }
+    
     try {
         const response = await fetch(`/api/liturgy/${date}`);
         const data = await response.json();
         
         if (data.success) {
+            liturgyCache.set(date, data);
             updateLiturgyDisplay(data);
         } else {
             showNotification('Erro ao carregar liturgia: ' + data.error, 'error');
@@ -274,6 +307,105 @@ function updateLiturgyDisplay(data) {
     }
 }
 
+/**
+ * Full-text search forms (data-content-search="<kind>") of the admin pages.
+ * Results from /api/search are listed in the matching data-search-results
+ * element; snippets arrive escaped, with the matches in <mark>.
+ */
+function initializeContentSearch() {
+    document.querySelectorAll('form[data-content-search]').forEach(form => {
+        const kind = form.dataset.contentSearch;
+        const input = form.querySelector('input[name="q"]');
+        const results = document.querySelector(`[data-search-results="${kind}"]`);
+        let timer = null;
+        let controller = null;
+        
+        const run = () => {
+            const query = input.value.trim();
+            if (controller) controller.abort();
+            if (!query) {
+                results.innerHTML = '';
+                return;
+            }
+            controller = new AbortController();
+            const params = new URLSearchParams({ q: query, type: kind, limit: 20 });
+            fetch(`${form.action}?${params}`, { signal: controller.signal })
+                .then(response => response.json())
+                .then(data => renderSearchResults(results, data.results || []))
+                .catch(error => {
+                    if (error.name !== 'AbortError') console.error('Erro na busca:', error);
+                });
+        };
+        
+        form.addEventListener('submit', event => {
+            event.preventDefault();
+            clearTimeout(timer);
+            run();
+        });
+        input.addEventListener('input', () => {
+            clearTimeout(timer);
+            timer = setTimeout(run, 300);
+        });
+    });
+}
+
+function renderSearchResults(container, hits) {
+    container.innerHTML = '';
+    if (!hits.length) {
+        const empty = document.createElement('div');
+        empty.className = 'list-group-item text-muted';
+        empty.textContent = 'Nenhum resultado encontrado';
+        container.appendChild(empty);
+        return;
+    }
+    hits.forEach(hit => {
+        const item = document.createElement('div');
+        item.className = 'list-group-item';
+        const title = document.createElement('div');
+        title.className = 'fw-semibold';
+        title.textContent = hit.title;
+        const snippet = document.createElement('div');
+        snippet.className = 'small text-muted';
+        snippet.innerHTML = hit.snippet;
+        item.append(title, snippet);
+        container.appendChild(item);
+    });
+}
+
+/**
+ * Suggestions for inputs with data-autocomplete="<kind>" (celebration,
+ * reading, psalm, ...) from /api/autocomplete, shown through a datalist
+ */
+function initializeAutocomplete() {
+    document.querySelectorAll('input[data-autocomplete]').forEach(input => {
+        const list = document.createElement('datalist');
+        list.id = `${input.id || input.name}-suggestions`;
+        input.after(list);
+        input.setAttribute('list', list.id);
+        let timer = null;
+        
+        input.addEventListener('input', () => {
+            clearTimeout(timer);
+            const query = input.value.trim();
+            if (query.length < 2) return;
+            timer = setTimeout(() => {
+                const params = new URLSearchParams({ q: query, kind: input.dataset.autocomplete });
+                fetch(`/api/autocomplete?${params}`)
+                    .then(response => response.json())
+                    .then(data => {
+                        list.innerHTML = '';
+                        (data.suggestions || []).forEach(suggestion => {
+                            const option = document.createElement('option');
+                            option.value = suggestion;
+                            list.appendChild(option);
+                        });
+                    })
+                    .catch(error => console.error('Erro nas sugestões:', error));
+            }, 150);
+        });
+    });
+}
+
 // Make functions available globally
 window.navigateToDate = navigateToDate;
 window.goToToday = goToToday;
@@ -281,3 +413,4 @@ window.copyToClipboard = copyToClipboard;
 window.printPage = printPage;
 window.exportAsText = exportAsText;
 window.loadLiturgyForDate = loadLiturgyForDate;
+window.prefetchLiturgyRange = prefetchLiturgyRange;